@@ -36,6 +36,7 @@ INSTALLED_APPS = [
 
 # Middleware
 MIDDLEWARE = [
+    "hubinsight.profiling.ProfilingMiddleware",  # no-op unless REQUEST_PROFILING
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -82,8 +83,47 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 from .components.database import DATABASES  
 from .components.rest import REST_FRAMEWORK, SPECTACULAR_SETTINGS 
 from .components.jwt import SIMPLE_JWT 
-from .components.celery import CELERY_BROKER_URL, CELERY_RESULT_BACKEND, CELERY_IMPORTS 
+from .components.celery import (
+    CELERY_BROKER_URL,
+    CELERY_RESULT_BACKEND,
+    CELERY_IMPORTS,
+    CELERY_TASK_ROUTES,
+    CELERY_TASK_DEFAULT_QUEUE,
+    CELERY_BROKER_TRANSPORT_OPTIONS,
+    CELERY_TASK_QUEUE_MAX_PRIORITY,
+)
 from .components.logging import LOGGING 
+from .components.cache import CACHES
+from .components.hubinsight import (
+    EXECUTION_RECORDER_ENABLED,
+    EXECUTION_RECORDER_MAX_BATCH,
+    EXECUTION_RECORDER_MAX_DELAY,
+    SCHEDULE_DISPATCH_MODE,
+    DISPATCHER_BATCH_SIZE,
+    DISPATCHER_POLL_INTERVAL,
+    DISPATCH_RATE_LIMIT,
+    DISPATCH_RATE_BURST,
+    CRON_CACHE_SIZE,
+    TASK_HANDLER_MODE,
+    TASK_HANDLER_CONCURRENCY,
+    SCHEDULE_LEASE_TTL,
+    EXECUTION_IDEMPOTENCY_TTL,
+    RESULT_MEMO_WAIT,
+    SCHEDULE_LIST_CACHE_TTL,
+    SCHEDULE_BULK_MAX_ITEMS,
+    EXECUTION_RETENTION_DAYS,
+    EXECUTION_ARCHIVE_DIR,
+    EXECUTION_LOG_MAX_BYTES,
+    EXPORT_CHUNK_SIZE,
+    EXECUTION_ROLLUPS_ENABLED,
+    SCHEDULE_ACTIVE_LIMIT,
+    METRICS_STORE,
+    METRICS_TOKEN,
+    REQUEST_PROFILING,
+    REQUEST_PROFILING_SAMPLE_RATE,
+    REQUEST_PROFILING_SLOW_MS,
+    REQUEST_PROFILING_DUMP_DIR,
+)
 
 # Keep Celery timezone aligned with Django
 CELERY_TIMEZONE = TIME_ZONE
@@ -0,0 +1,34 @@
+import os
+
+# Shared cache. Set CACHE_URL (e.g. redis://localhost:6379/2) in multi-process deployments so
+# version keys and cached results are visible to every web/worker process. Without it the
+# schedule list page cache stays off (hubinsight.listcache.page_cache_enabled).
+CACHE_URL = os.getenv("CACHE_URL", "")
+
+if CACHE_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": CACHE_URL,
+            "KEY_PREFIX": "hubinsight",
+        },
+        # Memoized task results (hubinsight.memo); give this DB an LRU maxmemory-policy.
+        "results": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.getenv("RESULT_CACHE_URL", CACHE_URL),
+            "KEY_PREFIX": "hubinsight-results",
+        },
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "hubinsight",
+        },
+        # Per-process stand-in for the shared result cache; LocMem evicts least recently used.
+        "results": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "hubinsight-results",
+            "OPTIONS": {"MAX_ENTRIES": int(os.getenv("RESULT_CACHE_MAX_ENTRIES", "1000"))},
+        },
+    }
@@ -18,3 +18,9 @@ CELERY_BROKER_URL = os.getenv("CELERY_BROKER_URL", "redis://localhost:6379/0")
 CELERY_RESULT_BACKEND = os.getenv("CELERY_RESULT_BACKEND", "redis://localhost:6379/1")
 CELERY_IMPORTS = ("hubinsight.tasks",)
 CELERY_WORKER_HIJACK_ROOT_LOGGER = False
+
+# Per-task queue/priority from task_registry.REGISTRY (see `manage.py worker_plan`).
+CELERY_TASK_ROUTES = ("hubinsight.routing.route_task",)
+CELERY_TASK_DEFAULT_QUEUE = "default"
+CELERY_BROKER_TRANSPORT_OPTIONS = {"priority_steps": list(range(10)), "queue_order_strategy": "priority"}
+CELERY_TASK_QUEUE_MAX_PRIORITY = 9
@@ -0,0 +1,79 @@
+import os
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[3]
+
+# Execution recorder (hubinsight.recorder)
+# When disabled, every start/finish is written immediately (one write per event).
+EXECUTION_RECORDER_ENABLED = os.getenv("EXECUTION_RECORDER_ENABLED", "true").lower() == "true"
+EXECUTION_RECORDER_MAX_BATCH = int(os.getenv("EXECUTION_RECORDER_MAX_BATCH", "200"))
+EXECUTION_RECORDER_MAX_DELAY = float(os.getenv("EXECUTION_RECORDER_MAX_DELAY", "2.0"))  # seconds
+
+# Schedule dispatch (hubinsight.dispatcher)
+# "beat": one django_celery_beat PeriodicTask per Schedule.
+# "dispatcher": `manage.py run_dispatcher` claims due rows from Schedule.next_run_at.
+SCHEDULE_DISPATCH_MODE = os.getenv("SCHEDULE_DISPATCH_MODE", "beat").lower()
+DISPATCHER_BATCH_SIZE = int(os.getenv("DISPATCHER_BATCH_SIZE", "500"))
+DISPATCHER_POLL_INTERVAL = float(os.getenv("DISPATCHER_POLL_INTERVAL", "1.0"))  # seconds
+# Global enqueue rate for the dispatcher (sends/second, 0 = unlimited). Per-task jitter
+# and rate limits live in the "dispatch" block of task_registry.REGISTRY.
+DISPATCH_RATE_LIMIT = float(os.getenv("DISPATCH_RATE_LIMIT", "0"))
+DISPATCH_RATE_BURST = int(os.getenv("DISPATCH_RATE_BURST", "100"))
+# Parsed cron expressions kept per process (hubinsight.cron); one entry per distinct
+# (expression, time zone).
+CRON_CACHE_SIZE = int(os.getenv("CRON_CACHE_SIZE", "4096"))
+
+# Task handlers (hubinsight.handlers / hubinsight.executor)
+# "inline": async handlers run with asyncio.run() inside the worker slot (any pool).
+# "eventloop": async handlers share one loop per worker process; run the worker with
+# `-P threads -c <n>` so many of them are in flight at once.
+TASK_HANDLER_MODE = os.getenv("TASK_HANDLER_MODE", "inline").lower()
+# In-flight limit for async handlers whose REGISTRY entry has no "concurrency".
+TASK_HANDLER_CONCURRENCY = int(os.getenv("TASK_HANDLER_CONCURRENCY", "50"))
+
+# Overlap protection (hubinsight.overlap). Leases and run keys live in the default cache,
+# so multi-process workers need CACHE_URL. The lease TTL must outlast the slowest run.
+SCHEDULE_LEASE_TTL = int(os.getenv("SCHEDULE_LEASE_TTL", "3600"))  # seconds
+EXECUTION_IDEMPOTENCY_TTL = int(os.getenv("EXECUTION_IDEMPOTENCY_TTL", "86400"))  # seconds
+
+# Result memoization (hubinsight.memo): tasks opt in with "memoize_ttl" in REGISTRY.
+# Identical runs that start while one is computing wait up to this long for its result.
+RESULT_MEMO_WAIT = float(os.getenv("RESULT_MEMO_WAIT", "30"))  # seconds
+
+# Rendered schedule list/search pages (hubinsight.listcache); writes invalidate them by version.
+# Only used with a shared cache (CACHE_URL); 0 turns it off.
+SCHEDULE_LIST_CACHE_TTL = int(os.getenv("SCHEDULE_LIST_CACHE_TTL", "300"))  # seconds
+
+# POST /api/schedules/bulk/
+SCHEDULE_BULK_MAX_ITEMS = int(os.getenv("SCHEDULE_BULK_MAX_ITEMS", "500"))
+
+# Execution retention (manage.py prune_executions)
+# Per-task "retention_days" in task_registry.REGISTRY wins over the default.
+EXECUTION_RETENTION_DAYS = int(os.getenv("EXECUTION_RETENTION_DAYS", "30"))
+EXECUTION_ARCHIVE_DIR = os.getenv("EXECUTION_ARCHIVE_DIR", str(BASE_DIR / "var" / "archive"))
+
+# Execution logs are stored compressed in ExecutionLog; larger payloads are truncated.
+EXECUTION_LOG_MAX_BYTES = int(os.getenv("EXECUTION_LOG_MAX_BYTES", str(64 * 1024)))
+
+# Streaming exports: rows fetched per database round trip.
+EXPORT_CHUNK_SIZE = int(os.getenv("EXPORT_CHUNK_SIZE", "2000"))
+
+# Hourly/daily execution stats, updated as executions finish (GET .../stats/).
+EXECUTION_ROLLUPS_ENABLED = os.getenv("EXECUTION_ROLLUPS_ENABLED", "true").lower() == "true"
+
+# Default cap on enabled schedules per (non-superuser) owner; ScheduleQuota.max_active overrides it.
+SCHEDULE_ACTIVE_LIMIT = int(os.getenv("SCHEDULE_ACTIVE_LIMIT", "5"))
+
+# Run timing metrics (hubinsight.metrics, GET /api/metrics/). A redis:// URL shares one hash across
+# hosts; anything else is a directory of per-process files on this host. "" switches recording off.
+METRICS_STORE = os.getenv("METRICS_STORE", str(BASE_DIR / "var" / "metrics"))
+# Static bearer token Prometheus can scrape with; admins can always use their JWT.
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
+# Request profiling (hubinsight.profiling): Server-Timing header plus per-route histograms
+# (GET /api/profiling/) for a sample of requests. A request slower than REQUEST_PROFILING_SLOW_MS
+# arms its route; the next sampled request on it is run under cProfile and dumped here when slow.
+REQUEST_PROFILING = os.getenv("REQUEST_PROFILING", "false").lower() == "true"
+REQUEST_PROFILING_SAMPLE_RATE = float(os.getenv("REQUEST_PROFILING_SAMPLE_RATE", "0.1"))
+REQUEST_PROFILING_SLOW_MS = float(os.getenv("REQUEST_PROFILING_SLOW_MS", "1000"))
+REQUEST_PROFILING_DUMP_DIR = os.getenv("REQUEST_PROFILING_DUMP_DIR", str(BASE_DIR / "var" / "profiles"))  # "" disables
@@ -3,9 +3,15 @@ import os
 ENV = os.getenv("ENV", "dev").lower()           # dev | prod
 LOG_LEVEL = os.getenv("DJANGO_LOG_LEVEL", "INFO").upper()
 
+# Records waiting for the log writer thread; past this they are dropped and counted
+# (ERROR and above wait briefly for room first). See hubinsight.jsonlog.
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+# "<event or logger>=<rate>,..." : share of INFO/DEBUG records kept for high-volume events.
+LOG_SAMPLE_RATES = os.getenv(
+    "LOG_SAMPLE_RATES", "schedules_list_requested=0.1,schedules_list_returned=0.1"
+)
+
 DEV_FMT  = "[%(asctime)s] %(levelname)s %(name)s:%(lineno)d - %(message)s"
-JSON_FMT = '{"ts":"%(asctime)s","lvl":"%(levelname)s","logger":"%(name)s",' \
-           '"line":%(lineno)d,"msg":"%(message)s"}'
 
 LOGGING = {
     "version": 1,
@@ -13,14 +19,20 @@ LOGGING = {
 
     "formatters": {
         "dev":  {"format": DEV_FMT},
-        "json": {"format": JSON_FMT},
+        "json": {"()": "hubinsight.jsonlog.JsonFormatter"},
+    },
+
+    "filters": {
+        "sampling": {"()": "hubinsight.jsonlog.SamplingFilter", "rates": LOG_SAMPLE_RATES},
     },
 
     "handlers": {
         "console": {
-            "class": "logging.StreamHandler",
+            "class": "hubinsight.jsonlog.QueueStreamHandler",
+            "maxsize": LOG_QUEUE_SIZE,
             "level": LOG_LEVEL,
             "formatter": "dev" if ENV != "prod" else "json",
+            "filters": ["sampling"],
         },
     },
 
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import PredefinedTask, Schedule, Execution
+from .models import PredefinedTask, Schedule, Execution, ScheduleQuota
 
 @admin.register(PredefinedTask)
 class PTAdmin(admin.ModelAdmin):
@@ -15,3 +15,8 @@ class SAdmin(admin.ModelAdmin):
 class EAdmin(admin.ModelAdmin):
     list_display = ("id","schedule","status","started_at","finished_at")
     list_filter = ("status",)   
+
+@admin.register(ScheduleQuota)
+class QAdmin(admin.ModelAdmin):
+    list_display = ("owner","active_count","max_active","updated_at")
+    readonly_fields = ("active_count",)
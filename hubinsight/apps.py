@@ -5,3 +5,6 @@ class HubinsightConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'hubinsight'
     verbose_name = "Insight Hub"
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,165 @@
+# Async (ASGI) twins of the hot read endpoints under api/async/: same payloads, async ORM, no thread per request.
+import logging
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.http import HttpResponse, HttpResponseNotModified
+from django.views import View
+from rest_framework import exceptions, status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken, TokenError
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+from .catalog import CatalogEntry, catalog_cache, catalog_version, etag_matches
+from .logstore import aload_logs
+from .models import Execution, PredefinedTask, Schedule
+from .pagination import RoleAwareKeysetPagination, RoleAwarePageNumberPagination
+from .profiling import timed
+from .serializers import ExecutionDetailSerializer, ExecutionSerializer, PredefinedTaskSerializer, ScheduleSerializer
+from .views import ScheduleViewSet
+
+logger = logging.getLogger(__name__)
+
+User = get_user_model()
+_jwt = JWTAuthentication()
+_renderer = JSONRenderer()
+
+
+class AsyncAPIView(View):
+    """Minimal async counterpart of ``APIView``: JWT auth, DRF request parsing and JSON errors."""
+
+    authentication_required = True
+
+    async def authenticate(self, request):
+        header = _jwt.get_header(request)
+        if header is None:
+            return None
+        raw = _jwt.get_raw_token(header)
+        if raw is None:
+            return None
+        # Token validation is pure CPU; only the user lookup touches the database.
+        token = _jwt.get_validated_token(raw)
+        try:
+            user_id = token[jwt_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken("Token contained no recognizable user identification")
+        user = await User.objects.filter(**{jwt_settings.USER_ID_FIELD: user_id}).afirst()
+        if user is None or not user.is_active:
+            raise AuthenticationFailed("User not found", code="user_not_found")
+        return user
+
+    async def dispatch(self, request, *args, **kwargs):
+        if request.method.lower() not in ("get", "head", "options"):
+            return self.render({"detail": f'Method "{request.method}" not allowed.'}, status.HTTP_405_METHOD_NOT_ALLOWED)
+        self.request = Request(request)
+        try:
+            with timed("auth"):
+                user = await self.authenticate(request)
+            if user is None and self.authentication_required:
+                raise exceptions.NotAuthenticated()
+            self.request.user = user
+            return await self.get(self.request, *args, **kwargs)
+        except (exceptions.APIException, TokenError) as exc:
+            if isinstance(exc, TokenError):
+                exc = InvalidToken(str(exc))
+            code = exc.status_code
+            if isinstance(exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)):
+                code = status.HTTP_401_UNAUTHORIZED
+            return self.render({"detail": exc.detail} if not isinstance(exc.detail, dict) else exc.detail, code)
+
+    def render(self, data, code=status.HTTP_200_OK):
+        return HttpResponse(_renderer.render(data), status=code, content_type="application/json")
+
+    def paginator_for(self, request):
+        if request.query_params.get("pagination") == "cursor":
+            return RoleAwareKeysetPagination()
+        return RoleAwarePageNumberPagination()
+
+    async def page_data(self, queryset, serializer_class):
+        paginator = self.paginator_for(self.request)
+        page = await paginator.apaginate_queryset(queryset, self.request, view=self)
+        data = serializer_class(page, many=True).data
+        return paginator.get_paginated_response(data).data
+
+    async def paginated(self, queryset, serializer_class):
+        return self.render(await self.page_data(queryset, serializer_class))
+
+
+class AsyncScheduleList(AsyncAPIView):
+    # Same filters/search/ordering as ScheduleViewSet.list.
+    filter_backends = ScheduleViewSet.filter_backends
+    filterset_fields = ScheduleViewSet.filterset_fields
+    ordering_fields = ScheduleViewSet.ordering_fields
+    search_fields = ScheduleViewSet.search_fields
+    cursor_ordering = ("-created_at", "-id")
+    sync_params = (*filterset_fields, api_settings.SEARCH_PARAM)
+
+    def filter_queryset(self, queryset):
+        for backend in self.filter_backends:
+            queryset = backend().filter_queryset(self.request, queryset, self)
+        return queryset
+
+    async def get(self, request):
+        qs = Schedule.objects.filter(deleted_at__isnull=True).select_related("task", "owner")
+        if not request.user.is_superuser:
+            qs = qs.filter(owner=request.user)
+        if any(name in request.query_params for name in self.sync_params):
+            # FilterSet validation resolves task/owner ids, and search checks for the FTS table, with sync queries.
+            qs = await sync_to_async(self.filter_queryset)(qs)
+        else:
+            qs = self.filter_queryset(qs)
+        return await self.paginated(qs, ScheduleSerializer)
+
+
+class AsyncScheduleExecutions(AsyncAPIView):
+    cursor_ordering = ("-started_at", "-id")
+
+    async def get(self, request, pk):
+        schedules = Schedule.objects.filter(deleted_at__isnull=True)
+        if not request.user.is_superuser:
+            schedules = schedules.filter(owner=request.user)
+        if not await schedules.filter(pk=pk).aexists():
+            raise exceptions.NotFound("No Schedule matches the given query.")
+        return await self.paginated(Execution.objects.filter(schedule_id=pk), ExecutionSerializer)
+
+
+class AsyncExecutionDetail(AsyncAPIView):
+    async def get(self, request, pk):
+        ex = await Execution.objects.select_related("schedule__owner").filter(pk=pk).afirst()
+        if ex is None:
+            raise exceptions.NotFound("No Execution matches the given query.")
+        if not request.user.is_superuser and ex.schedule.owner_id != request.user.id:
+            raise exceptions.PermissionDenied()
+        context = {"request": request, "include_logs": "logs" in request.query_params.get("include", "").split(",")}
+        if context["include_logs"]:
+            context["logs"] = await aload_logs(ex.pk)
+        return self.render(ExecutionDetailSerializer(ex, context=context).data)
+
+
+class AsyncPredefinedTaskList(AsyncAPIView):
+    authentication_required = False
+
+    async def get(self, request):
+        version = await sync_to_async(catalog_version)()
+        variant = ("async", request.get_host(), request.get_full_path(), bool(request.user and request.user.is_superuser))
+        entry = catalog_cache.get(variant, version)
+        if entry is None:
+            qs = PredefinedTask.objects.filter(is_schedulable=True).order_by("name")
+            data = await self.page_data(qs, PredefinedTaskSerializer)
+            entry = CatalogEntry(version, _renderer.render(data), len(data.get("results", [])))
+            catalog_cache.put(variant, entry)
+
+        logger.info(
+            "predefined_tasks_listed",
+            extra={"count": entry.count, "user": getattr(request.user, "id", None)},
+        )
+        if etag_matches(request.headers.get("If-None-Match"), entry.etag):
+            resp = HttpResponseNotModified()
+        else:
+            resp = HttpResponse(entry.body, content_type="application/json")
+        resp["ETag"] = entry.etag
+        resp["Cache-Control"] = "no-cache"
+        return resp
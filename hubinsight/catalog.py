@@ -0,0 +1,64 @@
+import hashlib
+import threading
+
+from django.db.models import Count, Max
+
+from .models import PredefinedTask
+
+MAX_VARIANTS = 256
+
+
+def catalog_version():
+    """Catalog version read from the database, so a change saved by any process invalidates local copies."""
+    agg = PredefinedTask.objects.aggregate(changed=Max("updated_at"), count=Count("pk"))
+    # The count catches deletes, which leave Max(updated_at) unchanged.
+    return "%s:%s" % (agg["count"], agg["changed"].isoformat() if agg["changed"] else "")
+
+
+def make_etag(body: bytes) -> str:
+    return '"%s"' % hashlib.sha256(body).hexdigest()[:32]
+
+
+class CatalogEntry:
+    __slots__ = ("version", "body", "etag", "count")
+
+    def __init__(self, version, body, count):
+        self.version = version
+        self.body = body
+        self.etag = make_etag(body)
+        self.count = count
+
+
+class CatalogCache:
+    """Process-local store of rendered catalog responses, one per request variant (URL, host, role)."""
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, variant, version):
+        entry = self._entries.get(variant)
+        if entry is not None and entry.version == version:
+            return entry
+        return None
+
+    def put(self, variant, entry):
+        with self._lock:
+            if len(self._entries) >= MAX_VARIANTS:
+                self._entries.clear()
+            self._entries[variant] = entry
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+catalog_cache = CatalogCache()
+
+
+def etag_matches(if_none_match, etag):
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return etag in {tag.strip() for tag in if_none_match.split(",")}
@@ -0,0 +1,78 @@
+import copy
+from datetime import datetime
+from functools import lru_cache
+from zoneinfo import ZoneInfo
+
+from croniter import croniter
+from django.conf import settings
+from django.utils import timezone
+
+
+class CompiledCron:
+    """A parsed 5-field cron expression bound to a timezone."""
+
+    def __init__(self, expression: str, tz_name: str):
+        self.expression = expression
+        self.tz_name = tz_name
+        self.tz = ZoneInfo(tz_name)
+        self.fields = expression.split()
+        # croniter expands the fields in its constructor; next_after() copies
+        # this instance instead of parsing the expression again.
+        self._template = croniter(expression, datetime.now(self.tz))
+
+    def next_after(self, base: datetime) -> datetime:
+        itr = copy.copy(self._template)
+        itr.set_current(base.astimezone(self.tz), force=True)
+        return itr.get_next(datetime)
+
+    def last_at_or_before(self, base: datetime) -> datetime:
+        itr = copy.copy(self._template)
+        itr.set_current(base.astimezone(self.tz), force=True)
+        previous = itr.get_prev(datetime)
+        # get_prev is strict; base itself may be an occurrence.
+        following = self.next_after(previous)
+        return following if following <= base else previous
+
+
+@lru_cache(maxsize=settings.CRON_CACHE_SIZE)
+def _compile(expression: str, tz_name: str) -> CompiledCron:
+    return CompiledCron(expression, tz_name)
+
+
+def compile_cron(expression: str, tz_name: str = None) -> CompiledCron:
+    return _compile(expression, tz_name or timezone.get_current_timezone_name())
+
+
+def next_run_at(expression: str, base=None, tz_name: str = None) -> datetime:
+    return compile_cron(expression, tz_name).next_after(base or timezone.now())
+
+
+def next_runs(items, base=None, tz_name: str = None) -> dict:
+    """
+    Compute the next run for many ``(key, expression)`` pairs at once.
+
+    Every key sharing an expression gets the same result, so the work is one
+    cron evaluation per distinct expression. Invalid expressions map to None.
+    """
+    base = base or timezone.now()
+    by_expr = {}
+    for key, expression in items:
+        by_expr.setdefault(expression, []).append(key)
+
+    out = {}
+    for expression, keys in by_expr.items():
+        try:
+            nxt = next_run_at(expression, base=base, tz_name=tz_name)
+        except Exception:
+            nxt = None
+        for key in keys:
+            out[key] = nxt
+    return out
+
+
+def cache_info():
+    return _compile.cache_info()
+
+
+def clear_cache():
+    _compile.cache_clear()
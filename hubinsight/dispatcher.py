@@ -0,0 +1,118 @@
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .cron import next_runs
+from .listcache import bump_schedule_versions
+from .models import Schedule
+from .services import compute_next_run_at
+from .smoothing import fire_time, plan_fire_times, throttle
+from .tasks import run_predefined_task
+
+logger = logging.getLogger(__name__)
+
+
+def due_schedules(now):
+    return Schedule.objects.filter(
+        status=Schedule.Status.ENABLED,
+        deleted_at__isnull=True,
+        fire_at__lte=now,
+    ).order_by("fire_at")
+
+
+def _advance(schedule, now):
+    # Always move past "now" so a stopped dispatcher doesn't replay missed runs.
+    try:
+        return compute_next_run_at(schedule.cron_expression, base=now)
+    except Exception:
+        logger.warning(
+            "dispatcher_invalid_cron",
+            extra={"schedule_id": schedule.id, "cron": schedule.cron_expression},
+        )
+        return None
+
+
+def _claim_skip_locked(now, limit):
+    claimed = []
+    with transaction.atomic():
+        rows = list(
+            due_schedules(now)
+            .select_related("task")
+            .select_for_update(skip_locked=True, of=("self",))[:limit]
+        )
+        upcoming = next_runs(((sch.pk, sch.cron_expression) for sch in rows), base=now)
+        for sch in rows:
+            claimed.append((sch, sch.next_run_at))
+            sch.next_run_at = upcoming[sch.pk]
+            if sch.next_run_at is None:
+                logger.warning(
+                    "dispatcher_invalid_cron",
+                    extra={"schedule_id": sch.id, "cron": sch.cron_expression},
+                )
+        plan_fire_times(rows)
+        if rows:
+            Schedule.objects.bulk_update(rows, ["next_run_at", "fire_at"])
+    return claimed
+
+
+def _claim_compare_and_swap(now, limit):
+    # SQLite has no row locks: a row belongs to whoever moves its next_run_at first.
+    claimed = []
+    for sch in due_schedules(now).select_related("task")[:limit]:
+        scheduled_for = sch.next_run_at
+        next_run_at = _advance(sch, now)
+        fire_at = fire_time(sch.pk, sch.task.name, sch.cron_expression, next_run_at)
+        won = Schedule.objects.filter(pk=sch.pk, next_run_at=scheduled_for).update(
+            next_run_at=next_run_at, fire_at=fire_at
+        )
+        if won:
+            sch.next_run_at, sch.fire_at = next_run_at, fire_at
+            claimed.append((sch, scheduled_for))
+    return claimed
+
+
+def claim_due(now=None, limit=None):
+    now = now or timezone.now()
+    limit = limit or getattr(settings, "DISPATCHER_BATCH_SIZE", 500)
+    if connection.features.has_select_for_update_skip_locked:
+        return _claim_skip_locked(now, limit)
+    return _claim_compare_and_swap(now, limit)
+
+
+def enqueue(schedule, scheduled_for, countdown=0):
+    options = {"countdown": countdown} if countdown else {}
+    run_predefined_task.apply_async(
+        args=[schedule.id, schedule.task.name, schedule.inputs],
+        kwargs={"scheduled_for": scheduled_for.isoformat(), "overlap": schedule.overlap_policy},
+        **options,
+    )
+
+
+def dispatch_due(now=None, limit=None):
+    claimed = claim_due(now=now, limit=limit)
+    sent = deferred = 0
+    fired = []
+    for sch, scheduled_for in claimed:
+        # Over the rate limit: still send now, but with a countdown so workers see a steady flow.
+        countdown = throttle.delay_for(sch.task.name)
+        try:
+            enqueue(sch, scheduled_for, countdown=countdown)
+            sent += 1
+            deferred += bool(countdown)
+            sch.last_fired_at = timezone.now() + timedelta(seconds=countdown)
+            fired.append(sch)
+        except Exception:
+            logger.exception(
+                "dispatcher_enqueue_failed",
+                extra={"schedule_id": sch.id, "scheduled_for": scheduled_for.isoformat()},
+            )
+    if fired:
+        # Next to next_run_at, so drift from jitter and throttling stays visible on the row.
+        Schedule.objects.bulk_update(fired, ["last_fired_at"])
+    if claimed:
+        bump_schedule_versions(sch.owner_id for sch, _ in claimed)
+        logger.info("dispatcher_batch", extra={"claimed": len(claimed), "sent": sent, "deferred": deferred})
+    return len(claimed)
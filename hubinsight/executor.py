@@ -0,0 +1,103 @@
+import asyncio
+import concurrent.futures
+import os
+import threading
+
+from celery.exceptions import SoftTimeLimitExceeded
+from django.conf import settings
+
+from .handlers import get_handler
+from .routing import time_limits
+
+
+class EventLoopExecutor:
+    """
+    One asyncio loop per worker process, running on a daemon thread.
+
+    Celery threads submit coroutines and wait on the returned future, so with
+    ``-P threads -c 200`` a single process keeps hundreds of I/O-bound handlers
+    in flight while they all share this loop. Each task name gets a semaphore
+    sized from its ``concurrency`` in ``REGISTRY``.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._loop = None
+        self._pid = None
+        self._semaphores = {}
+
+    def _ensure_loop(self):
+        # A forked child inherits the object but not the loop thread: start a new one.
+        if self._loop is not None and self._pid == os.getpid():
+            return self._loop
+        with self._lock:
+            if self._loop is None or self._pid != os.getpid():
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="hubinsight-handlers", daemon=True).start()
+                self._loop, self._pid, self._semaphores = loop, os.getpid(), {}
+        return self._loop
+
+    def _semaphore(self, handler):
+        # Only touched from the loop thread, so no lock is needed.
+        limit = handler.concurrency or settings.TASK_HANDLER_CONCURRENCY
+        sem = self._semaphores.get(handler.name)
+        if sem is None:
+            sem = self._semaphores[handler.name] = asyncio.Semaphore(limit)
+        return sem
+
+    async def _guarded(self, handler, inputs, context):
+        async with self._semaphore(handler):
+            return await handler.func(inputs, context)
+
+    def submit(self, handler, inputs, context):
+        return asyncio.run_coroutine_threadsafe(self._guarded(handler, inputs, context), self._ensure_loop())
+
+    def run(self, handler, inputs, context, timeout=None):
+        future = self.submit(handler, inputs, context)
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            # Cancelling the future cancels the coroutine on the loop, freeing its semaphore slot.
+            future.cancel()
+            raise SoftTimeLimitExceeded(f"{handler.name} exceeded {timeout}s") from None
+
+
+executor = EventLoopExecutor()
+
+_sync_slots = {}
+_sync_slots_lock = threading.Lock()
+
+
+def _sync_slot(handler):
+    # Caps sync handlers per process when the worker runs a thread pool.
+    slot = _sync_slots.get(handler.name)
+    if slot is None:
+        with _sync_slots_lock:
+            slot = _sync_slots.setdefault(
+                handler.name, threading.BoundedSemaphore(handler.concurrency or settings.TASK_HANDLER_CONCURRENCY)
+            )
+    return slot
+
+
+def handler_timeout(task_name):
+    # The soft limit, else the hard one: Celery's threads pool enforces neither, so async handlers do it here.
+    hard, soft = time_limits(task_name)
+    return soft or hard or None
+
+
+async def _inline(handler, inputs, context, timeout):
+    try:
+        return await asyncio.wait_for(handler.func(inputs, context), timeout)
+    except asyncio.TimeoutError:
+        raise SoftTimeLimitExceeded(f"{handler.name} exceeded {timeout}s") from None
+
+
+def run_handler(task_name, inputs, context):
+    handler = get_handler(task_name)
+    if not handler.is_async:
+        with _sync_slot(handler):
+            return handler.func(inputs, context)
+    timeout = handler_timeout(task_name)
+    if settings.TASK_HANDLER_MODE == "eventloop":
+        return executor.run(handler, inputs, context, timeout=timeout)
+    return asyncio.run(_inline(handler, inputs, context, timeout))
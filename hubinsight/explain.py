@@ -0,0 +1,142 @@
+import json
+import re
+
+from django.db import connection, reset_queries
+from django.test.utils import CaptureQueriesContext
+
+# Tables that grow with usage; a full scan of any of them on a request path is a regression.
+WATCHED_TABLES = (
+    "hubinsight_schedule",
+    "hubinsight_schedulesearch",
+    "hubinsight_execution",
+    "hubinsight_executionlog",
+    "hubinsight_executionrollup",
+)
+
+_ALIAS = re.compile(r'"(\w+)" (?:AS )?"?([A-Z]\d+)"?\b')
+_SQLITE_SCAN = re.compile(r"^SCAN (\w+)( USING (?:COVERING )?INDEX \w+)?$")
+_SQLITE_SORT = re.compile(r"USE TEMP B-TREE FOR (?:RIGHT PART OF )?ORDER BY")
+
+
+class Plan:
+    __slots__ = ("label", "sql", "lines", "full_scans", "sorts")
+
+    def __init__(self, label, sql, lines, full_scans, sorts):
+        self.label = label
+        self.sql = sql
+        self.lines = lines
+        self.full_scans = full_scans
+        self.sorts = sorts
+
+
+def _sqlite_plan(cur, sql):
+    cur.execute("EXPLAIN QUERY PLAN " + sql)
+    lines = [row[3] for row in cur.fetchall()]
+    # Subqueries are reported by alias (U0, T3); map those back to table names.
+    aliases = dict((alias, table) for table, alias in _ALIAS.findall(sql))
+    sorts = sum(1 for line in lines if _SQLITE_SORT.search(line))
+    scans = []
+    for line in lines:
+        m = _SQLITE_SCAN.match(line)
+        # Walking a whole index is only cheap when it yields rows in ORDER BY order and LIMIT stops it early.
+        if m and (not m.group(2) or sorts):
+            scans.append(aliases.get(m.group(1), m.group(1)))
+    return lines, scans, sorts
+
+
+def _walk(node, depth=0):
+    yield depth, node
+    for child in node.get("Plans", ()):
+        yield from _walk(child, depth + 1)
+
+
+def _postgres_plan(cur, sql):
+    # Tiny tables make the planner prefer seq scans; with them priced out, one only shows up if no index fits.
+    cur.execute("SET LOCAL enable_seqscan = off")
+    cur.execute("EXPLAIN (FORMAT JSON) " + sql)
+    raw = cur.fetchone()[0]
+    root = (raw if isinstance(raw, list) else json.loads(raw))[0]["Plan"]
+    lines, scans, sorts = [], [], 0
+    sort_depth = None
+    for depth, node in _walk(root):
+        kind = node["Node Type"]
+        rel = node.get("Relation Name")
+        index = node.get("Index Name")
+        lines.append("  " * depth + " ".join(p for p in (kind, rel and f"on {rel}", index and f"using {index}") if p))
+        if sort_depth is not None and depth <= sort_depth:
+            sort_depth = None
+        if kind in ("Sort", "Incremental Sort"):
+            sorts += 1
+            sort_depth = depth
+        if kind == "Seq Scan" and rel:
+            scans.append(rel)
+        elif kind in ("Index Scan", "Index Only Scan") and "Index Cond" not in node and sort_depth is not None:
+            # A whole index read only to be re-sorted is a full scan with extra steps.
+            scans.append(rel)
+    return lines, scans, sorts
+
+
+def explain(label, sql, conn=None):
+    """Plan of one captured query; ``full_scans`` lists watched tables read without an index."""
+    conn = conn or connection
+    with conn.cursor() as cur:
+        if conn.vendor == "sqlite":
+            lines, scans, sorts = _sqlite_plan(cur, sql)
+        elif conn.vendor == "postgresql":
+            lines, scans, sorts = _postgres_plan(cur, sql)
+        else:
+            raise NotImplementedError(f"No EXPLAIN support for {conn.vendor}")
+    return Plan(label, sql, lines, [t for t in scans if t in WATCHED_TABLES], sorts)
+
+
+def is_plannable(sql):
+    head = sql.lstrip().split(None, 1)[0].upper() if sql.strip() else ""
+    return head in ("SELECT", "WITH")
+
+
+def scenarios(schedule, execution, task):
+    """(label, who, method, path, body) per endpoint query shape; ``who`` is "owner" or "super"."""
+    s, e = schedule.pk, execution.pk
+    search = {"filters": {"task__name__icontains": task.name[:5], "status": "ENABLED"}, "ordering": ["-last_run_at"]}
+    return [
+        ("list", "owner", "get", "/api/schedules/", None),
+        ("list (superuser)", "super", "get", "/api/schedules/", None),
+        ("list ?status", "owner", "get", "/api/schedules/?status=ENABLED", None),
+        ("list ?task", "owner", "get", f"/api/schedules/?task={task.pk}", None),
+        ("list ?ordering=next_run_at", "owner", "get", "/api/schedules/?ordering=next_run_at", None),
+        ("list ?ordering=-last_run_at", "owner", "get", "/api/schedules/?ordering=-last_run_at", None),
+        ("list ?ordering=next_run_at (superuser)", "super", "get", "/api/schedules/?ordering=next_run_at", None),
+        ("list ?ordering=-last_run_at (superuser)", "super", "get", "/api/schedules/?ordering=-last_run_at", None),
+        ("list ?pagination=cursor", "owner", "get", "/api/schedules/?pagination=cursor", None),
+        ("list ?pagination=cursor (superuser)", "super", "get", "/api/schedules/?pagination=cursor", None),
+        ("list ?search", "owner", "get", f"/api/schedules/?search={task.name[:5]}", None),
+        ("search", "owner", "post", "/api/schedules/search/", search),
+        ("export", "owner", "get", "/api/schedules/export/?status=ENABLED", None),
+        ("detail", "owner", "get", f"/api/schedules/{s}/", None),
+        ("executions", "owner", "get", f"/api/schedules/{s}/executions/", None),
+        ("executions ?pagination=cursor", "owner", "get", f"/api/schedules/{s}/executions/?pagination=cursor", None),
+        ("schedule stats", "owner", "get", f"/api/schedules/{s}/stats/", None),
+        ("execution detail", "owner", "get", f"/api/executions/{e}/?include=logs", None),
+        ("stats", "owner", "get", "/api/stats/", None),
+        ("stats (superuser)", "super", "get", "/api/stats/", None),
+        ("async list", "owner", "get", "/api/async/schedules/", None),
+        ("async executions", "owner", "get", f"/api/async/schedules/{s}/executions/", None),
+    ]
+
+
+def request_plans(client, label, method, path, body, authorization):
+    """Issue one request and EXPLAIN every read it made: ``(response, plans)``."""
+    reset_queries()
+    with CaptureQueriesContext(connection) as captured:
+        if method == "post":
+            resp = client.post(path, json.dumps(body), content_type="application/json",
+                               HTTP_AUTHORIZATION=authorization)
+        else:
+            resp = client.get(path, HTTP_AUTHORIZATION=authorization)
+        if getattr(resp, "streaming", False):
+            b"".join(resp.streaming_content)
+    return resp, explain_captured(label, captured)
+
+
+def explain_captured(label, captured):
+    return [explain(label, q["sql"]) for q in captured.captured_queries if is_plannable(q["sql"])]
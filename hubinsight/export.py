@@ -0,0 +1,84 @@
+import csv
+import json
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+
+EXPORT_FORMATS = ("ndjson", "csv")
+CONTENT_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+SCHEDULE_EXPORT_FIELDS = [
+    "id",
+    "task__name",
+    "owner__username",
+    "cron_expression",
+    "inputs",
+    "status",
+    "overlap_policy",
+    "created_at",
+    "last_run_at",
+    "next_run_at",
+    "fire_at",
+    "last_fired_at",
+]
+EXECUTION_EXPORT_FIELDS = [
+    "id",
+    "schedule_id",
+    "task_name",
+    "scheduled_for",
+    "enqueued_at",
+    "started_at",
+    "finished_at",
+    "status",
+    "runtime_ms",
+    "cache_hit",
+    "cached_from",
+]
+
+
+class _Echo:
+    def write(self, value):
+        return value
+
+
+def _csv_value(value):
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, cls=DjangoJSONEncoder, separators=(",", ":"))
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return value
+
+
+def iter_ndjson(qs, fields, chunk_size):
+    buf = []
+    for row in qs.values(*fields).iterator(chunk_size=chunk_size):
+        buf.append(json.dumps(row, cls=DjangoJSONEncoder, separators=(",", ":")))
+        if len(buf) >= chunk_size:
+            yield "\n".join(buf) + "\n"
+            buf = []
+    if buf:
+        yield "\n".join(buf) + "\n"
+
+
+def iter_csv(qs, fields, chunk_size):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(fields)
+    buf = []
+    for row in qs.values_list(*fields).iterator(chunk_size=chunk_size):
+        buf.append(writer.writerow([_csv_value(v) for v in row]))
+        if len(buf) >= chunk_size:
+            yield "".join(buf)
+            buf = []
+    if buf:
+        yield "".join(buf)
+
+
+def stream_export(qs, fields, fmt, filename):
+    """Stream ``qs`` as NDJSON or CSV; rows are read with a chunked iterator so memory stays flat."""
+    chunk_size = settings.EXPORT_CHUNK_SIZE
+    rows = iter_csv(qs, fields, chunk_size) if fmt == "csv" else iter_ndjson(qs, fields, chunk_size)
+    resp = StreamingHttpResponse(rows, content_type=CONTENT_TYPES[fmt])
+    resp["Content-Disposition"] = f'attachment; filename="{filename}.{fmt}"'
+    resp["X-Accel-Buffering"] = "no"
+    return resp
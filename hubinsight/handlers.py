@@ -0,0 +1,68 @@
+import asyncio
+import inspect
+import time
+
+from django.utils import timezone
+
+from .task_registry import REGISTRY
+
+
+class UnknownTask(LookupError):
+    pass
+
+
+class Handler:
+    __slots__ = ("name", "func", "is_async", "concurrency")
+
+    def __init__(self, name, func, concurrency=None):
+        self.name = name
+        self.func = func
+        self.is_async = inspect.iscoroutinefunction(func)
+        self.concurrency = concurrency
+
+
+HANDLERS = {}
+
+
+def handler(name):
+    """
+    Register ``func(inputs, context)`` as the implementation of a
+    ``REGISTRY`` task. ``async def`` handlers run on the worker's event loop
+    (see hubinsight.executor); their in-flight limit is the task's
+    ``concurrency`` in ``REGISTRY``.
+    """
+    if name not in REGISTRY:
+        raise UnknownTask(f"{name!r} is not in task_registry.REGISTRY")
+
+    def register(func):
+        HANDLERS[name] = Handler(name, func, concurrency=REGISTRY[name].get("concurrency"))
+        return func
+    return register
+
+
+def get_handler(name):
+    try:
+        return HANDLERS[name]
+    except KeyError:
+        raise UnknownTask(f"No handler registered for {name!r}") from None
+
+
+@handler("send_report")
+async def send_report(inputs, context):
+    days = inputs.get("days", 7)
+    # Stand-in for building the report and handing it to the mail provider.
+    await asyncio.sleep(0.2)
+    return {"email": inputs["email"], "days": days, "sent_at": timezone.now().isoformat()}
+
+
+@handler("reindex_search")
+def reindex_search(inputs, context):
+    segment = inputs.get("segment", "all")
+    time.sleep(0.2)
+    return {"segment": segment, "reindexed_at": timezone.now().isoformat()}
+
+
+@handler("heavy_etl")
+def heavy_etl(inputs, context):
+    time.sleep(0.2)
+    return {"echo": inputs, "ts": context["started"].isoformat()}
@@ -0,0 +1,217 @@
+# Log pipeline for settings/components/logging.py; loaded while settings are configured, so no Django apps here.
+import atexit
+import copy
+import json
+import logging
+import os
+import queue
+import random
+import sys
+import threading
+import time
+import weakref
+from datetime import date, datetime, time as dt_time, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+from celery.signals import worker_process_shutdown
+
+# Everything a bare LogRecord carries; the rest came in through ``extra``.
+_RESERVED = frozenset(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "taskName"}
+
+
+def _default(value):
+    if isinstance(value, (datetime, date, dt_time)):
+        return value.isoformat()
+    return str(value)
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        doc = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "lvl": record.levelname,
+            "logger": record.name,
+            "line": record.lineno,
+            "msg": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED and not key.startswith("_"):
+                doc[key] = value
+        if record.exc_info:
+            doc["exc"] = record.exc_text or self.formatException(record.exc_info)
+        if record.stack_info:
+            doc["stack"] = self.formatStack(record.stack_info)
+        return json.dumps(doc, default=_default, ensure_ascii=False, separators=(",", ":"))
+
+
+def parse_rates(spec):
+    """``"schedules_list_requested=0.1,hubinsight.async_views=0.5"`` -> ``{name: rate}``."""
+    rates = {}
+    for part in (spec or "").split(","):
+        name, sep, rate = part.strip().partition("=")
+        if sep and name:
+            rates[name.strip()] = min(1.0, max(0.0, float(rate)))
+    return rates
+
+
+class SamplingFilter(logging.Filter):
+    """Keeps ``rate`` of INFO/DEBUG records per event or logger prefix; kept ones carry ``sample_rate``."""
+
+    def __init__(self, rates=None, name=""):
+        super().__init__(name)
+        self.rates = parse_rates(rates) if isinstance(rates, str) else dict(rates or {})
+
+    def rate_for(self, record):
+        rate = self.rates.get(record.msg) if isinstance(record.msg, str) else None
+        if rate is not None:
+            return rate
+        name = record.name
+        while name:
+            if name in self.rates:
+                return self.rates[name]
+            name = name.rpartition(".")[0]
+        return None
+
+    def filter(self, record):
+        if not self.rates or record.levelno >= logging.WARNING:
+            return True
+        rate = self.rate_for(record)
+        if rate is None or rate >= 1.0:
+            return True
+        if random.random() >= rate:
+            return False
+        record.sample_rate = rate
+        return True
+
+
+_handlers = weakref.WeakSet()
+
+
+class QueueStreamHandler(QueueHandler):
+    """Drop-in ``StreamHandler`` writing from a listener thread; past ``maxsize`` queued records, drops and counts."""
+
+    REPORT_INTERVAL = 1.0
+    FLUSH_TIMEOUT = 1.0  # seconds flush() waits for the listener to catch up
+
+    def __init__(self, stream=None, maxsize=10000, error_timeout=0.05):
+        self.maxsize = int(maxsize)
+        self.error_timeout = float(error_timeout)
+        super().__init__(queue.Queue(self.maxsize))
+        self.target = logging.StreamHandler(stream or sys.stderr)
+        self.dropped = 0
+        self._reported = 0
+        self._reported_at = time.monotonic()
+        self._lock = threading.Lock()
+        self._listener = None
+        self._pid = None
+        _handlers.add(self)
+
+    def setFormatter(self, fmt):
+        # Formatting happens on the listener thread, in the target handler.
+        self.target.setFormatter(fmt)
+
+    def prepare(self, record):
+        # Freeze the message now (args may change later); the formatter runs on the listener.
+        # A copy, so handlers after this one still see the original msg/args (bpo-35726).
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record):
+        self._ensure_listener()
+        try:
+            if record.levelno >= logging.ERROR:
+                self.queue.put(record, timeout=self.error_timeout)
+            else:
+                self.queue.put_nowait(record)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+
+    def _ensure_listener(self):
+        # Started lazily so each forked worker process gets its own thread (and a fresh queue).
+        pid = os.getpid()
+        if self._listener is not None and self._pid == pid:
+            return
+        with self._lock:
+            if self._listener is not None and self._pid == pid:
+                return
+            if self._pid not in (None, pid):
+                # The parent's queue (and its lock) came along with the fork; start clean.
+                self.queue = queue.Queue(self.maxsize)
+                self.dropped = self._reported = 0
+            self._pid = pid
+            self._listener = _Listener(self)
+            self._listener.start()
+
+    def report_drops(self):
+        with self._lock:
+            missed = self.dropped - self._reported
+            self._reported = self.dropped
+            self._reported_at = time.monotonic()
+        if missed:
+            record = logging.LogRecord(
+                "hubinsight.jsonlog", logging.WARNING, __file__, 0, "log_records_dropped", None, None
+            )
+            record.dropped = missed
+            record.dropped_total = self.dropped
+            self.target.handle(record)
+
+    def flush(self):
+        # Waits (briefly) for what is queued to be written; the listener keeps running.
+        if self._listener is not None and self._pid == os.getpid():
+            deadline = time.monotonic() + self.FLUSH_TIMEOUT
+            while self.queue.unfinished_tasks and time.monotonic() < deadline:
+                time.sleep(0.005)
+        self.report_drops()
+        self.target.flush()
+
+    def stop(self):
+        """Drain the queue and stop the listener thread; the next record starts a new one."""
+        listener = self._listener
+        if listener is not None and self._pid == os.getpid():
+            listener.stop()
+            self._listener = None
+        self.report_drops()
+        self.target.flush()
+
+    def close(self):
+        self.stop()
+        self.target.close()
+        super().close()
+
+
+class _Listener(QueueListener):
+    def __init__(self, handler):
+        super().__init__(handler.queue, handler.target)
+        self.owner = handler
+
+    def handle(self, record):
+        super().handle(record)
+        owner = self.owner
+        if owner.dropped != owner._reported and time.monotonic() - owner._reported_at >= owner.REPORT_INTERVAL:
+            owner.report_drops()
+
+    def enqueue_sentinel(self):
+        # The stock put_nowait fails on a full queue; wait for the listener to make room.
+        self.queue.put(self._sentinel)
+
+    def start(self):
+        super().start()
+        self._thread.name = "log-listener"
+
+
+def dropped_records():
+    """Records dropped by every queue handler in this process."""
+    return sum(handler.dropped for handler in list(_handlers))
+
+
+def stop_log_queues(**kwargs):
+    for handler in list(_handlers):
+        handler.stop()
+
+
+atexit.register(stop_log_queues)
+# Prefork children leave through os._exit, skipping atexit.
+worker_process_shutdown.connect(stop_log_queues, weak=False)
@@ -0,0 +1,77 @@
+import hashlib
+import json
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+
+VERSION_KEY = "hubinsight:schedules:version:%s"
+RESPONSE_KEY = "hubinsight:schedules:page:%s"
+# "*" changes with any schedule (superusers list everyone's); "all" is bumped for fleet-wide rewrites.
+ANY_OWNER = "*"
+EVERYONE = "all"
+
+
+def page_cache_enabled():
+    """
+    Pages are cached only in a shared backend (CACHE_URL). Version bumps from
+    other processes (bulk commands, Celery, retention) never reach a
+    per-process LocMem, so pages there would go stale until their TTL.
+    """
+    return settings.SCHEDULE_LIST_CACHE_TTL > 0 and not isinstance(caches["default"], (LocMemCache, DummyCache))
+
+
+def _version_keys(user):
+    scope = ANY_OWNER if user.is_superuser else user.pk
+    return [VERSION_KEY % EVERYONE, VERSION_KEY % scope]
+
+
+def list_versions(user):
+    keys = _version_keys(user)
+    found = cache.get_many(keys)
+    for key in keys:
+        if key not in found:
+            cache.add(key, uuid.uuid4().hex, None)
+            found[key] = cache.get(key)
+    return tuple(found[key] for key in keys)
+
+
+def bump_schedule_versions(owner_ids=None):
+    """
+    Invalidate cached schedule pages for ``owner_ids`` (None = everyone).
+    The bump waits for the surrounding transaction to commit, so a page
+    cached under the new version can never hold pre-commit rows.
+    """
+    if owner_ids is None:
+        keys = [VERSION_KEY % EVERYONE]
+    else:
+        keys = [VERSION_KEY % pk for pk in set(owner_ids)] + [VERSION_KEY % ANY_OWNER]
+    transaction.on_commit(lambda: cache.set_many({key: uuid.uuid4().hex for key in keys}, None))
+
+
+def response_key(request, body=None):
+    params = sorted((k, sorted(v)) for k, v in request.query_params.lists())
+    raw = json.dumps(
+        [
+            request.user.pk,
+            request.user.is_superuser,
+            list_versions(request.user),
+            request.build_absolute_uri(request.path),
+            params,
+            body,
+        ],
+        sort_keys=True,
+        default=str,
+    )
+    return RESPONSE_KEY % hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def get_page(key):
+    return cache.get(key)
+
+
+def put_page(key, body):
+    cache.set(key, body, settings.SCHEDULE_LIST_CACHE_TTL)
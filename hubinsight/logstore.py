@@ -0,0 +1,67 @@
+import json
+import zlib
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .models import ExecutionLog
+
+TRUNCATION_MARKER = "__truncated__"
+
+
+def pack_logs(logs):
+    """Serialize and compress ``logs``; returns ``(data, size, truncated)``."""
+    raw = json.dumps(logs, cls=DjangoJSONEncoder, separators=(",", ":"), ensure_ascii=False)
+    # "replace" keeps a lone surrogate from a handler's output from failing the whole write.
+    encoded = raw.encode("utf-8", "replace")
+    size = len(encoded)
+    limit = settings.EXECUTION_LOG_MAX_BYTES
+    truncated = size > limit
+    if truncated:
+        # Cut on bytes; "ignore" drops a multi-byte character split by the cut.
+        preview = encoded[:limit].decode("utf-8", "ignore")
+        encoded = json.dumps(
+            {TRUNCATION_MARKER: True, "original_size": size, "preview": preview},
+            separators=(",", ":"),
+            ensure_ascii=False,
+        ).encode("utf-8")
+    return zlib.compress(encoded), size, truncated
+
+
+def unpack_logs(data):
+    return json.loads(zlib.decompress(bytes(data)).decode("utf-8"))
+
+
+def build_log(execution, logs):
+    data, size, truncated = pack_logs(logs)
+    return ExecutionLog(execution=execution, data=data, size=size, truncated=truncated)
+
+
+def store_logs(pairs):
+    """Upsert logs for ``(execution, logs)`` pairs whose executions are already saved."""
+    rows = [build_log(ex, logs) for ex, logs in pairs if logs is not None]
+    if rows:
+        ExecutionLog.objects.bulk_create(
+            rows,
+            update_conflicts=True,
+            unique_fields=["execution"],
+            update_fields=["data", "size", "truncated"],
+        )
+    return len(rows)
+
+
+def load_logs(execution_id):
+    row = ExecutionLog.objects.filter(execution_id=execution_id).only("data").first()
+    return unpack_logs(row.data) if row else None
+
+
+async def aload_logs(execution_id):
+    row = await ExecutionLog.objects.filter(execution_id=execution_id).only("data").afirst()
+    return unpack_logs(row.data) if row else None
+
+
+def load_logs_many(execution_ids):
+    return {
+        row.execution_id: unpack_logs(row.data)
+        for row in ExecutionLog.objects.filter(execution_id__in=execution_ids).only("execution_id", "data")
+    }
@@ -0,0 +1,310 @@
+import json
+import logging
+import re
+import time
+import uuid
+from contextlib import contextmanager, nullcontext
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, reset_queries, transaction
+from django.db.models import Count
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import URLPattern, URLResolver
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import AccessToken
+
+from hubinsight import urls as hub_urls
+from hubinsight.listcache import page_cache_enabled
+from hubinsight.management.commands.bench_reads import percentile
+from hubinsight.models import Execution, Schedule
+
+
+class Rollback(Exception):
+    pass
+
+
+@contextmanager
+def rolled_back():
+    # Write endpoints run for real and are undone, so every sample sees the same dataset.
+    try:
+        with transaction.atomic():
+            yield
+            raise Rollback
+    except Rollback:
+        pass
+
+
+class Endpoint:
+    __slots__ = ("route", "method", "query", "body", "paged", "roles")
+
+    def __init__(self, route, method="get", query="", body=None, paged=False, roles=("super", "owner")):
+        self.route = route
+        self.method = method
+        self.query = query
+        self.body = body
+        self.paged = paged
+        self.roles = roles
+
+    @property
+    def name(self):
+        return f"{self.method.upper()} /{self.route}{'?' + self.query if self.query else ''}"
+
+
+def url_routes(patterns=None, prefix=""):
+    """Route templates in hubinsight.urls (``schedules/<pk>/stats/``), format-suffix variants left out."""
+    routes = set()
+    for p in hub_urls.urlpatterns if patterns is None else patterns:
+        pattern = prefix + str(p.pattern)
+        if isinstance(p, URLResolver):
+            routes |= url_routes(p.url_patterns, pattern)
+        elif isinstance(p, URLPattern) and "format" not in pattern:
+            route = re.sub(r"\(\?P<(\w+)>[^)]*\)", r"<\1>", pattern.replace("^", "").replace("$", ""))
+            routes.add(re.sub(r"<\w+:(\w+)>", r"<\1>", route))
+    return routes
+
+
+def endpoints(ctx):
+    sch, task = ctx["schedule"], ctx["schedule"].task
+    inputs = sch.inputs
+    create = {"task": task.pk, "cron_expression": "0 * * * *", "inputs": inputs, "status": "DISABLED"}
+    update = {"cron_expression": "*/30 * * * *", "inputs": inputs, "status": sch.status, "overlap_policy": "SKIP"}
+    return [
+        Endpoint("", roles=("super",)),
+        Endpoint("users/", "post", body=lambda: {"username": f"bench-{uuid.uuid4().hex[:12]}", "password": "bench-pass-1"},
+                 roles=("super",)),
+        Endpoint("tasks/predefined/"),
+        Endpoint("schedules/", paged=True),
+        Endpoint("schedules/", query="pagination=cursor", paged=True),
+        Endpoint("schedules/", query="status=ENABLED&ordering=-last_run_at", paged=True),
+        Endpoint("schedules/", query=f"search={task.name[:6]}", paged=True),
+        Endpoint("schedules/", "post", body=lambda: create),
+        Endpoint("schedules/search/", "post", body=lambda: {"filters": {"status": "ENABLED"}, "ordering": ["-last_run_at"]},
+                 paged=True),
+        Endpoint("schedules/bulk/", "post", body=lambda: {"items": [create, create, {"id": sch.pk, **update}]},
+                 roles=("owner",)),
+        Endpoint("schedules/export/", query=f"owner__username={ctx['owner'].username}"),
+        Endpoint("schedules/executions/export/", query=f"owner__username={ctx['owner'].username}&status=ENABLED"),
+        Endpoint("schedules/<pk>/"),
+        Endpoint("schedules/<pk>/", "put", body=lambda: update),
+        Endpoint("schedules/<pk>/", "patch", body=lambda: {"cron_expression": "*/20 * * * *"}),
+        Endpoint("schedules/<pk>/", "delete"),
+        Endpoint("schedules/<pk>/executions/", paged=True),
+        Endpoint("schedules/<pk>/executions/", query="pagination=cursor", paged=True),
+        Endpoint("schedules/<pk>/executions/export/"),
+        Endpoint("schedules/<pk>/stats/", query="granularity=day"),
+        Endpoint("executions/<pk>/", query="include=logs"),
+        Endpoint("stats/", query="granularity=day"),
+        Endpoint("metrics/", roles=("super",)),
+        Endpoint("profiling/", roles=("super",)),
+        Endpoint("async/tasks/predefined/"),
+        Endpoint("async/schedules/", paged=True),
+        Endpoint("async/schedules/<pk>/executions/", paged=True),
+        Endpoint("async/executions/<pk>/", query="include=logs"),
+    ]
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark every hubinsight endpoint: latency percentiles and SQL query counts per page size; "
+        "fails when an endpoint's query count grows with its page size (N+1)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=30, help="Timed requests per endpoint/role/page size")
+        parser.add_argument("--warmup", type=int, default=2)
+        parser.add_argument("--page-sizes", default="5,25,100", help="Comma-separated page sizes for paged endpoints")
+        parser.add_argument("--output", help="Write results as JSON to this file")
+        parser.add_argument("--compare", help="Earlier --output file to diff against")
+        parser.add_argument("--label", default="", help="Free-form run label stored in the JSON")
+        parser.add_argument("--warm-cache", action="store_true", help="Leave the schedule list response cache on")
+
+    def handle(self, *args, **opts):
+        if "testserver" not in settings.ALLOWED_HOSTS:
+            settings.ALLOWED_HOSTS = [*settings.ALLOWED_HOSTS, "testserver"]
+        # Write endpoints log a warning per call (soft deletes, quota checks); keep the table readable.
+        logging.getLogger("hubinsight").setLevel(logging.ERROR)
+        page_sizes = sorted({int(size) for size in opts["page_sizes"].split(",") if size})
+
+        ctx = self.context()
+        table = endpoints(ctx)
+        missing = url_routes() - {e.route for e in table}
+        if missing:
+            raise CommandError(f"Endpoints without a benchmark entry: {', '.join(sorted(missing))}")
+
+        dataset = {
+            "users": get_user_model().objects.count(),
+            "schedules": Schedule.objects.count(),
+            "executions": Execution.objects.count(),
+        }
+        self.stdout.write(
+            f"Dataset: {dataset['users']} users, {dataset['schedules']} schedules, {dataset['executions']} executions"
+        )
+        self.stdout.write(
+            f"{'endpoint':<58} {'role':<6} {'size':>5} {'rows':>5} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8}"
+            f" {'queries':>7} {'sql ms':>7}"
+        )
+
+        results = []
+        cache_ttl = settings.SCHEDULE_LIST_CACHE_TTL if opts["warm_cache"] else 0
+        if opts["warm_cache"] and not page_cache_enabled():
+            self.stdout.write("--warm-cache has no effect: the schedule list cache needs CACHE_URL")
+        with override_settings(SCHEDULE_LIST_CACHE_TTL=cache_ttl):
+            for endpoint in table:
+                for role in endpoint.roles:
+                    sizes = page_sizes if endpoint.paged and role == "super" else [None]
+                    for size in sizes:
+                        row = self.measure(endpoint, role, size, ctx, opts)
+                        results.append(row)
+                        self.stdout.write(
+                            f"{row['endpoint']:<58} {role:<6} {size or '-':>5} {row['rows'] if row['rows'] is not None else '-':>5}"
+                            f" {row['p50_ms']:8.1f} {row['p90_ms']:8.1f} {row['p99_ms']:8.1f}"
+                            f" {row['queries']:7d} {row['sql_ms']:7.1f}"
+                        )
+
+        n_plus_one = self.scaling(results)
+        report = {
+            "label": opts["label"],
+            "at": timezone.now().isoformat(),
+            "vendor": connection.vendor,
+            "dataset": dataset,
+            "page_sizes": page_sizes,
+            "requests": opts["requests"],
+            "results": results,
+            "n_plus_one": n_plus_one,
+        }
+        if opts["output"]:
+            with open(opts["output"], "w") as fh:
+                json.dump(report, fh, indent=2)
+            self.stdout.write(f"Wrote {opts['output']}")
+        if opts["compare"]:
+            self.compare(opts["compare"], results)
+
+        flagged = [item for item in n_plus_one if item["verdict"] == "grows"]
+        for item in n_plus_one:
+            if item["verdict"] != "constant":
+                self.stdout.write(f"{item['verdict']:>12}: {item['endpoint']} queries {item['queries']} rows {item['rows']}")
+        if flagged:
+            raise CommandError(f"{len(flagged)} endpoint(s) issue more queries for bigger pages (N+1).")
+        self.stdout.write(self.style.SUCCESS("Query counts are independent of page size."))
+
+    def context(self):
+        User = get_user_model()
+        # POST /users/ is IsAdminUser, so the superuser must also be staff.
+        superuser = User.objects.filter(is_superuser=True, is_staff=True).order_by("id").first()
+        if superuser is None:
+            superuser = User.objects.create(
+                username=f"bench-admin-{uuid.uuid4().hex[:8]}", is_superuser=True, is_staff=True
+            )
+        # The busiest live schedule gives paged history endpoints enough rows to fill the largest page.
+        busiest = (
+            Schedule.objects.filter(deleted_at__isnull=True)
+            .annotate(n=Count("executions"))
+            .order_by("-n", "id")
+            .select_related("task", "owner")
+            .first()
+        )
+        if busiest is None:
+            raise CommandError("No schedules; run generate_load_data first.")
+        execution = busiest.executions.order_by("-started_at", "-id").first()
+        if execution is None:
+            raise CommandError("No executions; run generate_load_data first.")
+        return {
+            "schedule": busiest,
+            "execution": execution,
+            "owner": busiest.owner,
+            "tokens": {
+                "super": "Bearer " + str(AccessToken.for_user(superuser)),
+                "owner": "Bearer " + str(AccessToken.for_user(busiest.owner)),
+            },
+        }
+
+    def request(self, client, endpoint, role, size, ctx):
+        pk = ctx["execution"].pk if endpoint.route.startswith(("executions/", "async/executions/")) else ctx["schedule"].pk
+        query = "&".join(q for q in (endpoint.query, f"page_size={size}" if size else "") if q)
+        url = "/api/" + endpoint.route.replace("<pk>", str(pk)) + (f"?{query}" if query else "")
+        kwargs = {"HTTP_AUTHORIZATION": ctx["tokens"][role]}
+        if endpoint.body is not None:
+            kwargs.update(data=json.dumps(endpoint.body()), content_type="application/json")
+        resp = getattr(client, endpoint.method)(url, **kwargs)
+        if getattr(resp, "streaming", False):
+            b"".join(resp.streaming_content)
+        if resp.status_code >= 400:
+            raise CommandError(f"{endpoint.method.upper()} {url} as {role} -> {resp.status_code}")
+        return resp
+
+    def measure(self, endpoint, role, size, ctx, opts):
+        client = Client()
+        latencies, counts, sql_ms, rows = [], [], [], None
+        for i in range(opts["warmup"] + opts["requests"]):
+            # CaptureQueriesContext miscounts once the bounded queries_log wraps around.
+            reset_queries()
+            with rolled_back() if endpoint.method != "get" else nullcontext():
+                with CaptureQueriesContext(connection) as captured:
+                    t0 = time.perf_counter()
+                    resp = self.request(client, endpoint, role, size, ctx)
+                    elapsed = (time.perf_counter() - t0) * 1000
+            if i < opts["warmup"]:
+                continue
+            latencies.append(elapsed)
+            counts.append(len(captured.captured_queries))
+            sql_ms.append(sum(float(q["time"]) for q in captured.captured_queries) * 1000)
+            if rows is None and endpoint.paged and not getattr(resp, "streaming", False):
+                rows = len(json.loads(resp.content).get("results", []))
+        return {
+            "endpoint": endpoint.name,
+            "role": role,
+            "page_size": size,
+            "rows": rows,
+            "p50_ms": percentile(latencies, 0.5),
+            "p90_ms": percentile(latencies, 0.9),
+            "p99_ms": percentile(latencies, 0.99),
+            "mean_ms": sum(latencies) / len(latencies),
+            "queries": max(counts),
+            "sql_ms": sum(sql_ms) / len(sql_ms),
+        }
+
+    def scaling(self, results):
+        """Per paged endpoint: does the query count grow with the number of rows on the page?"""
+        by_endpoint = {}
+        for row in results:
+            if row["page_size"] is not None:
+                by_endpoint.setdefault(row["endpoint"], []).append(row)
+        out = []
+        for name, rows in by_endpoint.items():
+            rows.sort(key=lambda r: r["page_size"])
+            first, last = rows[0], rows[-1]
+            if (last["rows"] or 0) <= (first["rows"] or 0):
+                verdict = "inconclusive"  # pages didn't get fuller, so growth couldn't show
+            elif last["queries"] > first["queries"]:
+                verdict = "grows"
+            else:
+                verdict = "constant"
+            out.append({
+                "endpoint": name,
+                "verdict": verdict,
+                "queries": [r["queries"] for r in rows],
+                "rows": [r["rows"] for r in rows],
+            })
+        return out
+
+    def compare(self, path, results):
+        with open(path) as fh:
+            before = json.load(fh)
+        key = lambda r: (r["endpoint"], r["role"], r["page_size"])
+        old = {key(r): r for r in before["results"]}
+        self.stdout.write(f"Compared with {path} ({before.get('label') or before.get('at')}):")
+        for row in results:
+            prev = old.get(key(row))
+            if prev is None:
+                continue
+            change = (row["p50_ms"] - prev["p50_ms"]) / prev["p50_ms"] * 100 if prev["p50_ms"] else 0.0
+            queries = row["queries"] - prev["queries"]
+            if abs(change) >= 10 or queries:
+                self.stdout.write(
+                    f"  {row['endpoint']:<58} {row['role']:<6} {row['page_size'] or '-':>5}"
+                    f" p50 {prev['p50_ms']:.1f} -> {row['p50_ms']:.1f} ms ({change:+.0f}%)"
+                    f" queries {prev['queries']} -> {row['queries']} ({queries:+d})"
+                )
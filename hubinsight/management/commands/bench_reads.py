@@ -0,0 +1,117 @@
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+from django.test import AsyncClient, Client
+from rest_framework_simplejwt.tokens import AccessToken
+
+from hubinsight.models import Execution, Schedule
+
+
+def percentile(samples, q):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class Command(BaseCommand):
+    help = "Load benchmark: async (ASGI) read endpoints vs the sync DRF ones, in-process"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", help="Username to authenticate as (default: first superuser)")
+        parser.add_argument("--requests", type=int, default=400, help="Requests per endpoint and mode")
+        parser.add_argument("--concurrency", type=int, default=100, help="Concurrent clients")
+        parser.add_argument("--threads", type=int, default=8, help="WSGI worker threads")
+        parser.add_argument(
+            "--client-delay-ms",
+            type=float,
+            default=20.0,
+            help="Simulated slow-client time each request keeps its worker busy",
+        )
+
+    def handle(self, *args, **opts):
+        User = get_user_model()
+        user = User.objects.filter(username=opts["user"]).first() if opts["user"] else (
+            User.objects.filter(is_superuser=True).order_by("id").first()
+        )
+        if user is None:
+            raise CommandError("No user to authenticate as; pass --user or create a superuser.")
+        if "testserver" not in settings.ALLOWED_HOSTS:
+            settings.ALLOWED_HOSTS = [*settings.ALLOWED_HOSTS, "testserver"]
+
+        # Per-request INFO logs would dominate the timings.
+        logging.getLogger("hubinsight").setLevel(logging.WARNING)
+        token = str(AccessToken.for_user(user))
+        schedule = Schedule.objects.filter(deleted_at__isnull=True).order_by("id").first()
+        execution = Execution.objects.order_by("-id").first()
+        paths = ["schedules/", "tasks/predefined/"]
+        if schedule is not None:
+            paths.append(f"schedules/{schedule.id}/executions/")
+        if execution is not None:
+            paths.append(f"executions/{execution.id}/")
+
+        self.stdout.write(
+            f"{opts['requests']} requests x {opts['concurrency']} clients,"
+            f" {opts['threads']} WSGI threads, {opts['client_delay_ms']}ms client delay"
+        )
+        self.stdout.write(f"{'endpoint':<32} {'mode':<6} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+        for path in paths:
+            for mode, run in (("wsgi", self.run_sync), ("asgi", self.run_async)):
+                elapsed, latencies = run(path, token, opts)
+                self.stdout.write(
+                    f"{path:<32} {mode:<6} {len(latencies) / elapsed:8.1f}"
+                    f" {percentile(latencies, 0.5):8.1f} {percentile(latencies, 0.95):8.1f}"
+                    f" {percentile(latencies, 0.99):8.1f}"
+                )
+
+    def run_sync(self, path, token, opts):
+        delay = opts["client_delay_ms"] / 1000
+        url = "/api/" + path
+
+        # Every client thread needs one of the WSGI worker slots; waiting for a slot counts as latency.
+        workers = threading.BoundedSemaphore(opts["threads"])
+
+        def one(_):
+            client = Client(HTTP_AUTHORIZATION=f"Bearer {token}")
+            t0 = time.perf_counter()
+            with workers:
+                resp = client.get(url)
+                time.sleep(delay)  # the worker stays busy while a slow client drains the response
+                close_old_connections()
+            if resp.status_code != 200:
+                raise CommandError(f"GET {url} -> {resp.status_code}")
+            return (time.perf_counter() - t0) * 1000
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=opts["concurrency"]) as pool:
+            latencies = list(pool.map(one, range(opts["requests"])))
+        return time.perf_counter() - start, latencies
+
+    def run_async(self, path, token, opts):
+        delay = opts["client_delay_ms"] / 1000
+        url = "/api/async/" + path
+
+        async def main():
+            gate = asyncio.Semaphore(opts["concurrency"])
+            client = AsyncClient()
+            headers = {"Authorization": f"Bearer {token}"}
+
+            async def one():
+                async with gate:
+                    t0 = time.perf_counter()
+                    resp = await client.get(url, headers=headers)
+                    await asyncio.sleep(delay)  # a slow client only parks a coroutine
+                    if resp.status_code != 200:
+                        raise CommandError(f"GET {url} -> {resp.status_code}")
+                    return (time.perf_counter() - t0) * 1000
+
+            start = time.perf_counter()
+            latencies = await asyncio.gather(*(one() for _ in range(opts["requests"])))
+            return time.perf_counter() - start, latencies
+
+        return asyncio.run(main())
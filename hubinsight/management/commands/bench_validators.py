@@ -0,0 +1,71 @@
+import re
+import timeit
+from datetime import datetime
+from django.core.management.base import BaseCommand
+from hubinsight.task_registry import REGISTRY
+from hubinsight.validators import CompiledSchema
+
+
+def interpret_inputs(schema_list, payload):
+    # The schema interpreter validators.validate_inputs used before schemas were compiled.
+    errors = {}
+    for field in schema_list:
+        name = field["name"]
+        required = field.get("required", False)
+        ftype = field.get("type", "str")
+        val = payload.get(name, None)
+        if required and val is None:
+            errors[name] = "required"
+            continue
+        if val is None:
+            continue
+        try:
+            if ftype == "int":
+                ival = int(val)
+                if "min" in field and ival < field["min"]: raise ValueError("min")
+                if "max" in field and ival > field["max"]: raise ValueError("max")
+            elif ftype == "email":
+                if not re.match(r"^[^@\s]+@[^@\s]+\.[^@\s]+$", val or ""): raise ValueError("email")
+            elif ftype == "date":
+                fmt = field.get("format", "%Y-%m-%d")
+                datetime.strptime(val, fmt if "%" in fmt else "%Y-%m-%d")
+            elif ftype == "str":
+                if "enum" in field and val not in field["enum"]: raise ValueError("enum")
+        except Exception as e:
+            errors[name] = f"invalid({e})"
+    return errors
+
+
+class Command(BaseCommand):
+    help = "Micro-benchmark: interpreted vs compiled inputs_schema validation"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--number", type=int, default=20000, help="Payloads validated per run")
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **opts):
+        schema = REGISTRY["send_report"]["inputs_schema"] + REGISTRY["reindex_search"]["inputs_schema"] + [
+            {"name": "since", "type": "date", "required": False},
+        ]
+        payloads = [
+            {"email": "ops@example.com", "days": 7, "segment": "news", "since": "2024-01-31"},
+            {"email": "not-an-email", "days": 99, "segment": "other"},
+            {"days": "3"},
+        ]
+        compiled = CompiledSchema(schema)
+        for p in payloads:
+            assert compiled.validate(p) == interpret_inputs(schema, p), p
+
+        n, repeat = opts["number"], opts["repeat"]
+        batch = (payloads * (n // len(payloads) + 1))[:n]
+        runs = {
+            "interpreted": lambda: [interpret_inputs(schema, p) for p in batch],
+            "compiled (cached)": lambda: compiled.validate_many(batch),
+            "compile + validate": lambda: [CompiledSchema(schema).validate(p) for p in batch],
+        }
+        best = {}
+        for label, fn in runs.items():
+            best[label] = min(timeit.repeat(fn, number=1, repeat=repeat))
+            self.stdout.write(f"{label:<20} {best[label] * 1e6 / n:8.2f} us/payload")
+        speedup = best["interpreted"] / best["compiled (cached)"]
+        self.stdout.write(self.style.SUCCESS(f"compiled speedup: {speedup:.2f}x"))
@@ -0,0 +1,102 @@
+import json
+import logging
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import AccessToken
+
+from hubinsight.dispatcher import due_schedules
+from hubinsight.explain import explain_captured, request_plans, scenarios
+from hubinsight.models import Execution, PredefinedTask, Schedule
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "EXPLAIN every query the schedule/execution endpoints issue (SQLite or Postgres) "
+        "and fail if any reads a growing table without an index"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--verbose-plans", action="store_true", help="Print every plan, not just offenders")
+        parser.add_argument("--json", dest="json_path", help="Also write the plans to this file")
+
+    def handle(self, *args, **opts):
+        if connection.vendor not in ("sqlite", "postgresql"):
+            raise CommandError(f"EXPLAIN harness supports SQLite and Postgres, not {connection.vendor}.")
+        if "testserver" not in settings.ALLOWED_HOSTS:
+            settings.ALLOWED_HOSTS = [*settings.ALLOWED_HOSTS, "testserver"]
+        logging.getLogger("hubinsight").setLevel(logging.WARNING)
+
+        plans = []
+        try:
+            # Fixture rows and anything the requests write are rolled back; cached pages are never stored.
+            with transaction.atomic(), override_settings(SCHEDULE_LIST_CACHE_TTL=0):
+                plans = self.collect()
+                raise Rollback
+        except Rollback:
+            pass
+
+        failures = [p for p in plans if p.full_scans]
+        for plan in plans:
+            if not (plan.full_scans or opts["verbose_plans"]):
+                continue
+            mark = self.style.ERROR("FULL SCAN") if plan.full_scans else "ok"
+            self.stdout.write(f"[{mark}] {plan.label}: {', '.join(plan.full_scans)}")
+            self.stdout.write(f"    {plan.sql}")
+            for line in plan.lines:
+                self.stdout.write(f"      {line}")
+
+        if opts["json_path"]:
+            with open(opts["json_path"], "w") as fh:
+                json.dump(
+                    [
+                        {"label": p.label, "sql": p.sql, "plan": p.lines, "full_scans": p.full_scans, "sorts": p.sorts}
+                        for p in plans
+                    ],
+                    fh,
+                    indent=2,
+                )
+
+        sorts = sum(1 for p in plans if p.sorts)
+        summary = f"{len(plans)} queries explained on {connection.vendor}; {sorts} sorted outside an index."
+        if failures:
+            raise CommandError(f"{summary} {len(failures)} fall back to a full scan.")
+        self.stdout.write(self.style.SUCCESS(f"{summary} No full scans."))
+
+    def collect(self):
+        User = get_user_model()
+        task = PredefinedTask.objects.filter(is_schedulable=True).order_by("id").first()
+        if task is None:
+            raise CommandError("No schedulable PredefinedTask; run seed_tasks first.")
+        owner = User.objects.create(username="explain-owner")
+        superuser = User.objects.create(username="explain-super", is_superuser=True)
+        now = timezone.now()
+        schedule = Schedule.objects.create(
+            owner=owner, task=task, cron_expression="*/5 * * * *", inputs={}, next_run_at=now, fire_at=now
+        )
+        execution = Execution.objects.create(schedule=schedule, task_name=task.name, status="SUCCESS", runtime_ms=1)
+        tokens = {
+            "owner": "Bearer " + str(AccessToken.for_user(owner)),
+            "super": "Bearer " + str(AccessToken.for_user(superuser)),
+        }
+
+        client, plans = Client(), []
+        for label, who, method, path, body in scenarios(schedule, execution, task):
+            resp, found = request_plans(client, label, method, path, body, tokens[who])
+            if resp.status_code >= 400:
+                raise CommandError(f"{label}: {method.upper()} {path} returned {resp.status_code}")
+            plans += found
+
+        with CaptureQueriesContext(connection) as captured:
+            list(due_schedules(now)[:500])
+        plans += explain_captured("dispatcher due scan", captured)
+        return plans
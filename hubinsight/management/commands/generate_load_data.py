@@ -0,0 +1,171 @@
+import math
+import random
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from hubinsight.cron import next_runs
+from hubinsight.models import Execution, PredefinedTask, Schedule
+from hubinsight.search import index_schedules
+from hubinsight.smoothing import plan_fire_times
+
+# (cron template, share of schedules, runs per day). Most schedules are hourly or daily; a few are very chatty.
+CRON_MIX = [
+    ("*/5 * * * *", 0.08, 288),
+    ("*/15 * * * *", 0.10, 96),
+    ("{m} * * * *", 0.20, 24),
+    ("{m} {h} * * *", 0.35, 1),
+    ("{m} {h} * * 1-5", 0.12, 5 / 7),
+    ("{m} {h} * * {dow}", 0.10, 1 / 7),
+    ("{m} {h} 1 * *", 0.05, 1 / 30),
+]
+STATUS_MIX = [("SUCCESS", 0.93), ("FAILURE", 0.05), ("RETRY", 0.01), ("STARTED", 0.01)]
+RUNTIME_MEDIAN_MS = {"send_report": 800, "reindex_search": 4000, "heavy_etl": 60000}
+
+
+def sample_inputs(rng, task_name, username):
+    if task_name == "send_report":
+        return {"email": f"{username}@example.com", "days": rng.choice([1, 7, 7, 14, 30])}
+    if task_name == "reindex_search":
+        return {"segment": rng.choice(["all", "news", "users"])}
+    return {}
+
+
+def sample_cron(rng):
+    template, _, per_day = rng.choices(CRON_MIX, weights=[w for _, w, _ in CRON_MIX])[0]
+    # Humans pick round minutes and office hours far more often than anything else.
+    minute = rng.choice([0, 0, 0, 15, 30, 30, 45, rng.randrange(60)])
+    hour = rng.choice([rng.randrange(24), *range(6, 10), 9, 9, 12, 17])
+    return template.format(m=minute, h=hour, dow=rng.randrange(7)), per_day
+
+
+def batched(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+class Command(BaseCommand):
+    help = "Bulk-generate a synthetic dataset (users, schedules, executions) for benchmarks"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=100)
+        parser.add_argument("--schedules", type=int, default=5000)
+        parser.add_argument("--executions", type=int, default=100000)
+        parser.add_argument("--days", type=int, default=30, help="Execution history window")
+        parser.add_argument("--prefix", default="load", help="Username prefix of generated users")
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument("--clear", action="store_true", help="Delete users with --prefix (and their data) first")
+
+    def handle(self, *args, **opts):
+        rng = random.Random(opts["seed"])
+        batch_size = opts["batch_size"]
+        prefix = opts["prefix"]
+        User = get_user_model()
+        now = timezone.now()
+
+        if opts["clear"]:
+            deleted, _ = User.objects.filter(username__startswith=f"{prefix}-").delete()
+            self.stdout.write(f"Cleared {deleted} rows.")
+
+        tasks = list(PredefinedTask.objects.filter(is_schedulable=True).order_by("id"))
+        if not tasks:
+            raise CommandError("No schedulable PredefinedTask; run seed_tasks first.")
+
+        start = User.objects.filter(username__startswith=f"{prefix}-").count()
+        password = make_password(None)
+        users = User.objects.bulk_create(
+            [
+                User(username=f"{prefix}-{start + i:06d}", password=password, date_joined=now)
+                for i in range(opts["users"])
+            ],
+            batch_size=batch_size,
+        )
+        if not users:
+            self.stdout.write(self.style.SUCCESS("Nothing to generate."))
+            return
+        # Zipf-ish ownership: a handful of heavy users own most schedules.
+        owner_weights = [1 / (rank + 1) ** 0.8 for rank in range(len(users))]
+
+        schedules, per_day = [], []
+        for _ in range(opts["schedules"]):
+            owner = rng.choices(users, weights=owner_weights)[0]
+            task = rng.choice(tasks)
+            cron, runs = sample_cron(rng)
+            created = now - timedelta(seconds=rng.randrange(opts["days"] * 2 * 86400))
+            sch = Schedule(
+                owner=owner,
+                task=task,
+                cron_expression=cron,
+                inputs=sample_inputs(rng, task.name, owner.username),
+                status=Schedule.Status.ENABLED if rng.random() < 0.85 else Schedule.Status.DISABLED,
+                overlap_policy=rng.choices(
+                    Schedule.OverlapPolicy.values, weights=[0.8, 0.15, 0.05]
+                )[0],
+                deleted_at=now if rng.random() < 0.03 else None,
+            )
+            sch.created_at = created
+            schedules.append(sch)
+            per_day.append(runs)
+        upcoming = next_runs(((i, sch.cron_expression) for i, sch in enumerate(schedules)), base=now)
+        for i, sch in enumerate(schedules):
+            sch.next_run_at = upcoming[i]
+        created_at = [sch.created_at for sch in schedules]
+        for chunk in batched(schedules, batch_size):
+            Schedule.objects.bulk_create(chunk)
+        # auto_now_add overwrote the spread-out creation times on insert; put them back.
+        for sch, created in zip(schedules, created_at):
+            sch.created_at = created
+        plan_fire_times(schedules)
+        self.stdout.write(f"Users: {len(users)} Schedules: {len(schedules)}")
+
+        # Chatty schedules accumulate proportionally more history.
+        window_start = now - timedelta(days=opts["days"])
+        cum, total = [], 0.0
+        for runs in per_day:
+            total += runs
+            cum.append(total)
+        last_run = {}
+        made = 0
+        while made < opts["executions"]:
+            rows = []
+            for _ in range(min(batch_size, opts["executions"] - made)):
+                sch = rng.choices(schedules, cum_weights=cum)[0]
+                lo = max(sch.created_at, window_start)
+                started = lo + timedelta(seconds=rng.random() * max(1.0, (now - lo).total_seconds()))
+                status = rng.choices([s for s, _ in STATUS_MIX], weights=[w for _, w in STATUS_MIX])[0]
+                median = RUNTIME_MEDIAN_MS.get(sch.task.name, 1000)
+                runtime = None if status == "STARTED" else int(rng.lognormvariate(math.log(median), 0.6))
+                rows.append(
+                    Execution(
+                        schedule_id=sch.pk,
+                        task_name=sch.task.name,
+                        started_at=started,
+                        finished_at=None if runtime is None else started + timedelta(milliseconds=runtime),
+                        status=status,
+                        runtime_ms=runtime,
+                        scheduled_for=started - timedelta(milliseconds=rng.randrange(50, 2000)),
+                    )
+                )
+                if started > last_run.get(sch.pk, started - timedelta(seconds=1)):
+                    last_run[sch.pk] = started
+            Execution.objects.bulk_create(rows, batch_size=batch_size)
+            made += len(rows)
+            self.stdout.write(f"Executions: {made}/{opts['executions']}")
+
+        for sch in schedules:
+            sch.last_run_at = last_run.get(sch.pk)
+        for chunk in batched(schedules, batch_size):
+            Schedule.objects.bulk_update(chunk, ["created_at", "fire_at", "last_run_at"])
+            index_schedules(chunk)
+
+        # bulk_create skips signals, so derived tables are rebuilt the way operators repair them.
+        call_command("reconcile_quotas", stdout=self.stdout)
+        call_command("rebuild_rollups", days=opts["days"], stdout=self.stdout)
+        self.stdout.write(self.style.SUCCESS(
+            f"Generated {len(users)} users, {len(schedules)} schedules, {made} executions."
+        ))
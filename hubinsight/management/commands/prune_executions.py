@@ -0,0 +1,94 @@
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_datetime
+from hubinsight.models import Execution
+from hubinsight.retention import (
+    Checkpoint,
+    ExecutionArchive,
+    archive_fields,
+    attach_logs,
+    expired_executions,
+    retention_cutoffs,
+)
+
+class Command(BaseCommand):
+    help = "Archive expired executions to gzipped JSONL (one file per chunk and day) and delete them in small batches"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--archive-dir", default=settings.EXECUTION_ARCHIVE_DIR)
+        parser.add_argument("--chunk-size", type=int, default=5000, help="Rows read and archived per query")
+        parser.add_argument("--delete-batch", type=int, default=500, help="Rows deleted per statement")
+        parser.add_argument("--sleep", type=float, default=0.0, help="Pause between delete batches (seconds)")
+        parser.add_argument("--no-archive", action="store_true", help="Delete without writing an archive")
+        parser.add_argument("--resume", action="store_true", help="Continue the run recorded in the checkpoint")
+        parser.add_argument("--dry-run", action="store_true", help="Only report what would be pruned")
+
+    def handle(self, *args, **opts):
+        checkpoint = Checkpoint(opts["archive_dir"])
+        state = None
+        if opts["resume"]:
+            state = checkpoint.load()
+            if state is None:
+                raise CommandError("Nothing to resume: no checkpoint found.")
+            cutoffs = {name: parse_datetime(ts) for name, ts in state["cutoffs"]}
+        else:
+            cutoffs = retention_cutoffs()
+
+        expired = expired_executions(cutoffs)
+        if opts["dry_run"]:
+            for name, cutoff in sorted(cutoffs.items(), key=lambda kv: kv[0] or ""):
+                self.stdout.write(f"{name or '<unregistered>'}: before {cutoff.isoformat()}")
+            total = expired.count()
+            self.stdout.write(self.style.SUCCESS(f"Dry run. Would prune: {total}"))
+            return
+
+        last_id = archived = deleted = 0
+        pending = None
+        if state is not None:
+            last_id = state["last_id"]
+            # Rows up to last_id are already archived; only the delete may be missing.
+            leftover = list(expired.filter(pk__lte=last_id).values_list("pk", flat=True))
+            deleted += self._delete(leftover, opts)
+            # A chunk whose archive may be partly written: redo it under the same file names.
+            pending = state.get("pending")
+        archive = None if opts["no_archive"] else ExecutionArchive(opts["archive_dir"])
+        saved_cutoffs = [[name, ts.isoformat()] for name, ts in cutoffs.items()]
+
+        fields = archive_fields()
+        while True:
+            chunk = expired.filter(pk__gt=last_id).order_by("pk").values(*fields)
+            if pending is not None:
+                rows = list(chunk.filter(pk__lte=pending[1]))
+                first_id, chunk_last = pending
+                pending = None
+                if not rows:
+                    last_id = chunk_last
+                    continue
+            else:
+                rows = list(chunk[: opts["chunk_size"]])
+                if not rows:
+                    break
+                first_id, chunk_last = rows[0]["id"], rows[-1]["id"]
+            if archive is not None:
+                # Record the chunk before writing it, so a resume names its files the same way.
+                checkpoint.save({"last_id": last_id, "pending": [first_id, chunk_last], "cutoffs": saved_cutoffs})
+                archive.write(attach_logs(rows), first_id, chunk_last)
+                archived += len(rows)
+            last_id = chunk_last
+            checkpoint.save({"last_id": last_id, "cutoffs": saved_cutoffs})
+            deleted += self._delete([row["id"] for row in rows], opts)
+
+        checkpoint.clear()
+        self.stdout.write(self.style.SUCCESS(f"Pruned. Archived: {archived} Deleted: {deleted}"))
+
+    def _delete(self, ids, opts):
+        # Short autocommit statements keep row/table locks brief.
+        deleted = 0
+        step = opts["delete_batch"]
+        for i in range(0, len(ids), step):
+            _, per_model = Execution.objects.filter(pk__in=ids[i:i + step]).delete()
+            deleted += per_model.get(Execution._meta.label, 0)
+            if opts["sleep"]:
+                time.sleep(opts["sleep"])
+        return deleted
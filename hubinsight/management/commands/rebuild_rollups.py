@@ -0,0 +1,31 @@
+from datetime import timedelta
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from hubinsight.models import Execution, ExecutionRollup
+from hubinsight.rollups import FINISHED_STATUSES, bucket_start, record_executions
+
+class Command(BaseCommand):
+    help = "Rebuild execution rollups from raw executions (backfill or repair)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=30, help="How far back to rebuild")
+        parser.add_argument("--chunk-size", type=int, default=5000)
+
+    def handle(self, *args, **opts):
+        since = bucket_start(timezone.now() - timedelta(days=opts["days"]), ExecutionRollup.Granularity.DAY)
+        deleted, _ = ExecutionRollup.objects.filter(bucket_start__gte=since).delete()
+
+        qs = (
+            Execution.objects.filter(started_at__gte=since, status__in=FINISHED_STATUSES)
+            .only("id", "schedule_id", "task_name", "started_at", "status", "runtime_ms", "cache_hit")
+            .order_by()
+        )
+        folded = 0
+        batch = []
+        for ex in qs.iterator(chunk_size=opts["chunk_size"]):
+            batch.append(ex)
+            if len(batch) >= opts["chunk_size"]:
+                folded += record_executions(batch)
+                batch = []
+        folded += record_executions(batch)
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt from {folded} executions (dropped {deleted} rollup rows)"))
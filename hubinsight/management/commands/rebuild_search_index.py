@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+from django.db import connection
+from hubinsight.models import Schedule
+from hubinsight.search import index_schedules, install_index
+
+class Command(BaseCommand):
+    help = "Rewrite every schedule's search row and (re)install the FTS5/trigram index over them"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=2000)
+
+    def handle(self, *args, **opts):
+        chunk_size = opts["chunk_size"]
+        qs = Schedule.objects.select_related("task", "owner").order_by("pk")
+        total, batch = 0, []
+        for sch in qs.iterator(chunk_size=chunk_size):
+            batch.append(sch)
+            if len(batch) >= chunk_size:
+                total += index_schedules(batch)
+                batch = []
+        total += index_schedules(batch)
+        # Triggers are lost if the search table is ever rebuilt by a SQLite migration; this restores them.
+        install_index(connection)
+        self.stdout.write(self.style.SUCCESS(f"Indexed {total} schedules ({connection.vendor})."))
@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+from django.utils import timezone
+from hubinsight.cron import cache_info, next_runs
+from hubinsight.listcache import bump_schedule_versions
+from hubinsight.models import Schedule
+from hubinsight.smoothing import plan_fire_times
+
+class Command(BaseCommand):
+    help = "Recompute Schedule.next_run_at/fire_at in bulk (startup reconciliation, TIME_ZONE changes)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--stale-only", action="store_true", help="Only rows with a missing or past next_run_at")
+        parser.add_argument("--chunk-size", type=int, default=2000)
+
+    def handle(self, *args, **opts):
+        now = timezone.now()
+        chunk_size = opts["chunk_size"]
+        qs = Schedule.objects.filter(deleted_at__isnull=True)
+        if opts["stale_only"]:
+            qs = qs.filter(Q(next_run_at__isnull=True) | Q(next_run_at__lt=now))
+
+        updated = 0
+        last_pk = 0
+        while True:
+            rows = list(
+                qs.filter(pk__gt=last_pk)
+                .order_by("pk")
+                .select_related("task")
+                .only("id", "cron_expression", "next_run_at", "fire_at", "task__name")[:chunk_size]
+            )
+            if not rows:
+                break
+            upcoming = next_runs(((s.pk, s.cron_expression) for s in rows), base=now)
+            for s in rows:
+                s.next_run_at = upcoming[s.pk]
+            plan_fire_times(rows)
+            Schedule.objects.bulk_update(rows, ["next_run_at", "fire_at"], batch_size=chunk_size)
+            updated += len(rows)
+            last_pk = rows[-1].pk
+
+        bump_schedule_versions()
+        self.stdout.write(self.style.SUCCESS(f"Recomputed: {updated} ({cache_info()})"))
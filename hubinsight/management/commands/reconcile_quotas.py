@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+from hubinsight.models import Schedule, ScheduleQuota
+
+class Command(BaseCommand):
+    help = "Recompute the denormalized active-schedule counters from the schedules table (repair drift)"
+
+    def handle(self, *args, **opts):
+        counts = dict(
+            Schedule.objects.filter(status=Schedule.Status.ENABLED, deleted_at__isnull=True)
+            .order_by()
+            .values_list("owner_id")
+            .annotate(n=Count("id"))
+        )
+        with transaction.atomic():
+            quotas = {q.owner_id: q for q in ScheduleQuota.objects.select_for_update()}
+            changed, missing = [], []
+            for owner_id, quota in quotas.items():
+                actual = counts.get(owner_id, 0)
+                if quota.active_count != actual:
+                    quota.active_count = actual
+                    changed.append(quota)
+            for owner_id, actual in counts.items():
+                if owner_id not in quotas:
+                    missing.append(ScheduleQuota(owner_id=owner_id, active_count=actual))
+            if changed:
+                ScheduleQuota.objects.bulk_update(changed, ["active_count"])
+            if missing:
+                ScheduleQuota.objects.bulk_create(missing, ignore_conflicts=True)
+        self.stdout.write(self.style.SUCCESS(f"Reconciled. Fixed: {len(changed)} Created: {len(missing)}"))
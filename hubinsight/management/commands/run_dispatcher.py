@@ -0,0 +1,29 @@
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from hubinsight.dispatcher import dispatch_due
+
+class Command(BaseCommand):
+    help = "Enqueue due schedules from Schedule.fire_at (replaces one beat PeriodicTask per schedule)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="Dispatch one batch and exit")
+        parser.add_argument("--batch-size", type=int, default=settings.DISPATCHER_BATCH_SIZE)
+        parser.add_argument("--interval", type=float, default=settings.DISPATCHER_POLL_INTERVAL)
+
+    def handle(self, *args, **opts):
+        batch_size = opts["batch_size"]
+        if opts["once"]:
+            claimed = dispatch_due(limit=batch_size)
+            self.stdout.write(self.style.SUCCESS(f"Dispatched: {claimed}"))
+            return
+
+        self.stdout.write(f"Dispatcher started (batch={batch_size}, interval={opts['interval']}s)")
+        try:
+            while True:
+                claimed = dispatch_due(limit=batch_size)
+                # A full batch means more rows are probably due; go again right away.
+                if claimed < batch_size:
+                    time.sleep(opts["interval"])
+        except KeyboardInterrupt:
+            self.stdout.write("Dispatcher stopped")
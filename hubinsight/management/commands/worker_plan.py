@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from hubinsight.routing import worker_plan
+
+class Command(BaseCommand):
+    help = "Print one Celery worker command per queue, sized from task_registry.REGISTRY"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--app", default="config")
+
+    def handle(self, *args, **opts):
+        for item in worker_plan():
+            self.stdout.write(f"# {item['queue']}: {', '.join(item['tasks']) or '(other tasks)'}")
+            self.stdout.write(
+                f"celery -A {opts['app']} worker -Q {item['queue']} -n {item['queue']}@%h"
+                f" -P {item['pool']} -c {item['concurrency']}"
+                f" --prefetch-multiplier {item['prefetch_multiplier']}"
+            )
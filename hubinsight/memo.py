@@ -0,0 +1,54 @@
+import hashlib
+import json
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+from .task_registry import REGISTRY
+
+KEY_PREFIX = "hubinsight:memo:"
+
+
+def memo_ttl(task_name):
+    """Seconds a result of ``task_name`` may be reused (REGISTRY ``memoize_ttl``); None = not memoized."""
+    return REGISTRY.get(task_name, {}).get("memoize_ttl") or None
+
+
+def memo_key(task_name, inputs):
+    canonical = json.dumps(inputs or {}, sort_keys=True, separators=(",", ":"), default=str)
+    digest = hashlib.sha256(f"{task_name}\0{canonical}".encode("utf-8")).hexdigest()
+    return KEY_PREFIX + digest
+
+
+def _cache():
+    # "results" is Redis when CACHE_URL is set and a bounded LocMem (LRU) otherwise.
+    return caches["results"]
+
+
+def lookup(key):
+    """``{"execution": id, "result": ...}`` or None."""
+    return _cache().get(key)
+
+
+def remember(key, execution_id, result, ttl):
+    _cache().set(key, {"execution": execution_id, "result": result}, ttl)
+
+
+def acquire(key, ttl):
+    # Single flight: only the first of several identical runs computes; the rest wait for its result.
+    return _cache().add(key + ":lock", 1, ttl)
+
+
+def release(key):
+    _cache().delete(key + ":lock")
+
+
+def wait_for(key, timeout=None):
+    deadline = time.monotonic() + (settings.RESULT_MEMO_WAIT if timeout is None else timeout)
+    while time.monotonic() < deadline:
+        hit = lookup(key)
+        if hit is not None:
+            return hit
+        time.sleep(0.1)
+    return None
@@ -0,0 +1,331 @@
+# Per-task lag / queue delay / runtime histograms for GET /api/metrics/, kept in Redis or per-process files.
+import fcntl
+import glob
+import json
+import logging
+import os
+import socket
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.utils import timezone
+from django.utils.crypto import constant_time_compare
+from django.utils.dateparse import parse_datetime
+from rest_framework.authentication import BaseAuthentication
+from rest_framework.permissions import BasePermission
+
+from .cron import compile_cron
+from .models import Schedule
+from .routing import RUN_TASK
+
+logger = logging.getLogger(__name__)
+
+ENQUEUED_HEADER = "enqueued_at"
+# Seconds; one ladder fits all three histograms, from a prompt hand-off to an hour-long job.
+BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 900, 1800, 3600)
+
+HISTOGRAMS = {
+    "hubinsight_schedule_lag_seconds": "Intended fire time to enqueue, per task.",
+    "hubinsight_queue_delay_seconds": "Enqueue to worker start, per task.",
+    "hubinsight_task_runtime_seconds": "Worker start to finish, per task (cache hits excluded).",
+}
+COUNTERS = {
+    "hubinsight_task_runs_total": "Finished runs by task, status and cache hit.",
+    "hubinsight_task_runs_skipped_total": "Runs dropped before starting, by task and reason.",
+}
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _field(name, labels, suffix=""):
+    # Flat "name<TAB>labels<TAB>suffix" keys let both stores just add numbers.
+    return f"{name}\t{json.dumps(labels, sort_keys=True)}\t{suffix}"
+
+
+def histogram_deltas(name, labels, value):
+    value = max(0.0, value)
+    deltas = {_field(name, labels, "sum"): value, _field(name, labels, "count"): 1}
+    for bound in BUCKETS:
+        if value <= bound:
+            deltas[_field(name, labels, f"le={bound}")] = 1
+    return deltas
+
+
+def _load(path):
+    try:
+        with open(path) as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return {}
+
+
+def _dump(path, values):
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as fh:
+        json.dump(values, fh)
+    os.replace(tmp, path)
+
+
+def _alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+class FileMetricsStore:
+    """One file per (host, pid), rewritten atomically; readers sum them all and fold in dead pids' files."""
+
+    def __init__(self, directory):
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._values = {}
+        self._pid = None
+
+    def _path(self):
+        return os.path.join(self.directory, f"{socket.gethostname()}-{os.getpid()}.json")
+
+    @contextmanager
+    def _dir_lock(self):
+        # Serializes pruning against processes (re)claiming their pid's file.
+        os.makedirs(self.directory, exist_ok=True)
+        with open(os.path.join(self.directory, ".lock"), "a") as fh:
+            fcntl.flock(fh, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(fh, fcntl.LOCK_UN)
+
+    def _load_own(self):
+        # After a fork (or pid reuse) start from whatever this pid's file already holds.
+        self._pid = os.getpid()
+        with self._dir_lock():
+            self._values = _load(self._path())
+
+    def incr(self, deltas):
+        with self._lock:
+            if self._pid != os.getpid():
+                self._load_own()
+            for field, amount in deltas.items():
+                self._values[field] = self._values.get(field, 0) + amount
+            _dump(self._path(), self._values)
+
+    def prune(self):
+        """Fold the files of this host's dead pids into one, so the directory doesn't grow with every restart."""
+        host = socket.gethostname()
+        retired_path = os.path.join(self.directory, f"{host}-retired.json")
+        dead = []
+        with self._dir_lock():
+            retired = _load(retired_path)
+            for path in glob.glob(os.path.join(glob.escape(self.directory), glob.escape(host) + "-*.json")):
+                pid = os.path.basename(path)[len(host) + 1:-len(".json")]
+                if not pid.isdigit() or _alive(int(pid)):
+                    continue
+                for field, amount in _load(path).items():
+                    retired[field] = retired.get(field, 0) + amount
+                dead.append(path)
+            if dead:
+                _dump(retired_path, retired)
+                for path in dead:
+                    os.remove(path)
+        return len(dead)
+
+    def read(self):
+        if os.path.isdir(self.directory):
+            self.prune()
+        totals = {}
+        for path in glob.glob(os.path.join(self.directory, "*.json")):
+            for field, amount in _load(path).items():
+                totals[field] = totals.get(field, 0) + amount
+        return totals
+
+    def clear(self):
+        with self._lock:
+            for path in glob.glob(os.path.join(self.directory, "*.json")):
+                os.remove(path)
+            self._values = {}
+
+
+class RedisMetricsStore:
+    """All processes increment one Redis hash."""
+
+    key = "hubinsight:metrics"
+
+    def __init__(self, url):
+        import redis
+
+        self.client = redis.Redis.from_url(url)
+
+    def incr(self, deltas):
+        pipe = self.client.pipeline(transaction=False)
+        for field, amount in deltas.items():
+            if isinstance(amount, int):
+                pipe.hincrby(self.key, field, amount)
+            else:
+                pipe.hincrbyfloat(self.key, field, amount)
+        pipe.execute()
+
+    def read(self):
+        return {k.decode(): float(v) for k, v in self.client.hgetall(self.key).items()}
+
+    def clear(self):
+        self.client.delete(self.key)
+
+
+_store = None
+
+
+def get_store():
+    """``None`` when ``METRICS_STORE`` is empty (metrics off)."""
+    global _store
+    if _store is None:
+        target = getattr(settings, "METRICS_STORE", "")
+        if not target:
+            return None
+        if target.startswith(("redis://", "rediss://", "unix://")):
+            _store = RedisMetricsStore(target)
+        else:
+            _store = FileMetricsStore(target)
+    return _store
+
+
+def _write(deltas):
+    store = get_store()
+    if store is None or not deltas:
+        return
+    try:
+        store.incr(deltas)
+    except Exception:
+        # Metrics must never fail a run.
+        logger.exception("metrics_write_failed")
+
+
+def _seconds(later, earlier):
+    if later is None or earlier is None:
+        return None
+    return (later - earlier).total_seconds()
+
+
+def run_deltas(ex):
+    task = {"task": ex.task_name}
+    deltas = {
+        _field("hubinsight_task_runs_total", {**task, "status": ex.status, "cache_hit": str(ex.cache_hit).lower()}): 1,
+    }
+    for name, value in (
+        ("hubinsight_schedule_lag_seconds", _seconds(ex.enqueued_at, ex.scheduled_for)),
+        ("hubinsight_queue_delay_seconds", _seconds(ex.started_at, ex.enqueued_at)),
+        ("hubinsight_task_runtime_seconds", None if ex.cache_hit or ex.runtime_ms is None else ex.runtime_ms / 1000),
+    ):
+        if value is not None:
+            deltas.update(histogram_deltas(name, task, value))
+    return deltas
+
+
+def record_run(ex):
+    _write(run_deltas(ex))
+
+
+def record_skip(task_name, reason):
+    _write({_field("hubinsight_task_runs_skipped_total", {"task": task_name, "reason": reason}): 1})
+
+
+def stamp_enqueued_at(headers):
+    """Publish-signal hook; a countdown/eta (dispatcher throttling) counts as scheduling lag, not queue time."""
+    if headers.get("task") != RUN_TASK or ENQUEUED_HEADER in headers:
+        return
+    now = timezone.now()
+    eta = headers.get("eta")
+    if eta:
+        eta = eta if isinstance(eta, datetime) else parse_datetime(eta)
+        if eta is not None and timezone.is_aware(eta) and eta > now:
+            now = eta
+    headers[ENQUEUED_HEADER] = now.isoformat()
+
+
+def stamp_scheduled_for(headers, body):
+    """Publish-signal hook: beat sends carry no ``scheduled_for``, so use the schedule's last cron tick."""
+    if headers.get("task") != RUN_TASK or not headers.get("periodic_task_name"):
+        return
+    if not (isinstance(body, (list, tuple)) and len(body) >= 2 and body[0]):
+        return
+    args, kwargs = body[0], body[1]
+    if kwargs.get("scheduled_for"):
+        return
+    cron = Schedule.objects.filter(pk=args[0]).values_list("cron_expression", flat=True).first()
+    try:
+        kwargs["scheduled_for"] = compile_cron(cron).last_at_or_before(timezone.now()).isoformat()
+    except Exception:
+        logger.warning("metrics_beat_tick_unknown", extra={"schedule_id": args[0]})
+
+
+def enqueued_at(task_request):
+    value = getattr(task_request, ENQUEUED_HEADER, None)
+    return parse_datetime(value) if isinstance(value, str) else None
+
+
+def scrape():
+    store = get_store()
+    return render(store.read() if store is not None else {})
+
+
+def _labels(raw):
+    labels = json.loads(raw)
+    return ",".join(f'{k}="{_escape(v)}"' for k, v in sorted(labels.items()))
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _number(value):
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def render(values):
+    """Prometheus text exposition of a store snapshot; buckets are cumulative by construction."""
+    series = {}
+    for field, amount in values.items():
+        name, raw, suffix = field.split("\t")
+        series.setdefault(name, {}).setdefault(raw, {})[suffix] = amount
+
+    lines = []
+    for name, help_text in COUNTERS.items():
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+        for raw, parts in sorted(series.get(name, {}).items()):
+            lines.append(f"{name}{{{_labels(raw)}}} {_number(parts[''])}")
+    for name, help_text in HISTOGRAMS.items():
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+        for raw, parts in sorted(series.get(name, {}).items()):
+            labels = _labels(raw)
+            count = parts.get("count", 0)
+            for bound in BUCKETS:
+                lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {_number(parts.get(f"le={bound}", 0))}')
+            lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {_number(count)}')
+            lines.append(f"{name}_sum{{{labels}}} {_number(parts.get('sum', 0))}")
+            lines.append(f"{name}_count{{{labels}}} {_number(count)}")
+    return "\n".join(lines) + "\n"
+
+
+class MetricsTokenAuthentication(BaseAuthentication):
+    """``Authorization: Bearer <METRICS_TOKEN>`` for scrapers that can't mint a JWT; anything else falls through."""
+
+    def authenticate(self, request):
+        token = getattr(settings, "METRICS_TOKEN", "")
+        header = request.META.get("HTTP_AUTHORIZATION", "")
+        if token and constant_time_compare(header, f"Bearer {token}"):
+            return AnonymousUser(), "metrics"
+        return None
+
+    def authenticate_header(self, request):
+        # DRF takes the 401 challenge from the first class; without it failures turn into 403s.
+        return 'Bearer realm="api"'
+
+
+class IsMetricsScraper(BasePermission):
+    def has_permission(self, request, view):
+        return request.auth == "metrics"
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.7 on 2026-10-18 01:35
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hubinsight', '0002_alter_schedule_task'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='execution',
+            name='started_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+    ]
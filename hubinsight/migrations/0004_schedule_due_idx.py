@@ -0,0 +1,19 @@
+# Generated by Django 5.2.7 on 2026-10-18 01:36
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hubinsight', '0003_execution_started_at_default'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='schedule',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True), ('status', 'ENABLED')), fields=['next_run_at'], name='schedule_due_idx'),
+        ),
+    ]
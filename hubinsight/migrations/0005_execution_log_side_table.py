@@ -0,0 +1,53 @@
+# Generated by Django 5.2.7 on 2026-10-18 01:41
+
+import json
+import zlib
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def move_logs_out_of_row(apps, schema_editor):
+    Execution = apps.get_model("hubinsight", "Execution")
+    ExecutionLog = apps.get_model("hubinsight", "ExecutionLog")
+    batch = []
+    for pk, logs in Execution.objects.filter(logs__isnull=False).values_list("pk", "logs").iterator(chunk_size=2000):
+        raw = json.dumps(logs, separators=(",", ":")).encode("utf-8")
+        batch.append(ExecutionLog(execution_id=pk, data=zlib.compress(raw), size=len(raw)))
+        if len(batch) >= 2000:
+            ExecutionLog.objects.bulk_create(batch)
+            batch = []
+    if batch:
+        ExecutionLog.objects.bulk_create(batch)
+
+
+def move_logs_back(apps, schema_editor):
+    Execution = apps.get_model("hubinsight", "Execution")
+    ExecutionLog = apps.get_model("hubinsight", "ExecutionLog")
+    for row in ExecutionLog.objects.iterator(chunk_size=2000):
+        logs = json.loads(zlib.decompress(bytes(row.data)).decode("utf-8"))
+        Execution.objects.filter(pk=row.execution_id).update(logs=logs)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hubinsight', '0004_schedule_due_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExecutionLog',
+            fields=[
+                ('execution', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='log', serialize=False, to='hubinsight.execution')),
+                ('data', models.BinaryField()),
+                ('size', models.IntegerField(default=0)),
+                ('truncated', models.BooleanField(default=False)),
+            ],
+        ),
+        migrations.RunPython(move_logs_out_of_row, move_logs_back),
+        migrations.RemoveField(
+            model_name='execution',
+            name='logs',
+        ),
+    ]
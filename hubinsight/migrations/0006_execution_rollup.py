@@ -0,0 +1,34 @@
+# Generated by Django 5.2.7 on 2026-10-18 01:43
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hubinsight', '0005_execution_log_side_table'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExecutionRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('task_name', models.CharField(max_length=120)),
+                ('granularity', models.CharField(choices=[('hour', 'Hour'), ('day', 'Day')], max_length=4)),
+                ('bucket_start', models.DateTimeField()),
+                ('run_count', models.IntegerField(default=0)),
+                ('success_count', models.IntegerField(default=0)),
+                ('failure_count', models.IntegerField(default=0)),
+                ('runtime_max_ms', models.IntegerField(blank=True, null=True)),
+                ('runtime_sketch', models.JSONField(default=dict)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('schedule', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='rollups', to='hubinsight.schedule')),
+            ],
+            options={
+                'ordering': ['bucket_start'],
+                'constraints': [models.UniqueConstraint(condition=models.Q(('schedule__isnull', False)), fields=('schedule', 'granularity', 'bucket_start'), name='rollup_schedule_bucket_uniq'), models.UniqueConstraint(condition=models.Q(('schedule__isnull', True)), fields=('task_name', 'granularity', 'bucket_start'), name='rollup_task_bucket_uniq')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-18 01:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hubinsight', '0006_execution_rollup'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='predefinedtask',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
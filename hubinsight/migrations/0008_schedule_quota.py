@@ -0,0 +1,25 @@
+# Generated by Django 5.2.7 on 2026-10-18 01:46
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('hubinsight', '0007_predefinedtask_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScheduleQuota',
+            fields=[
+                ('owner', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='schedule_quota', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('active_count', models.PositiveIntegerField(default=0)),
+                ('max_active', models.PositiveIntegerField(blank=True, help_text='Empty uses SCHEDULE_ACTIVE_LIMIT.', null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.7 on 2026-10-18 01:49
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import F
+
+
+def backfill_fire_at(apps, schema_editor):
+    # Unjittered until the next recompute_next_runs/dispatch sets the real fire time.
+    Schedule = apps.get_model("hubinsight", "Schedule")
+    Schedule.objects.filter(fire_at__isnull=True).update(fire_at=F("next_run_at"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hubinsight', '0008_schedule_quota'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='schedule',
+            name='schedule_due_idx',
+        ),
+        migrations.AddField(
+            model_name='schedule',
+            name='fire_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(backfill_fire_at, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='schedule',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True), ('status', 'ENABLED')), fields=['fire_at'], name='schedule_fire_idx'),
+        ),
+    ]
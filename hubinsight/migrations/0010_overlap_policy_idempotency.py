@@ -0,0 +1,28 @@
+# Generated by Django 5.2.7 on 2026-10-18 01:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hubinsight', '0009_schedule_fire_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='execution',
+            name='idempotency_key',
+            field=models.CharField(blank=True, max_length=80, null=True, unique=True),
+        ),
+        migrations.AddField(
+            model_name='execution',
+            name='scheduled_for',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='schedule',
+            name='overlap_policy',
+            field=models.CharField(choices=[('ALLOW', 'Allow'), ('SKIP', 'Skip'), ('COALESCE', 'Coalesce')], default='ALLOW', max_length=10),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.7 on 2026-10-18 01:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hubinsight', '0010_overlap_policy_idempotency'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='execution',
+            name='cache_hit',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='execution',
+            name='cached_from',
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+    ]
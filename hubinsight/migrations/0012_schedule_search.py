@@ -0,0 +1,101 @@
+# Generated by Django 5.2.7 on 2026-10-18 02:02
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Frozen copies of hubinsight.search as of this migration, so later changes there can't alter it.
+# create_index is the only copy of the index DDL; search.install_index reruns it.
+FIELDS = ("task_name", "owner_username", "inputs_text")
+FTS_TABLE = "hubinsight_schedule_fts"
+TRGM_INDEX = "hubinsight_schedule_trgm"
+TABLE = "hubinsight_schedulesearch"
+SEARCH_INPUTS = {"send_report": ("email",), "reindex_search": ("segment",)}
+
+
+def document(task_name, username, inputs):
+    values = []
+    if isinstance(inputs, dict):
+        keys = SEARCH_INPUTS.get(task_name, ())
+        values = [str(inputs[k]) for k in keys if inputs.get(k) not in (None, "")]
+    return {
+        "task_name": task_name.lower(),
+        "owner_username": username.lower(),
+        "inputs_text": " ".join(values).lower(),
+    }
+
+
+def backfill_search(apps, schema_editor):
+    Schedule = apps.get_model("hubinsight", "Schedule")
+    ScheduleSearch = apps.get_model("hubinsight", "ScheduleSearch")
+    rows = (
+        Schedule.objects.using(schema_editor.connection.alias)
+        .order_by("pk")
+        .values_list("pk", "task__name", "owner__username", "inputs")
+        .iterator(chunk_size=2000)
+    )
+    ScheduleSearch.objects.using(schema_editor.connection.alias).bulk_create(
+        (ScheduleSearch(schedule_id=pk, **document(task, owner, inputs)) for pk, task, owner, inputs in rows),
+        batch_size=2000,
+    )
+
+
+def create_index(apps, schema_editor):
+    # External-content FTS5 table kept in sync by triggers on SQLite, trigram GIN on Postgres.
+    vendor = schema_editor.connection.vendor
+    cols = ", ".join(FIELDS)
+    new = ", ".join(f"new.{c}" for c in FIELDS)
+    old = ", ".join(f"old.{c}" for c in FIELDS)
+    if vendor == "sqlite":
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5({cols}, "
+            f"content='{TABLE}', content_rowid='schedule_id', tokenize='trigram')"
+        )
+        schema_editor.execute(
+            f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON {TABLE} BEGIN "
+            f"INSERT INTO {FTS_TABLE}(rowid, {cols}) VALUES (new.schedule_id, {new}); END"
+        )
+        schema_editor.execute(
+            f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON {TABLE} BEGIN "
+            f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {cols}) VALUES ('delete', old.schedule_id, {old}); END"
+        )
+        schema_editor.execute(
+            f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE ON {TABLE} BEGIN "
+            f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {cols}) VALUES ('delete', old.schedule_id, {old}); "
+            f"INSERT INTO {FTS_TABLE}(rowid, {cols}) VALUES (new.schedule_id, {new}); END"
+        )
+        schema_editor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+    elif vendor == "postgresql":
+        schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        ops = ", ".join(f"{c} gin_trgm_ops" for c in FIELDS)
+        schema_editor.execute(f"CREATE INDEX IF NOT EXISTS {TRGM_INDEX} ON {TABLE} USING gin ({ops})")
+
+
+def remove_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        for suffix in ("ai", "ad", "au"):
+            schema_editor.execute(f"DROP TRIGGER IF EXISTS {FTS_TABLE}_{suffix}")
+        schema_editor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+    elif vendor == "postgresql":
+        schema_editor.execute(f"DROP INDEX IF EXISTS {TRGM_INDEX}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hubinsight', '0011_execution_cache_hit'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScheduleSearch',
+            fields=[
+                ('schedule', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='search', serialize=False, to='hubinsight.schedule')),
+                ('task_name', models.CharField(max_length=120)),
+                ('owner_username', models.CharField(max_length=150)),
+                ('inputs_text', models.TextField(blank=True)),
+            ],
+        ),
+        migrations.RunPython(backfill_search, migrations.RunPython.noop),
+        migrations.RunPython(create_index, remove_index),
+    ]
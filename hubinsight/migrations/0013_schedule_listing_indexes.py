@@ -0,0 +1,55 @@
+# Generated by Django 5.2.7 on 2026-10-18 02:05
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hubinsight', '0012_schedule_search'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='execution',
+            name='hubinsight__schedul_be9d59_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='schedule',
+            name='hubinsight__owner_i_d80785_idx',
+        ),
+        migrations.AddIndex(
+            model_name='execution',
+            index=models.Index(fields=['schedule', '-started_at', '-id'], name='execution_schedule_started_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='schedule',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['owner', 'status', '-created_at'], name='schedule_owner_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='schedule',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['owner', '-created_at', '-id'], name='schedule_owner_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='schedule',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['-created_at', '-id'], name='schedule_live_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='schedule',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['owner', 'next_run_at'], name='schedule_owner_next_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='schedule',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['owner', 'last_run_at'], name='schedule_owner_last_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='schedule',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['next_run_at'], name='schedule_live_next_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='schedule',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['last_run_at'], name='schedule_live_last_idx'),
+        ),
+    ]
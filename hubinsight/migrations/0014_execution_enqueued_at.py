@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-18 02:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hubinsight', '0013_schedule_listing_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='execution',
+            name='enqueued_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
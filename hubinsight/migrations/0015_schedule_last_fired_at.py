@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-18 02:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hubinsight', '0014_execution_enqueued_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='schedule',
+            name='last_fired_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -1,5 +1,6 @@
 from django.db import models
 from django.contrib.auth import get_user_model
+from django.utils import timezone
 
 User = get_user_model()
 
@@ -9,6 +10,7 @@ class PredefinedTask(models.Model):
     inputs_schema = models.JSONField(default=list)
     is_schedulable = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ["name"]
@@ -21,22 +23,84 @@ class Schedule(models.Model):
         ENABLED = "ENABLED"
         DISABLED = "DISABLED"
 
+    class OverlapPolicy(models.TextChoices):
+        # What happens when a run fires while the previous one is still going.
+        ALLOW = "ALLOW"
+        SKIP = "SKIP"
+        COALESCE = "COALESCE"
+
     owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name="schedules")
     task = models.ForeignKey(PredefinedTask, on_delete=models.PROTECT, related_name="schedules")
     cron_expression = models.CharField(max_length=64)
     inputs = models.JSONField(default=dict)
     status = models.CharField(max_length=10, choices=Status.choices, default=Status.ENABLED)
+    overlap_policy = models.CharField(max_length=10, choices=OverlapPolicy.choices, default=OverlapPolicy.ALLOW)
     beat_periodic_task_id = models.IntegerField(null=True, blank=True, db_index=True)
     last_run_at = models.DateTimeField(null=True, blank=True)
     next_run_at = models.DateTimeField(null=True, blank=True)
+    # next_run_at plus the task's dispatch jitter; the dispatcher fires on this.
+    fire_at = models.DateTimeField(null=True, blank=True)
+    # When the dispatcher's last send became runnable (fire_at plus any throttle countdown).
+    last_fired_at = models.DateTimeField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     deleted_at = models.DateTimeField(null=True, blank=True)
 
     class Meta:
-        indexes = [models.Index(fields=["owner", "status"])]
+        # Every API read is scoped to live rows, so listing indexes are partial on deleted_at IS NULL;
+        # owner leads for regular users, ordering columns follow (see explain_queries).
+        indexes = [
+            models.Index(
+                fields=["owner", "status", "-created_at"],
+                name="schedule_owner_status_idx",
+                condition=models.Q(deleted_at__isnull=True),
+            ),
+            models.Index(
+                fields=["owner", "-created_at", "-id"],
+                name="schedule_owner_created_idx",
+                condition=models.Q(deleted_at__isnull=True),
+            ),
+            models.Index(
+                fields=["-created_at", "-id"],
+                name="schedule_live_created_idx",
+                condition=models.Q(deleted_at__isnull=True),
+            ),
+            models.Index(
+                fields=["owner", "next_run_at"],
+                name="schedule_owner_next_idx",
+                condition=models.Q(deleted_at__isnull=True),
+            ),
+            models.Index(
+                fields=["owner", "last_run_at"],
+                name="schedule_owner_last_idx",
+                condition=models.Q(deleted_at__isnull=True),
+            ),
+            models.Index(
+                fields=["next_run_at"],
+                name="schedule_live_next_idx",
+                condition=models.Q(deleted_at__isnull=True),
+            ),
+            models.Index(
+                fields=["last_run_at"],
+                name="schedule_live_last_idx",
+                condition=models.Q(deleted_at__isnull=True),
+            ),
+            models.Index(
+                fields=["fire_at"],
+                name="schedule_fire_idx",
+                condition=models.Q(status="ENABLED", deleted_at__isnull=True),
+            ),
+        ]
         ordering = ["-created_at"]
 
+class ScheduleSearch(models.Model):
+    """Lower-cased search text for one schedule; FTS5 (SQLite) or pg_trgm (Postgres) indexes it, see hubinsight.search."""
+
+    schedule = models.OneToOneField(Schedule, on_delete=models.CASCADE, primary_key=True, related_name="search")
+    task_name = models.CharField(max_length=120)
+    owner_username = models.CharField(max_length=150)
+    inputs_text = models.TextField(blank=True)
+
 class Execution(models.Model):
     class ExecStatus(models.TextChoices):
         SUCCESS = "SUCCESS"
@@ -46,12 +110,70 @@ class Execution(models.Model):
 
     schedule = models.ForeignKey(Schedule, on_delete=models.CASCADE, related_name="executions")
     task_name = models.CharField(max_length=120)
-    started_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(default=timezone.now)
     finished_at = models.DateTimeField(null=True, blank=True)
     status = models.CharField(max_length=10, choices=ExecStatus.choices, default=ExecStatus.STARTED)
     runtime_ms = models.IntegerField(null=True, blank=True)
-    logs = models.JSONField(null=True, blank=True)
+    scheduled_for = models.DateTimeField(null=True, blank=True)
+    # When the message became runnable on the broker (publish time, or its countdown/eta if later).
+    enqueued_at = models.DateTimeField(null=True, blank=True)
+    # "<schedule>:<scheduled_for>" (dispatcher) or "task:<celery id>" (beat); redeliveries collide here.
+    idempotency_key = models.CharField(max_length=80, null=True, blank=True, unique=True)
+    # Served from the result cache: cached_from is the id of the execution that computed it.
+    cache_hit = models.BooleanField(default=False)
+    cached_from = models.BigIntegerField(null=True, blank=True)
 
     class Meta:
-        indexes = [models.Index(fields=["schedule", "-started_at"])]
+        indexes = [models.Index(fields=["schedule", "-started_at", "-id"], name="execution_schedule_started_idx")]
         ordering = ["-started_at"]
+
+class ExecutionLog(models.Model):
+    # Logs live out of row (zlib-compressed JSON) so Execution scans stay narrow.
+    execution = models.OneToOneField(Execution, on_delete=models.CASCADE, primary_key=True, related_name="log")
+    data = models.BinaryField()
+    size = models.IntegerField(default=0)  # uncompressed JSON size in bytes
+    truncated = models.BooleanField(default=False)
+
+class ExecutionRollup(models.Model):
+    """Per-schedule (or per-task when ``schedule`` is null) execution stats for one hour/day bucket."""
+
+    class Granularity(models.TextChoices):
+        HOUR = "hour"
+        DAY = "day"
+
+    schedule = models.ForeignKey(Schedule, on_delete=models.CASCADE, null=True, blank=True, related_name="rollups")
+    task_name = models.CharField(max_length=120)
+    granularity = models.CharField(max_length=4, choices=Granularity.choices)
+    bucket_start = models.DateTimeField()
+    run_count = models.IntegerField(default=0)
+    success_count = models.IntegerField(default=0)
+    failure_count = models.IntegerField(default=0)
+    runtime_max_ms = models.IntegerField(null=True, blank=True)
+    runtime_sketch = models.JSONField(default=dict)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["schedule", "granularity", "bucket_start"],
+                condition=models.Q(schedule__isnull=False),
+                name="rollup_schedule_bucket_uniq",
+            ),
+            models.UniqueConstraint(
+                fields=["task_name", "granularity", "bucket_start"],
+                condition=models.Q(schedule__isnull=True),
+                name="rollup_task_bucket_uniq",
+            ),
+        ]
+        ordering = ["bucket_start"]
+
+class ScheduleQuota(models.Model):
+    """Denormalized count of an owner's enabled, non-deleted schedules (see hubinsight.quotas)."""
+
+    owner = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name="schedule_quota")
+    active_count = models.PositiveIntegerField(default=0)
+    max_active = models.PositiveIntegerField(null=True, blank=True, help_text="Empty uses SCHEDULE_ACTIVE_LIMIT.")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.owner_id}: {self.active_count}/{self.max_active or '-'}"
@@ -0,0 +1,86 @@
+import threading
+import uuid
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .models import Execution
+
+LEASE_KEY = "hubinsight:lease:schedule:%s"
+PENDING_KEY = "hubinsight:pending:schedule:%s"
+RUN_KEY = "hubinsight:run:%s"
+
+
+def idempotency_key(schedule_id, scheduled_for=None, task_id=None):
+    if scheduled_for:
+        return f"{schedule_id}:{scheduled_for}"
+    if task_id:
+        return f"task:{task_id}"
+    return None
+
+
+def claim_run(key):
+    """
+    True the first time a run key is seen. The cache add is the cheap check;
+    the indexed lookup covers runs whose cache entry expired or lives in
+    another process. ``Execution.idempotency_key`` is unique as a last guard.
+    """
+    if key is None:
+        return True
+    if not cache.add(RUN_KEY % key, 1, settings.EXECUTION_IDEMPOTENCY_TTL):
+        return False
+    return not Execution.objects.filter(idempotency_key=key).exists()
+
+
+class ScheduleLease:
+    """At most one running execution per schedule, held in the shared cache with a TTL."""
+
+    def __init__(self, schedule_id, ttl=None):
+        self.key = LEASE_KEY % schedule_id
+        self.ttl = ttl or settings.SCHEDULE_LEASE_TTL
+        self.token = uuid.uuid4().hex
+
+    def acquire(self):
+        return cache.add(self.key, self.token, self.ttl)
+
+    def renew(self):
+        if cache.get(self.key) != self.token:
+            return False
+        return cache.touch(self.key, self.ttl)
+
+    @contextmanager
+    def renewing(self, interval=None):
+        # Keeps the lease alive while a run outlasts its TTL; a dead worker stops renewing and it expires.
+        stop = threading.Event()
+        interval = interval or max(1.0, self.ttl / 3)
+
+        def heartbeat():
+            while not stop.wait(interval):
+                if not self.renew():
+                    return
+
+        thread = threading.Thread(target=heartbeat, name=f"lease-{self.key}", daemon=True)
+        thread.start()
+        try:
+            yield self
+        finally:
+            stop.set()
+
+    def release(self):
+        # Don't drop a lease that expired and was taken over by another run.
+        if cache.get(self.key) == self.token:
+            cache.delete(self.key)
+
+
+def defer_run(schedule_id, payload):
+    # Later fires overwrite earlier ones: however many overlap, one follow-up runs.
+    cache.set(PENDING_KEY % schedule_id, payload, settings.SCHEDULE_LEASE_TTL)
+
+
+def pop_deferred_run(schedule_id):
+    key = PENDING_KEY % schedule_id
+    payload = cache.get(key)
+    if payload is not None:
+        cache.delete(key)
+    return payload
@@ -1,4 +1,14 @@
-from rest_framework.pagination import PageNumberPagination
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+
+from django.core.exceptions import FieldDoesNotExist
+from django.core.paginator import InvalidPage
+from django.db.models import Q
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
 
 class RoleAwarePageNumberPagination(PageNumberPagination):
     page_size_query_param = "page_size"
@@ -9,3 +19,152 @@ class RoleAwarePageNumberPagination(PageNumberPagination):
             self.max_page_size = 100
         req_size = int(request.query_params.get(self.page_size_query_param, size))
         return min(req_size, self.max_page_size)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """``paginate_queryset`` for async views: the COUNT and the page fetch go through the async ORM."""
+        self.request = request
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+        paginator = self.django_paginator_class(queryset, page_size)
+        paginator.count = await queryset.acount()
+        page_number = self.get_page_number(request, paginator)
+        try:
+            self.page = paginator.page(page_number)
+        except InvalidPage as exc:
+            raise NotFound(self.invalid_page_message.format(page_number=page_number, message=str(exc)))
+        self.page.object_list = [obj async for obj in self.page.object_list]
+        return list(self.page)
+
+
+class RoleAwareKeysetPagination(BasePagination):
+    """
+    Keyset pagination over ``(field, id)``: each page is a range scan that
+    starts at the last row of the previous page, so there is no COUNT(*) and no
+    OFFSET and deep pages cost the same as the first one.
+
+    Views set ``cursor_ordering`` (e.g. ``("-started_at", "-id")``); both
+    parts must share a direction and the first must be non-nullable. An
+    ordering already on the queryset (``?ordering=``, advanced_search) wins
+    when it is one such field; anything the keyset can't follow is a 400.
+    """
+
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    max_page_size = 10
+    ordering = ("-started_at", "-id")
+    invalid_cursor_message = "Invalid cursor"
+    invalid_ordering_message = "Cursor pagination can only order by one of: {fields}."
+
+    def get_page_size(self, request):
+        size = api_settings.PAGE_SIZE or self.max_page_size
+        if request.user and request.user.is_authenticated and request.user.is_superuser:
+            self.max_page_size = 100
+        try:
+            req_size = int(request.query_params.get(self.page_size_query_param, size))
+        except (TypeError, ValueError):
+            req_size = size
+        return max(1, min(req_size, self.max_page_size))
+
+    def paginate_queryset(self, queryset, request, view=None):
+        return self._set_page(list(self._page_queryset(queryset, request, view)))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        qs = self._page_queryset(queryset, request, view)
+        return self._set_page([obj async for obj in qs])
+
+    def _page_queryset(self, queryset, request, view):
+        self.request = request
+        self.ordering = self.get_ordering(queryset, view)
+        self.page_size = self.get_page_size(request)
+
+        key, tiebreak = (f.lstrip("-") for f in self.ordering)
+        descending = self.ordering[0].startswith("-")
+        queryset = queryset.order_by(*self.ordering)
+
+        cursor = self.decode_cursor(request, queryset.model._meta.get_field(key))
+        if cursor is not None:
+            value, last_pk = cursor
+            op = "lt" if descending else "gt"
+            queryset = queryset.filter(
+                Q(**{f"{key}__{op}": value}) | Q(**{key: value, f"{tiebreak}__{op}": last_pk})
+            )
+        return queryset[: self.page_size + 1]
+
+    def get_ordering(self, queryset, view):
+        default = tuple(getattr(view, "cursor_ordering", None) or self.ordering)
+        pk = queryset.model._meta.pk.name
+        requested = [
+            f.replace("pk", pk, 1) if f.lstrip("-") == "pk" else f
+            for f in queryset.query.order_by if isinstance(f, str)
+        ]
+        if not requested:
+            return default
+        first, rest = requested[0], requested[1:]
+        descending = first.startswith("-")
+        if not rest or (len(rest) == 1 and rest[0].lstrip("-") == pk and rest[0].startswith("-") == descending):
+            try:
+                field = queryset.model._meta.get_field(first.lstrip("-"))
+            except FieldDoesNotExist:
+                field = None
+            if field is not None and field.concrete and not field.null:
+                return (first, f"-{pk}" if descending else pk)
+        fields = sorted(
+            f.name for f in queryset.model._meta.concrete_fields
+            if not f.null and f.name in (getattr(view, "ordering_fields", None) or ())
+        ) or [default[0].lstrip("-")]
+        raise ValidationError({"ordering": [self.invalid_ordering_message.format(fields=", ".join(fields))]})
+
+    def _set_page(self, rows):
+        key, tiebreak = (f.lstrip("-") for f in self.ordering)
+        self.has_next = len(rows) > self.page_size
+        self.page = rows[: self.page_size]
+        self.next_position = None
+        if self.has_next:
+            last = self.page[-1]
+            self.next_position = (getattr(last, key), getattr(last, tiebreak))
+        return self.page
+
+    def decode_cursor(self, request, field):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            raw = json.loads(urlsafe_b64decode(encoded.encode("ascii")).decode("utf-8"))
+            value = field.to_python(raw["v"])
+            return value, int(raw["id"])
+        except Exception:
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, position):
+        value, pk = position
+        value = value.isoformat() if hasattr(value, "isoformat") else value
+        raw = json.dumps({"v": value, "id": pk}, separators=(",", ":"))
+        return urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+    def get_next_link(self):
+        if self.next_position is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.next_position))
+
+    def get_first_link(self):
+        return remove_query_param(self.request.build_absolute_uri(), self.cursor_query_param)
+
+    def get_paginated_response(self, data):
+        return Response({
+            "next": self.get_next_link(),
+            "first": self.get_first_link(),
+            "results": data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "first": {"type": "string", "format": "uri"},
+                "results": schema,
+            },
+        }
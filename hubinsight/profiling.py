@@ -0,0 +1,256 @@
+# Opt-in request profiling (REQUEST_PROFILING): Server-Timing, per-route histograms, cProfile dumps of slow routes.
+import cProfile
+import logging
+import os
+import random
+import re
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+logger = logging.getLogger(__name__)
+
+BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+COMPONENTS = ("auth", "db", "ser", "app", "total")
+
+_current = ContextVar("hubinsight_request_timings", default=None)
+_timing = ContextVar("hubinsight_timing_active", default=False)
+
+
+class RequestTimings:
+    __slots__ = ("started", "auth", "db", "ser", "queries")
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.auth = self.db = self.ser = 0.0
+        self.queries = 0
+
+    def add(self, component, seconds):
+        setattr(self, component, getattr(self, component) + seconds)
+
+    def record_query(self, execute, sql, params, many, context):
+        t0 = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db += time.perf_counter() - t0
+            self.queries += 1
+
+    def breakdown(self):
+        """Milliseconds per component; ``app`` is whatever auth, SQL and serializers don't account for."""
+        total = (time.perf_counter() - self.started) * 1000
+        auth, db, ser = self.auth * 1000, self.db * 1000, self.ser * 1000
+        return {"auth": auth, "db": db, "ser": ser, "app": max(0.0, total - auth - db - ser), "total": total}
+
+
+@contextmanager
+def timed(component):
+    """Charge the block to ``component`` of the current profiled request; nested blocks count once."""
+    timings = _current.get()
+    if timings is None or _timing.get():
+        yield
+        return
+    token = _timing.set(True)
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(component, time.perf_counter() - t0)
+        _timing.reset(token)
+
+
+class TimedSerializerMixin:
+    """Counts output serialization (``to_representation``) as ``ser`` time."""
+
+    def to_representation(self, instance):
+        with timed("ser"):
+            return super().to_representation(instance)
+
+
+class TimedJWTAuthentication(JWTAuthentication):
+    def authenticate(self, request):
+        with timed("auth"):
+            return super().authenticate(request)
+
+
+class RouteHistograms:
+    """Per-route latency histograms (``BUCKETS_MS``) and component sums for this process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes = {}
+
+    def observe(self, route, breakdown, queries):
+        with self._lock:
+            entry = self._routes.get(route)
+            if entry is None:
+                entry = self._routes[route] = {
+                    "count": 0,
+                    "queries": 0,
+                    "sum_ms": dict.fromkeys(COMPONENTS, 0.0),
+                    "buckets": [0] * (len(BUCKETS_MS) + 1),
+                }
+            entry["count"] += 1
+            entry["queries"] += queries
+            for component in COMPONENTS:
+                entry["sum_ms"][component] += breakdown[component]
+            entry["buckets"][_bucket(breakdown["total"])] += 1
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                route: {
+                    "count": e["count"],
+                    "queries": e["queries"],
+                    "sum_ms": {k: round(v, 3) for k, v in e["sum_ms"].items()},
+                    "buckets": dict(zip([*map(str, BUCKETS_MS), "+Inf"], e["buckets"])),
+                }
+                for route, e in self._routes.items()
+            }
+
+    def reset(self):
+        with self._lock:
+            self._routes.clear()
+
+
+def _bucket(ms):
+    for i, bound in enumerate(BUCKETS_MS):
+        if ms <= bound:
+            return i
+    return len(BUCKETS_MS)
+
+
+route_stats = RouteHistograms()
+
+
+def server_timing(breakdown, queries):
+    parts = []
+    for component in COMPONENTS:
+        part = f"{component};dur={breakdown[component]:.1f}"
+        if component == "db":
+            part += f';desc="{queries} queries"'
+        parts.append(part)
+    return ", ".join(parts)
+
+
+def _wrap_queries(timings):
+    # execute_wrapper is per connection, and connections are per thread: install it where the queries run.
+    stack = ExitStack()
+    for conn in connections.all():
+        stack.enter_context(conn.execute_wrapper(timings.record_query))
+    return stack
+
+
+class ProfilingMiddleware:
+    """Put it first in MIDDLEWARE so ``total`` covers the whole stack. Removed entirely when disabled."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, "REQUEST_PROFILING", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+        self.sample_rate = settings.REQUEST_PROFILING_SAMPLE_RATE
+        self.slow_ms = settings.REQUEST_PROFILING_SLOW_MS
+        self.dump_dir = settings.REQUEST_PROFILING_DUMP_DIR
+        self._armed = set()
+        self._lock = threading.Lock()
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if random.random() >= self.sample_rate:
+            return self.get_response(request)
+
+        timings = RequestTimings()
+        token = _current.set(timings)
+        request._profiler = None
+        try:
+            with _wrap_queries(timings):
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, timings)
+
+    async def __acall__(self, request):
+        if random.random() >= self.sample_rate:
+            return await self.get_response(request)
+
+        timings = RequestTimings()
+        token = _current.set(timings)
+        request._profiler = None
+        try:
+            # The async ORM and sync views both run in the request's thread-sensitive thread.
+            stack = await sync_to_async(_wrap_queries)(timings)
+            try:
+                response = await self.get_response(request)
+            finally:
+                await sync_to_async(stack.close)()
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, timings)
+
+    def finish(self, request, response, timings):
+        profiler = request._profiler
+        if profiler is not None:
+            profiler.disable()
+
+        breakdown = timings.breakdown()
+        route = self.route_of(request)
+        route_stats.observe(route, breakdown, timings.queries)
+        response["Server-Timing"] = server_timing(breakdown, timings.queries)
+        if breakdown["total"] >= self.slow_ms:
+            self.on_slow(route, breakdown, timings.queries, profiler)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        # Only the view runs under cProfile; starting here means the route is already resolved.
+        if not self.dump_dir or not hasattr(request, "_profiler"):
+            return None
+        route = self.route_of(request)
+        with self._lock:
+            if route not in self._armed:
+                return None
+            self._armed.discard(route)
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Another profiler is active in this thread (3.12+ allows only one).
+            return None
+        request._profiler = profiler
+        return None
+
+    def on_slow(self, route, breakdown, queries, profiler):
+        logger.warning(
+            "request_slow",
+            extra={"route": route, "queries": queries, **{f"{k}_ms": round(v, 1) for k, v in breakdown.items()}},
+        )
+        if not self.dump_dir:
+            return
+        if profiler is None:
+            with self._lock:
+                self._armed.add(route)
+            return
+        os.makedirs(self.dump_dir, exist_ok=True)
+        slug = re.sub(r"[^A-Za-z0-9]+", "-", route).strip("-")
+        path = os.path.join(self.dump_dir, f"{slug}-{int(time.time())}-{breakdown['total']:.0f}ms.prof")
+        profiler.dump_stats(path)
+        logger.warning("request_profile_dumped", extra={"route": route, "path": path})
+
+    @staticmethod
+    def route_of(request):
+        match = getattr(request, "resolver_match", None)
+        if match is None:
+            return f"{request.method} <unresolved>"
+        return f"{request.method} {match.view_name}"
@@ -0,0 +1,68 @@
+from django.conf import settings
+from django.db.models import F, Q
+from django.db.models.functions import Greatest
+
+from .models import Schedule, ScheduleQuota
+
+ENABLED = Schedule.Status.ENABLED
+
+
+def count_active(owner_id):
+    return Schedule.objects.filter(owner_id=owner_id, status=ENABLED, deleted_at__isnull=True).count()
+
+
+def ensure_quota(owner_id):
+    # The first touch seeds the counter from the real count; afterwards it is maintained incrementally.
+    quota = ScheduleQuota.objects.filter(owner_id=owner_id).first()
+    if quota is None:
+        quota, _ = ScheduleQuota.objects.get_or_create(
+            owner_id=owner_id, defaults={"active_count": count_active(owner_id)}
+        )
+    return quota
+
+
+def active_limit(quota):
+    return quota.max_active if quota.max_active is not None else settings.SCHEDULE_ACTIVE_LIMIT
+
+
+def status_delta(old_status, new_status):
+    return int(new_status == ENABLED) - int(old_status == ENABLED)
+
+
+def reserve_active(owner_id, n=1, enforce=True):
+    """
+    Atomically add ``n`` enabled schedules to the owner's counter. With
+    ``enforce`` the increment is conditional on staying within the limit, so
+    two concurrent creates can never both take the last slot. Returns False
+    when the limit would be exceeded.
+    """
+    if n <= 0:
+        return True
+    ensure_quota(owner_id)
+    qs = ScheduleQuota.objects.filter(owner_id=owner_id)
+    if enforce:
+        default = settings.SCHEDULE_ACTIVE_LIMIT
+        qs = qs.filter(
+            Q(max_active__isnull=True, active_count__lte=default - n)
+            | Q(max_active__isnull=False, active_count__lte=F("max_active") - n)
+        )
+    return qs.update(active_count=F("active_count") + n) == 1
+
+
+def release_active(owner_id, n=1):
+    if n <= 0:
+        return
+    ensure_quota(owner_id)
+    ScheduleQuota.objects.filter(owner_id=owner_id).update(active_count=Greatest(F("active_count") - n, 0))
+
+
+def apply_status_change(owner_id, old_status, new_status, enforce=True):
+    delta = status_delta(old_status, new_status)
+    if delta > 0:
+        return reserve_active(owner_id, delta, enforce=enforce)
+    release_active(owner_id, -delta)
+    return True
+
+
+def limit_for(owner_id):
+    return active_limit(ensure_quota(owner_id))
@@ -0,0 +1,278 @@
+import atexit
+import logging
+import os
+import threading
+import time
+
+from celery.signals import worker_process_shutdown, worker_shutdown
+from django.conf import settings
+from django.db import IntegrityError, close_old_connections, connection, transaction
+from django.db.models import Case, DateTimeField, Value, When
+from django.utils import timezone
+
+from .listcache import bump_schedule_versions
+from .logstore import store_logs
+from .models import Execution, Schedule
+from .rollups import record_executions
+
+logger = logging.getLogger(__name__)
+
+EXECUTION_UPDATE_FIELDS = ["status", "finished_at", "runtime_ms"]
+
+
+def _update_rollups(executions):
+    if not getattr(settings, "EXECUTION_ROLLUPS_ENABLED", True):
+        return
+    try:
+        record_executions(executions)
+    except Exception:
+        logger.exception("execution_rollup_failed", extra={"executions": len(executions)})
+
+
+def _bump_listings(schedule_ids):
+    # last_run_at is shown in schedule listings; one small query maps schedules to owners.
+    owners = Schedule.objects.filter(pk__in=schedule_ids).values_list("owner_id", flat=True).distinct()
+    bump_schedule_versions(list(owners))
+
+
+def _apply_finish(ex, status, started=None):
+    ex.status = status
+    ex.finished_at = timezone.now()
+    if started:
+        delta = (ex.finished_at - started).total_seconds() * 1000
+        ex.runtime_ms = int(delta)
+
+
+class DirectExecutionRecorder:
+    """One write per event; used when buffering is switched off."""
+
+    def start(self, schedule_id, task_name, started=None, immediate=False, **fields):
+        return Execution.objects.create(
+            schedule_id=schedule_id,
+            task_name=task_name,
+            started_at=started or timezone.now(),
+            **fields,
+        )
+
+    def finish(self, ex, status, logs=None, started=None):
+        _apply_finish(ex, status, started=started)
+        ex.save()
+        store_logs([(ex, logs)])
+        _update_rollups([ex])
+
+    def touch_schedule(self, schedule_id, when):
+        Schedule.objects.filter(pk=schedule_id).update(last_run_at=when)
+        _bump_listings([schedule_id])
+
+    def flush(self):
+        return 0
+
+
+class BufferedExecutionRecorder:
+    """
+    Buffers execution start/finish events and schedule ``last_run_at`` bumps
+    for the current worker process and writes them in batches.
+
+    A flush happens when ``max_batch`` events are pending, when the oldest
+    pending event is older than ``max_delay`` seconds, or on worker shutdown.
+    An execution that starts and finishes between two flushes is inserted once
+    in its final state.
+    """
+
+    def __init__(self, max_batch=200, max_delay=2.0):
+        self.max_batch = max(1, int(max_batch))
+        self.max_delay = float(max_delay)
+        self._lock = threading.RLock()
+        self._pending = {}  # id(instance) -> Execution
+        self._logs = {}  # id(instance) -> (Execution, logs)
+        self._last_run = {}  # schedule_id -> latest started_at
+        self._oldest = None
+        self._timer = None
+        self._pid = None
+        self._flush_lock = threading.Lock()
+        self._retry_at = None  # after a failed flush, wait max_delay before trying again
+
+    def start(self, schedule_id, task_name, started=None, immediate=False, **fields):
+        # ``immediate`` inserts now, for callers that need the id before the next flush.
+        if immediate:
+            return Execution.objects.create(
+                schedule_id=schedule_id,
+                task_name=task_name,
+                started_at=started or timezone.now(),
+                **fields,
+            )
+        ex = Execution(
+            schedule_id=schedule_id,
+            task_name=task_name,
+            started_at=started or timezone.now(),
+            **fields,
+        )
+        with self._lock:
+            self._pending[id(ex)] = ex
+            self._mark()
+        self._maybe_flush()
+        return ex
+
+    def finish(self, ex, status, logs=None, started=None):
+        with self._lock:
+            _apply_finish(ex, status, started=started)
+            self._pending[id(ex)] = ex
+            if logs is not None:
+                self._logs[id(ex)] = (ex, logs)
+            self._mark()
+        self._maybe_flush()
+
+    def touch_schedule(self, schedule_id, when):
+        with self._lock:
+            prev = self._last_run.get(schedule_id)
+            if prev is None or when > prev:
+                self._last_run[schedule_id] = when
+            self._mark()
+        self._maybe_flush()
+
+    def pending_count(self):
+        return len(self._pending) + len(self._last_run)
+
+    def flush(self):
+        # One flush at a time; the buffer lock is only held to swap buffers, never across DB I/O.
+        with self._flush_lock:
+            with self._lock:
+                if not self._pending and not self._last_run:
+                    return 0
+                pending = list(self._pending.values())
+                logs = list(self._logs.values())
+                last_run = dict(self._last_run)
+                self._pending.clear()
+                self._logs.clear()
+                self._last_run.clear()
+                self._oldest = None
+
+            new = [ex for ex in pending if ex.pk is None]
+            dirty = [ex for ex in pending if ex.pk is not None]
+            try:
+                with transaction.atomic():
+                    if new:
+                        self._insert(new)
+                    if dirty:
+                        Execution.objects.bulk_update(dirty, EXECUTION_UPDATE_FIELDS, batch_size=self.max_batch)
+                    written_logs = [(ex, data) for ex, data in logs if ex.pk is not None]
+                    if written_logs:
+                        store_logs(written_logs)
+                    if last_run:
+                        Schedule.objects.filter(pk__in=list(last_run)).update(
+                            last_run_at=Case(
+                                *[When(pk=pk, then=Value(ts)) for pk, ts in last_run.items()],
+                                output_field=DateTimeField(),
+                            )
+                        )
+                        _bump_listings(list(last_run))
+            except Exception:
+                logger.exception(
+                    "execution_recorder_flush_failed",
+                    extra={"inserted": len(new), "updated": len(dirty), "schedules": len(last_run)},
+                )
+                self._restore(new, pending, logs, last_run)
+                return 0
+            self._retry_at = None
+
+            _update_rollups([ex for ex in pending if ex.pk is not None and ex.finished_at is not None])
+
+        logger.debug(
+            "execution_recorder_flushed",
+            extra={"inserted": len(new), "updated": len(dirty), "schedules": len(last_run)},
+        )
+        return len(pending) + len(last_run)
+
+    def _restore(self, new, pending, logs, last_run):
+        # The transaction rolled back: put everything back for the next flush, keeping newer events.
+        for ex in new:
+            # bulk_create may have assigned ids that no longer exist.
+            ex.pk = None
+            ex._state.adding = True
+        with self._lock:
+            for ex in pending:
+                self._pending.setdefault(id(ex), ex)
+            for ex, data in logs:
+                self._logs.setdefault(id(ex), (ex, data))
+            for schedule_id, when in last_run.items():
+                prev = self._last_run.get(schedule_id)
+                if prev is None or when > prev:
+                    self._last_run[schedule_id] = when
+            self._retry_at = time.monotonic() + self.max_delay
+            self._mark()
+
+    def _insert(self, new):
+        try:
+            with transaction.atomic():
+                Execution.objects.bulk_create(new, batch_size=self.max_batch)
+            return
+        except IntegrityError:
+            pass
+        # A redelivered run reused an idempotency key: insert one by one and drop the duplicates.
+        for ex in new:
+            ex.pk = None
+            try:
+                with transaction.atomic():
+                    ex.save(force_insert=True)
+            except IntegrityError:
+                ex.pk = None
+                logger.warning("execution_duplicate_dropped", extra={"key": ex.idempotency_key})
+
+    def _mark(self):
+        if self._oldest is None:
+            self._oldest = time.monotonic()
+        self._ensure_timer()
+
+    def _maybe_flush(self):
+        retry_at = self._retry_at
+        if retry_at is not None and time.monotonic() < retry_at:
+            return
+        if self.pending_count() >= self.max_batch or self._is_stale():
+            self.flush()
+
+    def _is_stale(self):
+        oldest = self._oldest
+        return oldest is not None and time.monotonic() - oldest >= self.max_delay
+
+    def _ensure_timer(self):
+        # Started lazily so each forked worker process gets its own thread.
+        pid = os.getpid()
+        if self._timer is not None and self._pid == pid and self._timer.is_alive():
+            return
+        self._pid = pid
+        self._timer = threading.Thread(target=self._run_timer, name="execution-recorder", daemon=True)
+        self._timer.start()
+
+    def _run_timer(self):
+        while True:
+            time.sleep(self.max_delay)
+            if self._is_stale():
+                close_old_connections()
+                self.flush()
+
+
+_recorder = None
+
+
+def get_recorder():
+    global _recorder
+    if _recorder is None:
+        enabled = getattr(settings, "EXECUTION_RECORDER_ENABLED", True)
+        if enabled and connection.features.can_return_rows_from_bulk_insert:
+            _recorder = BufferedExecutionRecorder(
+                max_batch=getattr(settings, "EXECUTION_RECORDER_MAX_BATCH", 200),
+                max_delay=getattr(settings, "EXECUTION_RECORDER_MAX_DELAY", 2.0),
+            )
+        else:
+            _recorder = DirectExecutionRecorder()
+    return _recorder
+
+
+def flush_recorder(**kwargs):
+    if _recorder is not None:
+        _recorder.flush()
+
+
+worker_process_shutdown.connect(flush_recorder, weak=False)
+worker_shutdown.connect(flush_recorder, weak=False)
+atexit.register(flush_recorder)
@@ -0,0 +1,105 @@
+import gzip
+import json
+import os
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from django.utils import timezone
+
+from .logstore import load_logs_many
+from .models import Execution
+from .task_registry import REGISTRY
+
+
+def retention_policies():
+    default = settings.EXECUTION_RETENTION_DAYS
+    return {name: int(meta.get("retention_days", default)) for name, meta in REGISTRY.items()}
+
+
+def retention_cutoffs(now=None):
+    """Cutoff per task name; ``None`` holds the default for tasks no longer in the registry."""
+    now = now or timezone.now()
+    cutoffs = {name: now - timedelta(days=days) for name, days in retention_policies().items()}
+    cutoffs[None] = now - timedelta(days=settings.EXECUTION_RETENTION_DAYS)
+    return cutoffs
+
+
+def expired_executions(cutoffs):
+    match = Q(started_at__lt=cutoffs[None]) & ~Q(task_name__in=[n for n in cutoffs if n is not None])
+    for name, cutoff in cutoffs.items():
+        if name is not None:
+            match |= Q(task_name=name, started_at__lt=cutoff)
+    return Execution.objects.filter(match)
+
+
+def archive_fields():
+    return [f.attname for f in Execution._meta.concrete_fields]
+
+
+def attach_logs(rows):
+    logs = load_logs_many([row["id"] for row in rows])
+    for row in rows:
+        row["logs"] = logs.get(row["id"])
+    return rows
+
+
+class ExecutionArchive:
+    """
+    Gzipped JSONL files, one per chunk and day an execution started
+    (``executions-YYYY-MM-DD-<first id>-<last id>.jsonl.gz``). Files are
+    renamed into place whole and a chunk whose file exists is skipped, so
+    writing the same chunk again after a crash adds nothing.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def path_for(self, day, first_id, last_id):
+        return os.path.join(self.directory, f"executions-{day.isoformat()}-{first_id}-{last_id}.jsonl.gz")
+
+    def write(self, rows, first_id, last_id):
+        """Archive the chunk of ids ``first_id..last_id``; returns the number of files written."""
+        by_day = {}
+        for row in rows:
+            by_day.setdefault(row["started_at"].date(), []).append(row)
+        written = 0
+        for day, day_rows in by_day.items():
+            path = self.path_for(day, first_id, last_id)
+            if os.path.exists(path):
+                continue
+            tmp = f"{path}.tmp"
+            with gzip.open(tmp, "wt", encoding="utf-8") as fh:
+                for row in day_rows:
+                    fh.write(json.dumps(row, cls=DjangoJSONEncoder, separators=(",", ":")))
+                    fh.write("\n")
+            os.replace(tmp, path)
+            written += 1
+        return written
+
+
+class Checkpoint:
+    def __init__(self, directory):
+        self.path = os.path.join(directory, ".prune_checkpoint.json")
+
+    def load(self):
+        try:
+            with open(self.path, encoding="utf-8") as fh:
+                return json.load(fh)
+        except FileNotFoundError:
+            return None
+
+    def save(self, state):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(state, fh, cls=DjangoJSONEncoder)
+        os.replace(tmp, self.path)
+
+    def clear(self):
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,227 @@
+from datetime import timedelta
+
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import Execution, ExecutionRollup
+from .sketch import QuantileSketch
+
+GRANULARITIES = (ExecutionRollup.Granularity.HOUR, ExecutionRollup.Granularity.DAY)
+FINISHED_STATUSES = {Execution.ExecStatus.SUCCESS, Execution.ExecStatus.FAILURE}
+MATCH_CHUNK = 250
+
+
+def bucket_start(ts, granularity):
+    ts = timezone.localtime(ts)
+    ts = ts.replace(minute=0, second=0, microsecond=0)
+    if granularity == ExecutionRollup.Granularity.DAY:
+        ts = ts.replace(hour=0)
+    return ts
+
+
+class _Delta:
+    __slots__ = ("runs", "success", "failure", "max_ms", "sketch")
+
+    def __init__(self):
+        self.runs = self.success = self.failure = 0
+        self.max_ms = None
+        self.sketch = QuantileSketch()
+
+    def add(self, ex):
+        self.runs += 1
+        if ex.status == Execution.ExecStatus.SUCCESS:
+            self.success += 1
+        elif ex.status == Execution.ExecStatus.FAILURE:
+            self.failure += 1
+        # Cache hits took no real work; like the runtime histogram, keep them out of the runtime stats.
+        if ex.runtime_ms is not None and not ex.cache_hit:
+            self.sketch.add(ex.runtime_ms)
+            self.max_ms = ex.runtime_ms if self.max_ms is None else max(self.max_ms, ex.runtime_ms)
+
+
+def _deltas(executions):
+    deltas = {}
+    for ex in executions:
+        if ex.status not in FINISHED_STATUSES:
+            continue
+        for gran in GRANULARITIES:
+            start = bucket_start(ex.started_at, gran)
+            for scope in (ex.schedule_id, None):
+                key = (scope, ex.task_name if scope is None else "", gran, start)
+                delta = deltas.get(key)
+                if delta is None:
+                    delta = deltas[key] = _Delta()
+                delta.add(ex)
+    return deltas
+
+
+def _row_key(row):
+    if row.schedule_id is not None:
+        return (row.schedule_id, "", row.granularity, row.bucket_start)
+    return (None, row.task_name, row.granularity, row.bucket_start)
+
+
+def _bucket_match(keys):
+    match = Q()
+    for scope, task_name, gran, start in keys:
+        if scope is None:
+            match |= Q(schedule__isnull=True, task_name=task_name, granularity=gran, bucket_start=start)
+        else:
+            match |= Q(schedule_id=scope, granularity=gran, bucket_start=start)
+    return match
+
+
+def _merge(row, delta):
+    row.run_count += delta.runs
+    row.success_count += delta.success
+    row.failure_count += delta.failure
+    if delta.max_ms is not None:
+        row.runtime_max_ms = max(row.runtime_max_ms or 0, delta.max_ms)
+    row.runtime_sketch = QuantileSketch.from_dict(row.runtime_sketch).merge(delta.sketch).to_dict()
+    row.updated_at = timezone.now()
+
+
+def _new_row(key, task_names):
+    scope, task_name, gran, start = key
+    return ExecutionRollup(
+        schedule_id=scope,
+        task_name=task_name or task_names[scope],
+        granularity=gran,
+        bucket_start=start,
+    )
+
+
+def _apply_compare_and_swap(deltas, task_names):
+    # SQLite has no row locks: a bucket takes a merge only if its run_count (which every merge raises) is unchanged.
+    keys = list(deltas)
+    existing = {}
+    for i in range(0, len(keys), MATCH_CHUNK):
+        rows = ExecutionRollup.objects.filter(_bucket_match(keys[i:i + MATCH_CHUNK]))
+        existing.update((_row_key(row), row) for row in rows)
+    for key, delta in deltas.items():
+        row = existing.get(key)
+        while True:
+            if row is None:
+                row = _new_row(key, task_names)
+                _merge(row, delta)
+                try:
+                    with transaction.atomic():
+                        row.save(force_insert=True)
+                    break
+                except IntegrityError:
+                    row = ExecutionRollup.objects.get(_bucket_match([key]))
+                    continue
+            seen = row.run_count
+            _merge(row, delta)
+            won = ExecutionRollup.objects.filter(pk=row.pk, run_count=seen).update(
+                run_count=row.run_count,
+                success_count=row.success_count,
+                failure_count=row.failure_count,
+                runtime_max_ms=row.runtime_max_ms,
+                runtime_sketch=row.runtime_sketch,
+                updated_at=row.updated_at,
+            )
+            if won:
+                break
+            row = ExecutionRollup.objects.get(pk=row.pk)
+
+
+def _apply(deltas, task_names):
+    keys = list(deltas)
+    with transaction.atomic():
+        existing = {}
+        # SQLite nests each OR one level deeper and caps expression depth at 1000.
+        for i in range(0, len(keys), MATCH_CHUNK):
+            rows = ExecutionRollup.objects.select_for_update().filter(_bucket_match(keys[i:i + MATCH_CHUNK]))
+            existing.update((_row_key(row), row) for row in rows)
+        to_update, to_create = [], []
+        for key, delta in deltas.items():
+            row = existing.get(key)
+            if row is None:
+                row = _new_row(key, task_names)
+                to_create.append(row)
+            else:
+                to_update.append(row)
+            _merge(row, delta)
+
+        if to_update:
+            ExecutionRollup.objects.bulk_update(
+                to_update,
+                ["run_count", "success_count", "failure_count", "runtime_max_ms", "runtime_sketch", "updated_at"],
+            )
+        if to_create:
+            ExecutionRollup.objects.bulk_create(to_create)
+
+
+def record_executions(executions):
+    """Fold finished executions into the hourly/daily rollups (per schedule and per task)."""
+    executions = [ex for ex in executions if ex.status in FINISHED_STATUSES]
+    if not executions:
+        return 0
+    task_names = {ex.schedule_id: ex.task_name for ex in executions}
+    deltas = _deltas(executions)
+    if not connection.features.has_select_for_update:
+        _apply_compare_and_swap(deltas, task_names)
+        return len(executions)
+    try:
+        _apply(deltas, task_names)
+    except IntegrityError:
+        # Another worker created one of the new buckets first; it exists now, so merge into it.
+        _apply(deltas, task_names)
+    return len(executions)
+
+
+def summarize(rows):
+    sketch = QuantileSketch()
+    runs = success = failure = 0
+    max_ms = None
+    for row in rows:
+        runs += row.run_count
+        success += row.success_count
+        failure += row.failure_count
+        if row.runtime_max_ms is not None:
+            max_ms = row.runtime_max_ms if max_ms is None else max(max_ms, row.runtime_max_ms)
+        sketch.merge(QuantileSketch.from_dict(row.runtime_sketch))
+    p50, p95 = sketch.quantile(0.5), sketch.quantile(0.95)
+    return {
+        "run_count": runs,
+        "success_count": success,
+        "failure_count": failure,
+        "success_rate": round(success / runs, 4) if runs else None,
+        "p50_ms": round(p50) if p50 is not None else None,
+        "p95_ms": round(p95) if p95 is not None else None,
+        "max_ms": max_ms,
+    }
+
+
+def stats_window(params):
+    """Parse ``granularity``/``since``/``until`` query params into ``(granularity, since, until)``."""
+    gran = params.get("granularity", ExecutionRollup.Granularity.HOUR)
+    if gran not in ExecutionRollup.Granularity.values:
+        raise ValueError("granularity must be 'hour' or 'day'")
+    now = timezone.now()
+    default_span = timedelta(hours=24) if gran == ExecutionRollup.Granularity.HOUR else timedelta(days=30)
+    since = parse_datetime(params["since"]) if params.get("since") else now - default_span
+    until = parse_datetime(params["until"]) if params.get("until") else now
+    if since is None or until is None:
+        raise ValueError("since/until must be ISO-8601 datetimes")
+    if timezone.is_naive(since):
+        since = timezone.make_aware(since)
+    if timezone.is_naive(until):
+        until = timezone.make_aware(until)
+    return gran, bucket_start(since, gran), until
+
+
+def bucket_series(rows):
+    """One summary per bucket_start; rows from several schedules in the same bucket are merged."""
+    grouped = {}
+    for row in rows:
+        grouped.setdefault(row.bucket_start, []).append(row)
+    out = []
+    for start in sorted(grouped):
+        item = {"bucket_start": start}
+        item.update(summarize(grouped[start]))
+        out.append(item)
+    return out
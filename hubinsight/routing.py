@@ -0,0 +1,107 @@
+from django.conf import settings
+
+from .handlers import HANDLERS
+from .task_registry import REGISTRY
+
+RUN_TASK = "hubinsight.tasks.run_predefined_task"
+DEFAULT_QUEUE = "default"
+MAX_PRIORITY = 9
+# Brokers where kombu serves the lowest priority number first (RabbitMQ serves the highest).
+LOW_FIRST_SCHEMES = ("redis", "rediss", "sentinel")
+
+
+def _task_name(args, kwargs):
+    if args and len(args) > 1:
+        return args[1]
+    return (kwargs or {}).get("task_name")
+
+
+def task_meta(task_name):
+    return REGISTRY.get(task_name) or {}
+
+
+def queue_for(task_name):
+    return task_meta(task_name).get("queue", DEFAULT_QUEUE)
+
+
+def time_limits(task_name):
+    """``(hard, soft)`` in seconds, in the order Celery puts them in the ``timelimit`` header."""
+    meta = task_meta(task_name)
+    return meta.get("time_limit"), meta.get("soft_time_limit")
+
+
+def route_task(name, args, kwargs, options, task=None, **kw):
+    """
+    ``task_routes`` entry: send each ``run_predefined_task`` message to its
+    REGISTRY queue with its priority. Beat and the dispatcher both publish
+    through ``apply_async``, so every path is routed the same way.
+    """
+    if name != RUN_TASK:
+        return None
+    meta = task_meta(_task_name(args, kwargs))
+    route = {"queue": meta.get("queue", DEFAULT_QUEUE)}
+    if meta.get("priority") is not None:
+        route["priority"] = broker_priority(meta["priority"])
+    return route
+
+
+def broker_priority(priority, broker_url=None):
+    """REGISTRY priorities mean higher = sooner (RabbitMQ); flip them for brokers that serve low numbers first."""
+    priority = min(MAX_PRIORITY, max(0, int(priority)))
+    url = broker_url if broker_url is not None else getattr(settings, "CELERY_BROKER_URL", "") or ""
+    if url.split("://", 1)[0].split("+", 1)[0] in LOW_FIRST_SCHEMES:
+        return MAX_PRIORITY - priority
+    return priority
+
+
+def apply_time_limits(headers, body):
+    # Routers can't set time limits, so the publish signal writes them into the message header.
+    if headers.get("task") != RUN_TASK:
+        return
+    current = headers.get("timelimit") or (None, None)
+    if any(limit is not None for limit in current):
+        return
+    args, kwargs = (body[0], body[1]) if isinstance(body, (list, tuple)) and len(body) >= 2 else ((), {})
+    hard, soft = time_limits(_task_name(args, kwargs))
+    if hard is not None or soft is not None:
+        headers["timelimit"] = (hard, soft)
+
+
+def queues():
+    names = {DEFAULT_QUEUE: []}
+    for task_name, meta in REGISTRY.items():
+        names.setdefault(meta.get("queue", DEFAULT_QUEUE), []).append(task_name)
+    return names
+
+
+def limits_enforced_in_process(task_name):
+    # The threads pool ignores Celery time limits; only async handlers get them back, from the executor.
+    handler = HANDLERS.get(task_name)
+    return handler is not None and handler.is_async
+
+
+def worker_plan():
+    """
+    One worker per queue. A queue runs on a thread pool as wide as the sum of
+    its tasks' ``concurrency`` only when every task is I/O-bound and any time
+    limit it has is enforced in-process (async handlers); otherwise it gets
+    prefork processes, which enforce Celery's limits, with prefetch 1 for
+    CPU-bound work so a long job never holds others back.
+    """
+    plan = []
+    for queue, task_names in queues().items():
+        metas = [task_meta(name) for name in task_names]
+        cpu = any(meta.get("kind") == "cpu" for meta in metas)
+        unenforced = [
+            name for name in task_names
+            if any(time_limits(name)) and not limits_enforced_in_process(name)
+        ]
+        concurrency = sum(meta.get("concurrency") or 1 for meta in metas) or 1
+        plan.append({
+            "queue": queue,
+            "tasks": task_names,
+            "pool": "prefork" if cpu or unenforced else "threads",
+            "concurrency": concurrency,
+            "prefetch_multiplier": 1 if cpu else 4,
+        })
+    return plan
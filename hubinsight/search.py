@@ -0,0 +1,115 @@
+from functools import reduce
+from importlib import import_module
+from operator import or_
+
+from django.db import connection
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+from rest_framework.filters import SearchFilter
+
+from .models import ScheduleSearch
+from .task_registry import REGISTRY
+
+FIELDS = ("task_name", "owner_username", "inputs_text")
+FTS_TABLE = "hubinsight_schedule_fts"
+# The trigram tokenizer can't match shorter terms; those fall back to LIKE on the narrow search table.
+MIN_TRIGRAM = 3
+
+_fts_ready = {}
+
+
+def search_inputs(task_name):
+    return REGISTRY.get(task_name, {}).get("search_inputs", ())
+
+
+def document(task_name, username, inputs):
+    """Search columns for one schedule: task name, owner and the task's ``search_inputs`` values."""
+    values = []
+    if isinstance(inputs, dict):
+        values = [str(inputs[k]) for k in search_inputs(task_name) if inputs.get(k) not in (None, "")]
+    return {
+        "task_name": task_name.lower(),
+        "owner_username": username.lower(),
+        "inputs_text": " ".join(values).lower(),
+    }
+
+
+def index_schedules(schedules):
+    """Upsert search rows; reads ``task`` and ``owner``, so pass schedules with them loaded."""
+    rows = [
+        ScheduleSearch(schedule_id=sch.pk, **document(sch.task.name, sch.owner.get_username(), sch.inputs))
+        for sch in schedules
+        if sch.pk is not None
+    ]
+    if rows:
+        ScheduleSearch.objects.bulk_create(
+            rows, update_conflicts=True, unique_fields=["schedule"], update_fields=list(FIELDS)
+        )
+    return len(rows)
+
+
+def reindex_owner(user):
+    username = user.get_username().lower()
+    ScheduleSearch.objects.filter(schedule__owner=user).exclude(owner_username=username).update(
+        owner_username=username
+    )
+
+
+def reindex_task(task):
+    name = task.name.lower()
+    ScheduleSearch.objects.filter(schedule__task=task).exclude(task_name=name).update(task_name=name)
+
+
+def install_index(conn):
+    """
+    (Re)create the backend's substring index over ``ScheduleSearch``. The
+    DDL lives only in migration 0012; this reruns its idempotent
+    ``create_index`` step, e.g. after a table rebuild dropped the triggers.
+    """
+    migration = import_module("hubinsight.migrations.0012_schedule_search")
+    with conn.schema_editor() as schema_editor:
+        migration.create_index(None, schema_editor)
+    _fts_ready.pop(conn.alias, None)
+
+
+def _use_fts():
+    if connection.vendor != "sqlite":
+        return False
+    if connection.alias not in _fts_ready:
+        _fts_ready[connection.alias] = FTS_TABLE in connection.introspection.table_names()
+    return _fts_ready[connection.alias]
+
+
+def _phrase(term):
+    return '"%s"' % term.replace('"', '""')
+
+
+def matching_ids(terms, fields=FIELDS):
+    """
+    Ids of schedules whose indexed ``fields`` contain every term, as
+    case-insensitive substrings (the ``icontains`` semantics of the join
+    scans this replaces). Use as ``pk__in=``.
+    """
+    terms = [t.lower() for t in terms if t]
+    qs = ScheduleSearch.objects.all()
+    if _use_fts():
+        long_terms = [t for t in terms if len(t) >= MIN_TRIGRAM]
+        terms = [t for t in terms if len(t) < MIN_TRIGRAM]
+        if long_terms:
+            scope = "{%s}" % " ".join(fields)
+            match = " AND ".join(f"{scope} : {_phrase(t)}" for t in long_terms)
+            qs = qs.filter(pk__in=RawSQL(f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [match]))
+    for term in terms:
+        # Stored lower-cased, so a plain LIKE is what the Postgres trigram index serves.
+        qs = qs.filter(reduce(or_, (Q(**{f"{field}__contains": term}) for field in fields)))
+    return qs.values("pk")
+
+
+class IndexedSearchFilter(SearchFilter):
+    """``?search=`` over the schedule search index instead of LIKE scans across task/owner joins."""
+
+    def filter_queryset(self, request, queryset, view):
+        terms = self.get_search_terms(request)
+        if not terms:
+            return queryset
+        return queryset.filter(pk__in=matching_ids(terms))
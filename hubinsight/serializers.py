@@ -2,7 +2,10 @@ import logging
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
 from .models import PredefinedTask, Schedule, Execution
-from .validators import validate_inputs
+from .validators import get_task_validator
+from .logstore import load_logs
+from .profiling import TimedSerializerMixin
+from .quotas import apply_status_change, limit_for
 from .services import validate_cron_5_detailed, compute_next_run_at
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 
@@ -10,7 +13,7 @@ logger = logging.getLogger(__name__)
 User = get_user_model()
 
 
-class UserCreateSerializer(serializers.ModelSerializer):
+class UserCreateSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     password = serializers.CharField(write_only=True)
 
     class Meta:
@@ -41,16 +44,32 @@ class UserCreateSerializer(serializers.ModelSerializer):
         return user
 
 
-class PredefinedTaskSerializer(serializers.ModelSerializer):
+class PredefinedTaskSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = PredefinedTask
         fields = ["id", "name", "description", "inputs_schema", "is_schedulable"]
 
 
-class ScheduleCreateSerializer(serializers.ModelSerializer):
+class PredefinedTaskField(serializers.PrimaryKeyRelatedField):
+    # Bulk requests pre-load every referenced task into context["task_cache"].
+    def to_internal_value(self, data):
+        cache = self.context.get("task_cache")
+        if cache is None:
+            return super().to_internal_value(data)
+        try:
+            return cache[int(data)]
+        except KeyError:
+            self.fail("does_not_exist", pk_value=data)
+        except (TypeError, ValueError):
+            self.fail("incorrect_type", data_type=type(data).__name__)
+
+
+class ScheduleCreateSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    task = PredefinedTaskField(queryset=PredefinedTask.objects.all())
+
     class Meta:
         model = Schedule
-        fields = ["id", "task", "cron_expression", "inputs", "status"]
+        fields = ["id", "task", "cron_expression", "inputs", "status", "overlap_policy"]
 
     def validate(self, attrs):
         task = attrs.get("task")
@@ -72,26 +91,23 @@ class ScheduleCreateSerializer(serializers.ModelSerializer):
             )
             raise serializers.ValidationError({"task": "This task is not schedulable."})
 
-        errs = validate_inputs(task.inputs_schema, inputs or {})
+        errs = get_task_validator(task).validate(inputs or {})
         if errs:
             logger.warning("schedule_create_invalid_inputs", extra={"task": task.id, "errors_count": len(errs)})
             raise serializers.ValidationError({"inputs": errs})
 
-        user = self.context["request"].user
-        new_status = attrs.get("status", Schedule.Status.ENABLED)
-        if not user.is_superuser and new_status == Schedule.Status.ENABLED:
-            active_count = Schedule.objects.filter(
-                owner=user, status=Schedule.Status.ENABLED, deleted_at__isnull=True
-            ).count()
-            if active_count >= 5:
-                logger.warning("schedule_create_rate_limited", extra={"owner": user.id, "active_count": active_count})
-                raise serializers.ValidationError("You can not have more than 5 active jobs.")
-
         return attrs
 
     def create(self, validated_data):
-        validated_data["owner"] = self.context["request"].user
+        user = self.context["request"].user
+        validated_data["owner"] = user
         validated_data["next_run_at"] = compute_next_run_at(validated_data["cron_expression"])
+        # O(1) conditional increment on ScheduleQuota; callers run this inside a transaction.
+        new_status = validated_data.get("status", Schedule.Status.ENABLED)
+        if not apply_status_change(user.id, None, new_status, enforce=not user.is_superuser):
+            limit = limit_for(user.id)
+            logger.warning("schedule_create_rate_limited", extra={"owner": user.id, "limit": limit})
+            raise serializers.ValidationError(f"You can not have more than {limit} active jobs.")
         obj = super().create(validated_data)
         logger.info(
             "schedule_created",
@@ -105,7 +121,7 @@ class ScheduleCreateSerializer(serializers.ModelSerializer):
         return obj
 
 
-class ScheduleSerializer(serializers.ModelSerializer):
+class ScheduleSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     task_name = serializers.CharField(source="task.name", read_only=True)
     owner_username = serializers.CharField(source="owner.username", read_only=True)
 
@@ -120,18 +136,23 @@ class ScheduleSerializer(serializers.ModelSerializer):
             "cron_expression",
             "inputs",
             "status",
+            "overlap_policy",
             "created_at",
             "last_run_at",
             "next_run_at",
+            "fire_at",
+            "last_fired_at",
             "deleted_at",
         ]
-        read_only_fields = ["id", "owner", "created_at", "last_run_at", "next_run_at", "deleted_at"]
+        read_only_fields = [
+            "id", "owner", "created_at", "last_run_at", "next_run_at", "fire_at", "last_fired_at", "deleted_at"
+        ]
 
 
-class ScheduleUpdateSerializer(serializers.ModelSerializer):
+class ScheduleUpdateSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Schedule
-        fields = ["cron_expression", "inputs", "status"]
+        fields = ["cron_expression", "inputs", "status", "overlap_policy"]
 
     def validate(self, attrs):
         sch: Schedule = self.instance
@@ -145,29 +166,26 @@ class ScheduleUpdateSerializer(serializers.ModelSerializer):
             logger.warning("schedule_update_invalid_cron", extra={"schedule_id": sch.id, "cron": cron})
             raise serializers.ValidationError({"cron_expression": msg})
 
-        errs = validate_inputs(sch.task.inputs_schema, inputs or {})
+        errs = get_task_validator(sch.task).validate(inputs or {})
         if errs:
             logger.warning("schedule_update_invalid_inputs", extra={"schedule_id": sch.id, "errors_count": len(errs)})
             raise serializers.ValidationError({"inputs": errs})
 
-        new_status = attrs.get("status", sch.status)
-        user = self.context["request"].user
-        if not user.is_superuser and new_status == Schedule.Status.ENABLED:
-            active_count = Schedule.objects.filter(
-                owner=user, status=Schedule.Status.ENABLED, deleted_at__isnull=True
-            ).exclude(pk=sch.pk).count()
-            if active_count >= 5:
-                logger.warning("schedule_update_rate_limited", extra={"owner": user.id, "active_count": active_count})
-                raise serializers.ValidationError("You can not have more than 5 active jobs.")
-
         return attrs
 
     def update(self, instance, validated_data):
+        user = self.context["request"].user
+        new_status = validated_data.get("status", instance.status)
+        if not apply_status_change(instance.owner_id, instance.status, new_status, enforce=not user.is_superuser):
+            limit = limit_for(instance.owner_id)
+            logger.warning("schedule_update_rate_limited", extra={"owner": instance.owner_id, "limit": limit})
+            raise serializers.ValidationError(f"You can not have more than {limit} active jobs.")
         instance.cron_expression = validated_data.get("cron_expression", instance.cron_expression)
         instance.inputs = validated_data.get("inputs", instance.inputs)
         instance.status = validated_data.get("status", instance.status)
+        instance.overlap_policy = validated_data.get("overlap_policy", instance.overlap_policy)
         instance.next_run_at = compute_next_run_at(instance.cron_expression)
-        instance.save(update_fields=["cron_expression", "inputs", "status", "next_run_at"])
+        instance.save(update_fields=["cron_expression", "inputs", "status", "overlap_policy", "next_run_at"])
         logger.info(
             "schedule_updated",
             extra={"schedule_id": instance.id, "status": instance.status},
@@ -175,10 +193,42 @@ class ScheduleUpdateSerializer(serializers.ModelSerializer):
         return instance
 
 
-class ExecutionSerializer(serializers.ModelSerializer):
+class ExecutionSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Execution
-        fields = ["id", "schedule", "task_name", "started_at", "finished_at", "status", "runtime_ms", "logs"]
+        fields = [
+            "id",
+            "schedule",
+            "task_name",
+            "scheduled_for",
+            "enqueued_at",
+            "started_at",
+            "finished_at",
+            "status",
+            "runtime_ms",
+            "cache_hit",
+            "cached_from",
+        ]
+
+
+class ExecutionDetailSerializer(ExecutionSerializer):
+    # Logs come from the ExecutionLog side table, only when the view asks for them.
+    logs = serializers.SerializerMethodField()
+
+    class Meta(ExecutionSerializer.Meta):
+        fields = ExecutionSerializer.Meta.fields + ["logs"]
+
+    def get_fields(self):
+        fields = super().get_fields()
+        if not self.context.get("include_logs"):
+            fields.pop("logs")
+        return fields
+
+    def get_logs(self, obj):
+        # Async views load the logs themselves and pass them in.
+        if "logs" in self.context:
+            return self.context["logs"]
+        return load_logs(obj.pk)
 
 
 class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
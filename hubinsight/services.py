@@ -1,9 +1,12 @@
-from datetime import datetime
-from croniter import croniter
-from django_celery_beat.models import CrontabSchedule, PeriodicTask
+from django_celery_beat.models import CrontabSchedule, PeriodicTask, PeriodicTasks
+from django.conf import settings
+from django.db.models import Q
 from django.utils import timezone
 import json
 from .models import Schedule
+from .cron import compile_cron, next_run_at, next_runs
+from .listcache import bump_schedule_versions
+from .smoothing import plan_fire_times
 
 def validate_cron_5_detailed(cron: str):
     if not isinstance(cron, str) or cron.strip() == "":
@@ -12,50 +15,101 @@ def validate_cron_5_detailed(cron: str):
     if len(parts) != 5:
         return False, "Cron must have exactly 5 fields: minute hour day month dow"
     try:
-        croniter(cron, timezone.now())
+        compile_cron(cron)
         return True, None
     except Exception as e:
         return False, f"Invalid cron: {e}"
 
 
-def compute_next_run_at(cron: str):
-    base = timezone.now()
-    itr = croniter(cron, base)
-    next_dt = itr.get_next(datetime)
-    if timezone.is_naive(next_dt):
-        next_dt = timezone.make_aware(next_dt, timezone.get_current_timezone())
-    return next_dt
+def compute_next_run_at(cron: str, base=None):
+    return next_run_at(cron, base=base)
+
+
+def uses_beat():
+    return getattr(settings, "SCHEDULE_DISPATCH_MODE", "beat") != "dispatcher"
 
 
 def ensure_periodic_task(schedule: Schedule):
-    m, h, dom, mon, dow = schedule.cron_expression.split()
-    crontab, _ = CrontabSchedule.objects.get_or_create(
-        minute=m,
-        hour=h,
-        day_of_month=dom,
-        month_of_year=mon,
-        day_of_week=dow,
-        timezone=str(timezone.get_current_timezone()),
-    )
-
-    args = [schedule.id, schedule.task.name, schedule.inputs]
-    name = f"schedule:{schedule.id}:{schedule.task.name}"
-    defaults = dict(
-        crontab=crontab,
-        task="hubinsight.tasks.run_predefined_task",
-        args=json.dumps(args),
-        enabled=(schedule.status == Schedule.Status.ENABLED),
-    )
-
-    if schedule.beat_periodic_task_id:
-        PeriodicTask.objects.filter(id=schedule.beat_periodic_task_id).update(**defaults, name=name)
-    else:
-        pt = PeriodicTask.objects.create(name=name, **defaults)
-        schedule.beat_periodic_task_id = pt.id
+    sync_periodic_tasks([schedule])
 
-    try:
-        schedule.next_run_at = compute_next_run_at(schedule.cron_expression)
-    except Exception:
-        schedule.next_run_at = None
 
-    schedule.save(update_fields=["beat_periodic_task_id", "next_run_at"])
+def _get_or_create_crontabs(cron_expressions):
+    tz = str(timezone.get_current_timezone())
+    wanted = {tuple(cron.split()) for cron in cron_expressions}
+    if not wanted:
+        return {}
+
+    match = Q()
+    for m, h, dom, mon, dow in wanted:
+        match |= Q(minute=m, hour=h, day_of_month=dom, month_of_year=mon, day_of_week=dow)
+
+    found = {}
+    for ct in CrontabSchedule.objects.filter(match, timezone=tz).order_by("id"):
+        found.setdefault((ct.minute, ct.hour, ct.day_of_month, ct.month_of_year, ct.day_of_week), ct)
+
+    missing = [
+        CrontabSchedule(minute=m, hour=h, day_of_month=dom, month_of_year=mon, day_of_week=dow, timezone=tz)
+        for (m, h, dom, mon, dow) in wanted - found.keys()
+    ]
+    for ct in CrontabSchedule.objects.bulk_create(missing):
+        found[(ct.minute, ct.hour, ct.day_of_month, ct.month_of_year, ct.day_of_week)] = ct
+    return found
+
+
+def sync_periodic_tasks(schedules):
+    """
+    Create/update the beat rows and next_run_at for many schedules with a
+    constant number of queries: identical crontabs are shared, PeriodicTask
+    rows are bulk-inserted/updated and the schedules are bulk-updated.
+    """
+    schedules = list(schedules)
+    if not schedules:
+        return
+
+    # Bulk writes below skip post_save, so cached listings are invalidated here.
+    bump_schedule_versions(sch.owner_id for sch in schedules)
+    upcoming = next_runs((sch.pk, sch.cron_expression) for sch in schedules)
+    for sch in schedules:
+        sch.next_run_at = upcoming[sch.pk]
+    plan_fire_times(schedules)
+
+    if not uses_beat():
+        # Dispatcher mode fires from fire_at; retire any beat rows left from beat mode.
+        stale = [sch.beat_periodic_task_id for sch in schedules if sch.beat_periodic_task_id]
+        if stale:
+            PeriodicTask.objects.filter(id__in=stale).update(enabled=False)
+            PeriodicTasks.update_changed()
+        Schedule.objects.bulk_update(schedules, ["next_run_at", "fire_at"])
+        return
+
+    crontabs = _get_or_create_crontabs(sch.cron_expression for sch in schedules)
+
+    existing = {
+        pt.id: pt
+        for pt in PeriodicTask.objects.filter(
+            id__in=[sch.beat_periodic_task_id for sch in schedules if sch.beat_periodic_task_id]
+        )
+    }
+    to_create, to_update = [], []
+    for sch in schedules:
+        pt = existing.get(sch.beat_periodic_task_id) or PeriodicTask()
+        pt.name = f"schedule:{sch.id}:{sch.task.name}"
+        pt.crontab = crontabs[tuple(sch.cron_expression.split())]
+        pt.task = "hubinsight.tasks.run_predefined_task"
+        pt.args = json.dumps([sch.id, sch.task.name, sch.inputs])
+        pt.kwargs = json.dumps({"overlap": sch.overlap_policy})
+        pt.enabled = sch.status == Schedule.Status.ENABLED
+        (to_update if pt.pk else to_create).append((sch, pt))
+
+    if to_update:
+        PeriodicTask.objects.bulk_update(
+            [pt for _, pt in to_update], ["name", "crontab", "task", "args", "kwargs", "enabled"]
+        )
+    if to_create:
+        PeriodicTask.objects.bulk_create([pt for _, pt in to_create])
+        for sch, pt in to_create:
+            sch.beat_periodic_task_id = pt.id
+    # Bulk writes skip PeriodicTask's signals, so tell beat to reload explicitly.
+    PeriodicTasks.update_changed()
+
+    Schedule.objects.bulk_update(schedules, ["beat_periodic_task_id", "next_run_at", "fire_at"])
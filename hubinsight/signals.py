@@ -0,0 +1,50 @@
+from celery.signals import before_task_publish
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .listcache import bump_schedule_versions
+from .metrics import stamp_enqueued_at, stamp_scheduled_for
+from .models import PredefinedTask, Schedule
+from .routing import apply_time_limits
+from .search import index_schedules, reindex_owner, reindex_task
+from .validators import invalidate_task_validator
+
+
+@receiver([post_save, post_delete], sender=PredefinedTask)
+def predefined_task_changed(sender, instance, **kwargs):
+    invalidate_task_validator(instance.pk)
+
+
+@receiver(post_save, sender=PredefinedTask)
+def predefined_task_renamed(sender, instance, **kwargs):
+    reindex_task(instance)
+
+
+@receiver([post_save, post_delete], sender=Schedule)
+def schedule_changed(sender, instance, **kwargs):
+    bump_schedule_versions([instance.owner_id])
+
+
+SEARCHED_FIELDS = {"task", "owner", "inputs"}
+
+
+@receiver(post_save, sender=Schedule)
+def schedule_search_sync(sender, instance, created, update_fields=None, **kwargs):
+    if created or update_fields is None or SEARCHED_FIELDS & set(update_fields):
+        index_schedules([instance])
+
+
+@receiver(post_save, sender=get_user_model())
+def owner_renamed(sender, instance, created, update_fields=None, **kwargs):
+    # Logins save last_login only; skip those.
+    if not created and (update_fields is None or sender.USERNAME_FIELD in update_fields):
+        reindex_owner(instance)
+
+
+@before_task_publish.connect(weak=False)
+def task_time_limits(sender=None, headers=None, body=None, **kwargs):
+    if headers is not None:
+        apply_time_limits(headers, body)
+        stamp_enqueued_at(headers)
+        stamp_scheduled_for(headers, body)
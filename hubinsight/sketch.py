@@ -0,0 +1,62 @@
+import math
+
+
+class QuantileSketch:
+    """
+    Mergeable quantile sketch with bounded relative error (DDSketch-style).
+
+    Values are counted in logarithmic buckets: bucket ``i`` covers
+    ``(gamma**(i-1), gamma**i]`` with ``gamma = (1 + a) / (1 - a)``, so any
+    quantile is reported within ``a`` (relative) of the true value. Two
+    sketches merge by adding bucket counts, which lets hourly rollups be
+    combined into daily or global views without touching raw rows.
+    """
+
+    def __init__(self, relative_accuracy=0.01, bins=None, zeros=0):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.bins = {int(k): v for k, v in (bins or {}).items()}
+        self.zeros = zeros
+
+    @property
+    def count(self):
+        return self.zeros + sum(self.bins.values())
+
+    def add(self, value, n=1):
+        if value is None:
+            return
+        if value <= 0:
+            self.zeros += n
+            return
+        key = math.ceil(math.log(value) / self._log_gamma)
+        self.bins[key] = self.bins.get(key, 0) + n
+
+    def merge(self, other):
+        for key, n in other.bins.items():
+            self.bins[key] = self.bins.get(key, 0) + n
+        self.zeros += other.zeros
+        return self
+
+    def quantile(self, q):
+        total = self.count
+        if total == 0:
+            return None
+        rank = q * (total - 1)
+        if rank < self.zeros:
+            return 0.0
+        seen = self.zeros
+        for key in sorted(self.bins):
+            seen += self.bins[key]
+            if seen > rank:
+                return 2 * self.gamma ** key / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.bins) / (self.gamma + 1)
+
+    def to_dict(self):
+        return {"a": self.relative_accuracy, "z": self.zeros, "b": {str(k): v for k, v in self.bins.items()}}
+
+    @classmethod
+    def from_dict(cls, data):
+        if not data:
+            return cls()
+        return cls(relative_accuracy=data.get("a", 0.01), bins=data.get("b"), zeros=data.get("z", 0))
@@ -0,0 +1,118 @@
+import threading
+import time
+import uuid
+import zlib
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .cron import compile_cron
+from .task_registry import REGISTRY
+
+BUCKET_KEY = "hubinsight:dispatch:bucket:%s"
+
+
+def dispatch_policy(task_name):
+    """The task's ``dispatch`` block from ``REGISTRY``: ``jitter`` (seconds), ``rate`` (per second), ``burst``."""
+    return REGISTRY.get(task_name, {}).get("dispatch") or {}
+
+
+def jitter_offset(schedule_id, window):
+    # Stable per schedule: the same row always lands on the same second of the window.
+    if window <= 0:
+        return 0
+    return zlib.crc32(str(schedule_id).encode()) % (int(window) + 1)
+
+
+def fire_time(schedule_id, task_name, cron_expression, next_run_at):
+    """
+    When the dispatcher should actually fire a run nominally due at
+    ``next_run_at``. The offset never reaches the following occurrence, so
+    jitter spreads runs out without ever skipping one.
+    """
+    if next_run_at is None:
+        return None
+    window = dispatch_policy(task_name).get("jitter", 0)
+    if not window:
+        return next_run_at
+    try:
+        following = compile_cron(cron_expression).next_after(next_run_at)
+        window = min(window, int((following - next_run_at).total_seconds()) - 1)
+    except Exception:
+        return next_run_at
+    return next_run_at + timedelta(seconds=jitter_offset(schedule_id, window))
+
+
+def plan_fire_times(schedules):
+    for sch in schedules:
+        sch.fire_at = fire_time(sch.pk, sch.task.name, sch.cron_expression, sch.next_run_at)
+
+
+class TokenBucket:
+    """
+    Token bucket that hands out send delays instead of refusing: a send that
+    finds the bucket empty is booked for when its token will exist, so a burst
+    of due runs is released at ``rate`` per second after the first ``burst``.
+
+    The state (GCRA's theoretical arrival time) lives in the default cache, so
+    every dispatcher process draws on the same budget.
+    """
+
+    LOCK_TIMEOUT = 5  # seconds; a holder that died releases the bucket after this
+
+    def __init__(self, key, rate, burst=1):
+        self.key = BUCKET_KEY % key
+        self.rate = float(rate)
+        self.burst = max(1, int(burst))
+        self.interval = 1.0 / self.rate
+
+    @contextmanager
+    def _locked(self):
+        lock, token = f"{self.key}:lock", uuid.uuid4().hex
+        deadline = time.monotonic() + self.LOCK_TIMEOUT
+        while not cache.add(lock, token, self.LOCK_TIMEOUT) and time.monotonic() < deadline:
+            time.sleep(0.005)
+        try:
+            yield
+        finally:
+            if cache.get(lock) == token:
+                cache.delete(lock)
+
+    def reserve(self, now=None):
+        now = time.time() if now is None else now
+        with self._locked():
+            tat = max(cache.get(self.key) or now, now) + self.interval
+            cache.set(self.key, tat, int(tat - now) + 1)
+        return max(0.0, tat - self.burst * self.interval - now)
+
+
+class DispatchThrottle:
+    """One bucket shared by all dispatchers (``DISPATCH_RATE_LIMIT``) plus one per task that sets ``dispatch.rate``."""
+
+    def __init__(self):
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, key, rate, burst):
+        bucket = self._buckets.get(key)
+        if bucket is None or bucket.rate != rate or bucket.burst != max(1, int(burst)):
+            with self._lock:
+                bucket = self._buckets[key] = TokenBucket(key, rate, burst)
+        return bucket
+
+    def delay_for(self, task_name, now=None):
+        delay = 0.0
+        rate = getattr(settings, "DISPATCH_RATE_LIMIT", None)
+        if rate:
+            burst = getattr(settings, "DISPATCH_RATE_BURST", rate)
+            delay = self._bucket("*", rate, burst).reserve(now)
+        policy = dispatch_policy(task_name)
+        if policy.get("rate"):
+            bucket = self._bucket(task_name, policy["rate"], policy.get("burst", policy["rate"]))
+            delay = max(delay, bucket.reserve(now))
+        return delay
+
+
+throttle = DispatchThrottle()
@@ -2,6 +2,14 @@ REGISTRY = {
     "send_report": {
         "schedulable": True,
         "description": "Send periodic report",
+        "retention_days": 90,
+        "queue": "reports",
+        "priority": 7,
+        "kind": "io",
+        "concurrency": 200,
+        "soft_time_limit": 60,
+        "time_limit": 90,
+        "search_inputs": ["email"],
         "inputs_schema": [
             {"name": "email", "type": "email", "required": True},
             {"name": "days", "type": "int", "required": False, "min": 1, "max": 30},
@@ -10,6 +18,16 @@ REGISTRY = {
     "reindex_search": {
         "schedulable": True,
         "description": "Rebuild search index",
+        "retention_days": 14,
+        "queue": "default",
+        "priority": 5,
+        "kind": "io",
+        "concurrency": 20,
+        "soft_time_limit": 300,
+        "time_limit": 360,
+        "memoize_ttl": 600,
+        "dispatch": {"jitter": 300, "rate": 5, "burst": 20},
+        "search_inputs": ["segment"],
         "inputs_schema": [
             {"name": "segment", "type": "str", "required": False, "enum": ["all", "news", "users"]},
         ],
@@ -17,6 +35,13 @@ REGISTRY = {
     "heavy_etl": {
         "schedulable": False,
         "description": "Heavy ETL (not user-schedulable)",
+        "retention_days": 30,
+        "queue": "etl",
+        "priority": 2,
+        "kind": "cpu",
+        "concurrency": 2,
+        "soft_time_limit": 1800,
+        "time_limit": 2100,
         "inputs_schema": [],
     },
 }
@@ -1,35 +1,103 @@
-import time
+import logging
+from contextlib import nullcontext
 from celery import shared_task
 from django.utils import timezone
-from .models import Execution, Schedule
+from django.utils.dateparse import parse_datetime
+from . import memo, metrics
+from .executor import run_handler
+from .models import Schedule
+from .overlap import ScheduleLease, claim_run, defer_run, idempotency_key, pop_deferred_run
+from .recorder import get_recorder
+from .routing import time_limits
+
+logger = logging.getLogger(__name__)
 
 @shared_task
 def my_ping():
     return "pong"
 
-def _start_execution(schedule_id, task_name):
-    return Execution.objects.create(schedule_id=schedule_id, task_name=task_name)
+def _start_execution(schedule_id, task_name, started=None, **fields):
+    return get_recorder().start(schedule_id, task_name, started=started, **fields)
 
 
 def _finish_execution(ex, status, logs=None, started=None):
-    ex.status = status
-    ex.finished_at = timezone.now()
-    if started:
-        delta = (ex.finished_at - started).total_seconds() * 1000
-        ex.runtime_ms = int(delta)
-    if logs is not None:
-        ex.logs = logs
-    ex.save()
+    get_recorder().finish(ex, status, logs=logs, started=started)
+    metrics.record_run(ex)
 
 @shared_task(bind=True)
-def run_predefined_task(self, schedule_id, task_name, inputs):
+def run_predefined_task(self, schedule_id, task_name, inputs, scheduled_for=None, overlap=Schedule.OverlapPolicy.ALLOW):
+    lease = None
+    if overlap != Schedule.OverlapPolicy.ALLOW:
+        # TTL: the hard limit if there is one (else SCHEDULE_LEASE_TTL); the run renews it while alive.
+        lease = ScheduleLease(schedule_id, ttl=time_limits(task_name)[0] or None)
+        if not lease.acquire():
+            if overlap == Schedule.OverlapPolicy.COALESCE:
+                defer_run(schedule_id, {
+                    "schedule_id": schedule_id,
+                    "task_name": task_name,
+                    "inputs": inputs,
+                    "scheduled_for": scheduled_for,
+                    "overlap": overlap,
+                })
+            metrics.record_skip(task_name, "overlap")
+            logger.info(
+                "execution_overlap",
+                extra={"schedule_id": schedule_id, "policy": overlap, "scheduled_for": scheduled_for},
+            )
+            return
+
+    try:
+        key = idempotency_key(schedule_id, scheduled_for, self.request.id)
+        if not claim_run(key):
+            metrics.record_skip(task_name, "duplicate")
+            logger.warning("execution_duplicate_skipped", extra={"schedule_id": schedule_id, "key": key})
+            return
+        with lease.renewing() if lease is not None else nullcontext():
+            _run(schedule_id, task_name, inputs, scheduled_for, key, metrics.enqueued_at(self.request))
+    finally:
+        if lease is not None:
+            lease.release()
+            follow_up = pop_deferred_run(schedule_id)
+            if follow_up is not None:
+                run_predefined_task.apply_async(kwargs=follow_up)
+
+
+def _run(schedule_id, task_name, inputs, scheduled_for, key, enqueued_at=None):
     started = timezone.now()
-    ex = _start_execution(schedule_id, task_name)
+    fields = {
+        "scheduled_for": parse_datetime(scheduled_for) if scheduled_for else None,
+        "enqueued_at": enqueued_at,
+        "idempotency_key": key,
+    }
+    ttl = memo.memo_ttl(task_name)
+    memo_key = memo.memo_key(task_name, inputs) if ttl else None
+    computing = False
+    if memo_key:
+        hit = memo.lookup(memo_key)
+        if hit is None:
+            computing = memo.acquire(memo_key, time_limits(task_name)[0] or ttl)
+            if not computing:
+                hit = memo.wait_for(memo_key)
+        if hit is not None:
+            ex = _start_execution(
+                schedule_id, task_name, started=started, cache_hit=True, cached_from=hit["execution"], **fields
+            )
+            _finish_execution(ex, "SUCCESS", logs=hit["result"], started=started)
+            get_recorder().touch_schedule(schedule_id, started)
+            return
+
+    # A memoized result points at its execution, so that row needs its id up front.
+    ex = _start_execution(schedule_id, task_name, started=started, immediate=memo_key is not None, **fields)
     try:
-        time.sleep(0.2)
-        result = {"echo": inputs, "ts": started.isoformat()}
+        context = {"schedule_id": schedule_id, "task_name": task_name, "started": started}
+        result = run_handler(task_name, inputs or {}, context)
+        if memo_key:
+            memo.remember(memo_key, ex.pk, result, ttl)
         _finish_execution(ex, "SUCCESS", logs=result, started=started)
     except Exception as e:
         _finish_execution(ex, "FAILURE", logs={"error": str(e)}, started=started)
         raise
-    Schedule.objects.filter(pk=schedule_id).update(last_run_at=started)
+    finally:
+        if computing:
+            memo.release(memo_key)
+    get_recorder().touch_schedule(schedule_id, started)
@@ -1,3 +1,1057 @@
-from django.test import TestCase
+import asyncio
+import csv
+import glob
+import gzip
+import io
+import json
+import logging
+import os
+import shutil
+import socket
+import subprocess
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta, timezone as dt_timezone
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from croniter import croniter
+from celery.exceptions import SoftTimeLimitExceeded
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache, caches
+from django.core.management import call_command
+from django.db import OperationalError, connection
+from django.test import AsyncClient, Client, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django_celery_beat.models import PeriodicTask
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from .catalog import catalog_cache
+from . import cron, dispatcher
+from .dispatcher import dispatch_due
+from .explain import request_plans, scenarios
+from .executor import EventLoopExecutor, run_handler
+from .handlers import Handler
+from .jsonlog import QueueStreamHandler
+from .logstore import TRUNCATION_MARKER, load_logs, store_logs
+from .listcache import page_cache_enabled
+from .metrics import FileMetricsStore
+from .models import Execution, ExecutionRollup, PredefinedTask, Schedule, ScheduleQuota
+from .overlap import ScheduleLease, claim_run
+from .profiling import ProfilingMiddleware, route_stats
+from .recorder import BufferedExecutionRecorder, get_recorder
+from .retention import ExecutionArchive
+from . import rollups, search
+from .routing import RUN_TASK, apply_time_limits, broker_priority, worker_plan
+from .services import sync_periodic_tasks
+from .signals import task_time_limits
+from .smoothing import DispatchThrottle
+from .tasks import run_predefined_task
+from .validators import CompiledSchema, get_task_validator, invalidate_task_validator
+
+User = get_user_model()
+
+
+@override_settings(METRICS_STORE="")
+class HubTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        caches["results"].clear()
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user("owner", password="pass-1234")
+        cls.task = PredefinedTask.objects.create(name="reindex_search")
+        cls.schedule = Schedule.objects.create(owner=cls.owner, task=cls.task, cron_expression="*/5 * * * *")
+
+
+class BufferedRecorderTests(HubTestCase):
+    def recorder(self):
+        # A long max_delay keeps the background timer out of the way; tests flush explicitly.
+        return BufferedExecutionRecorder(max_batch=100, max_delay=3600)
+
+    def test_start_and_finish_between_flushes_insert_once(self):
+        rec = self.recorder()
+        started = timezone.now()
+        ex = rec.start(self.schedule.pk, "reindex_search", started=started)
+        rec.finish(ex, "SUCCESS", logs={"ok": True}, started=started)
+        rec.touch_schedule(self.schedule.pk, started)
+        self.assertEqual(rec.flush(), 2)
+
+        row = Execution.objects.get()
+        self.assertEqual(row.status, "SUCCESS")
+        self.assertTrue(hasattr(row, "log"))
+        self.schedule.refresh_from_db()
+        self.assertEqual(self.schedule.last_run_at, started)
+
+    def test_failed_flush_keeps_events_for_the_next_one(self):
+        rec = self.recorder()
+        started = timezone.now()
+        ex = rec.start(self.schedule.pk, "reindex_search", started=started)
+        rec.finish(ex, "SUCCESS", logs={"ok": True}, started=started)
+        rec.touch_schedule(self.schedule.pk, started)
+
+        with mock.patch.object(Execution.objects, "bulk_create", side_effect=OperationalError("db down")), \
+                self.assertLogs("hubinsight.recorder", "ERROR"):
+            self.assertEqual(rec.flush(), 0)
+        self.assertFalse(Execution.objects.exists())
+        self.assertIsNone(ex.pk)
+        self.assertEqual(rec.pending_count(), 2)
+
+        self.assertEqual(rec.flush(), 2)
+        row = Execution.objects.get()
+        self.assertEqual(row.status, "SUCCESS")
+        self.assertTrue(hasattr(row, "log"))
+        self.schedule.refresh_from_db()
+        self.assertEqual(self.schedule.last_run_at, started)
+
+    def test_events_during_a_failed_flush_are_not_lost(self):
+        rec = self.recorder()
+        ex = rec.start(self.schedule.pk, "reindex_search")
+
+        def fail_after_finish(*args, **kwargs):
+            # Another worker thread finishes the run while the write is in flight.
+            rec.finish(ex, "FAILURE", logs={"error": "boom"})
+            raise OperationalError("db down")
+
+        with mock.patch.object(Execution.objects, "bulk_create", side_effect=fail_after_finish), \
+                self.assertLogs("hubinsight.recorder", "ERROR"):
+            rec.flush()
+        rec.flush()
+        row = Execution.objects.get()
+        self.assertEqual(row.status, "FAILURE")
+        self.assertIsNotNone(row.finished_at)
+
+
+class CronCacheTests(SimpleTestCase):
+    expressions = ["*/5 * * * *", "0 2 * * *", "30 1 * * 0", "15 9-17 * * 1-5", "0 0 29 2 *"]
+    bases = [
+        datetime(2026, 3, 29, 0, 59, tzinfo=dt_timezone.utc),  # Europe/Berlin DST starts at 01:00 UTC
+        datetime(2026, 10, 25, 0, 30, tzinfo=dt_timezone.utc),  # and ends at 01:00 UTC
+        datetime(2026, 12, 31, 23, 59, 30, tzinfo=dt_timezone.utc),
+    ]
+
+    def setUp(self):
+        cron.clear_cache()
+        self.addCleanup(cron.clear_cache)
+
+    def test_matches_plain_croniter(self):
+        for tz_name in ("UTC", "Europe/Berlin"):
+            for expression in self.expressions:
+                for base in self.bases:
+                    local = base.astimezone(cron.compile_cron(expression, tz_name).tz)
+                    with self.subTest(tz=tz_name, expression=expression, base=base):
+                        self.assertEqual(
+                            cron.next_run_at(expression, base=base, tz_name=tz_name),
+                            croniter(expression, local).get_next(datetime),
+                        )
+
+    def test_expressions_compile_once(self):
+        for base in self.bases:
+            cron.next_run_at("*/5 * * * *", base=base, tz_name="UTC")
+        info = cron.cache_info()
+        self.assertEqual((info.misses, info.hits), (1, len(self.bases) - 1))
+
+    def test_next_runs_shares_results_per_expression(self):
+        base = self.bases[0]
+        out = cron.next_runs([(1, "0 2 * * *"), (2, "0 2 * * *"), (3, "not a cron")], base=base, tz_name="UTC")
+        self.assertEqual(out[1], croniter("0 2 * * *", base).get_next(datetime))
+        self.assertEqual(out[2], out[1])
+        self.assertIsNone(out[3])
+        self.assertEqual(cron.cache_info().currsize, 1)
+
+    def test_last_at_or_before_includes_the_base(self):
+        compiled = cron.compile_cron("*/5 * * * *", "UTC")
+        tick = datetime(2026, 10, 18, 2, 5, tzinfo=dt_timezone.utc)
+        self.assertEqual(compiled.last_at_or_before(tick), tick)
+        self.assertEqual(compiled.last_at_or_before(tick + timedelta(minutes=4)), tick)
+
+
+class BulkUpsertTests(HubTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.client.force_authenticate(self.owner)
+
+    def bulk(self, items):
+        return self.client.post("/api/schedules/bulk/", {"items": items}, format="json")
+
+    def test_creates_and_updates_in_one_call(self):
+        resp = self.bulk([
+            {"task": self.task.pk, "cron_expression": "0 * * * *", "inputs": {}},
+            {"id": self.schedule.pk, "cron_expression": "*/10 * * * *"},
+        ])
+        self.assertEqual(resp.status_code, 201, resp.data)
+        self.assertEqual(len(resp.data["created"]), 1)
+        self.schedule.refresh_from_db()
+        self.assertEqual(self.schedule.cron_expression, "*/10 * * * *")
+
+    def test_invalid_ids_are_per_item_errors(self):
+        resp = self.bulk([
+            {"id": [self.schedule.pk], "cron_expression": "0 * * * *"},
+            {"id": True, "cron_expression": "0 * * * *"},
+            {"id": "1", "cron_expression": "0 * * * *"},
+        ])
+        self.assertEqual(resp.status_code, 400)
+        self.assertEqual([e["index"] for e in resp.data["errors"]], [0, 1, 2])
+        for error in resp.data["errors"]:
+            self.assertIn("id", error["errors"])
+        self.schedule.refresh_from_db()
+        self.assertEqual(self.schedule.cron_expression, "*/5 * * * *")
+
+    def test_repeated_ids_are_rejected(self):
+        resp = self.bulk([
+            {"id": self.schedule.pk, "cron_expression": "0 * * * *"},
+            {"id": self.schedule.pk, "cron_expression": "30 * * * *"},
+        ])
+        self.assertEqual(resp.status_code, 207, resp.data)
+        self.assertEqual(resp.data["errors"], [{"index": 1, "errors": {"id": ["Duplicate id in this request."]}}])
+        self.assertEqual(PeriodicTask.objects.filter(name__startswith=f"schedule:{self.schedule.pk}:").count(), 1)
+        self.schedule.refresh_from_db()
+        self.assertEqual(self.schedule.cron_expression, "0 * * * *")
+
+    @override_settings(SCHEDULE_ACTIVE_LIMIT=2)
+    def test_repeated_disables_free_one_slot(self):
+        second = Schedule.objects.create(owner=self.owner, task=self.task, cron_expression="0 * * * *")
+        sync_periodic_tasks([self.schedule, second])
+        create = {"task": self.task.pk, "cron_expression": "0 * * * *", "inputs": {}}
+        resp = self.bulk([
+            {"id": self.schedule.pk, "status": "DISABLED"},
+            {"id": self.schedule.pk, "status": "DISABLED"},
+            create,
+            create,
+        ])
+        self.assertEqual(resp.status_code, 207, resp.data)
+        self.assertEqual(len(resp.data["created"]), 1)
+        active = Schedule.objects.filter(owner=self.owner, status="ENABLED").count()
+        self.assertEqual(active, 2)
+        self.assertEqual(ScheduleQuota.objects.get(owner=self.owner).active_count, active)
+
+    def test_other_owners_schedules_are_not_found(self):
+        other = User.objects.create_user("other", password="pass-1234")
+        theirs = Schedule.objects.create(owner=other, task=self.task, cron_expression="0 * * * *")
+        resp = self.bulk([{"id": theirs.pk, "status": "DISABLED"}])
+        self.assertEqual(resp.status_code, 400)
+        self.assertEqual(resp.data["errors"][0]["errors"], {"id": ["Not found."]})
+
+
+class ValidatorTests(HubTestCase):
+    schema = [
+        {"name": "count", "type": "int", "min": 1, "max": 10, "required": True},
+        {"name": "email", "type": "email"},
+        {"name": "day", "type": "date"},
+        {"name": "mode", "type": "str", "enum": ["fast", "full"]},
+        {"name": "note"},
+    ]
+
+    def setUp(self):
+        super().setUp()
+        invalidate_task_validator()
+        self.addCleanup(invalidate_task_validator)
+
+    def test_checks_each_field_type(self):
+        compiled = CompiledSchema(self.schema)
+        self.assertEqual(compiled.validate({"count": 3, "email": "a@b.io", "day": "2026-10-18", "mode": "fast"}), {})
+        errors = compiled.validate({"count": 11, "email": "nope", "day": "18/10/2026", "mode": "slow", "note": 1})
+        self.assertTrue(errors.pop("day").startswith("invalid("))
+        self.assertEqual(errors, {"count": "invalid(max)", "email": "invalid(email)", "mode": "invalid(enum)"})
+        self.assertEqual(compiled.validate_many([{}, {"count": 0}]), [{"count": "required"}, {"count": "invalid(min)"}])
+
+    def test_task_validators_recompile_when_the_task_changes(self):
+        self.task.inputs_schema = self.schema
+        self.task.save()
+        first = get_task_validator(self.task)
+        self.assertIs(get_task_validator(PredefinedTask.objects.get(pk=self.task.pk)), first)
+        self.task.inputs_schema = []
+        self.task.save()
+        second = get_task_validator(self.task)
+        self.assertIsNot(second, first)
+        self.assertEqual(second.validate({}), {})
+
+    def test_schedule_inputs_are_validated(self):
+        self.task.inputs_schema = self.schema
+        self.task.save()
+        client = APIClient()
+        client.force_authenticate(self.owner)
+        resp = client.post(
+            "/api/schedules/",
+            {"task": self.task.pk, "cron_expression": "0 * * * *", "inputs": {"count": 0}},
+            format="json",
+        )
+        self.assertEqual(resp.status_code, 400)
+        self.assertEqual(resp.data["inputs"], {"count": "invalid(min)"})
+
+
+class ScheduleListCacheTests(HubTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.client.force_authenticate(self.owner)
+
+    def use_shared_cache(self):
+        # A file-based cache is visible to every process on the host, like Redis.
+        location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, location, ignore_errors=True)
+        shared = override_settings(CACHES={
+            "default": {"BACKEND": "django.core.cache.backends.filebased.FileBasedCache", "LOCATION": location},
+            "results": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+        })
+        shared.enable()
+        self.addCleanup(shared.disable)
+
+    def crons(self, client):
+        return [row["cron_expression"] for row in client.get("/api/schedules/").json()["results"]]
+
+    def test_process_local_cache_is_not_used(self):
+        self.assertFalse(page_cache_enabled())
+        self.crons(self.client)
+        # A write another process made: it can not bump this process's LocMem versions.
+        Schedule.objects.filter(pk=self.schedule.pk).update(cron_expression="0 * * * *")
+        self.assertEqual(self.crons(self.client), ["0 * * * *"])
+
+    def test_superuser_bulk_update_invalidates_the_owners_pages(self):
+        self.use_shared_cache()
+        self.assertTrue(page_cache_enabled())
+        self.assertEqual(self.crons(self.client), ["*/5 * * * *"])
+        # Without a version bump the owner keeps getting the cached page.
+        Schedule.objects.filter(pk=self.schedule.pk).update(cron_expression="15 * * * *")
+        self.assertEqual(self.crons(self.client), ["*/5 * * * *"])
+
+        admin = APIClient()
+        admin.force_authenticate(User.objects.create_superuser("admin", password="pass-1234"))
+        with self.captureOnCommitCallbacks(execute=True):
+            resp = admin.post(
+                "/api/schedules/bulk/", {"items": [{"id": self.schedule.pk, "cron_expression": "0 * * * *"}]},
+                format="json",
+            )
+        self.assertEqual(resp.status_code, 200, resp.data)
+        self.assertEqual(self.crons(self.client), ["0 * * * *"])
+        self.assertEqual(self.crons(admin), ["0 * * * *"])
+
+
+class HandlerTimeoutTests(SimpleTestCase):
+    def hanging_handler(self, cancelled):
+        async def hang(inputs, context):
+            try:
+                await asyncio.sleep(60)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+        return Handler("send_report", hang)
+
+    def test_event_loop_cancels_a_hung_coroutine(self):
+        cancelled = threading.Event()
+        with self.assertRaises(SoftTimeLimitExceeded):
+            EventLoopExecutor().run(self.hanging_handler(cancelled), {}, {}, timeout=0.05)
+        self.assertTrue(cancelled.wait(1))
+
+    @override_settings(TASK_HANDLER_MODE="inline")
+    def test_inline_mode_applies_the_soft_limit(self):
+        cancelled = threading.Event()
+        handler = self.hanging_handler(cancelled)
+        with mock.patch("hubinsight.executor.get_handler", return_value=handler), \
+                mock.patch("hubinsight.executor.time_limits", return_value=(1, 0.05)):
+            with self.assertRaises(SoftTimeLimitExceeded):
+                run_handler("send_report", {}, {})
+        self.assertTrue(cancelled.is_set())
+
+
+@override_settings(EXPORT_CHUNK_SIZE=2)
+class ExportTests(HubTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        started = timezone.now()
+        Execution.objects.bulk_create(
+            Execution(
+                schedule=cls.schedule, task_name=cls.task.name, status="SUCCESS",
+                started_at=started - timedelta(minutes=i), runtime_ms=i,
+            )
+            for i in range(5)
+        )
+        other = User.objects.create_user("other", password="pass-1234")
+        theirs = Schedule.objects.create(owner=other, task=cls.task, cron_expression="0 * * * *")
+        Execution.objects.create(schedule=theirs, task_name=cls.task.name, status="SUCCESS", started_at=started)
+
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.client.force_authenticate(self.owner)
+
+    def export(self, url, **params):
+        resp = self.client.get(url, params)
+        self.assertEqual(resp.status_code, 200)
+        self.assertTrue(resp.streaming)
+        chunks = [chunk.decode() for chunk in resp.streaming_content]
+        return resp, chunks
+
+    def test_ndjson_streams_every_row_in_chunks(self):
+        resp, chunks = self.export("/api/schedules/executions/export/")
+        self.assertEqual(resp["Content-Type"], "application/x-ndjson")
+        self.assertEqual(len(chunks), 3)
+        rows = [json.loads(line) for line in "".join(chunks).splitlines()]
+        self.assertEqual([row["runtime_ms"] for row in rows], [0, 1, 2, 3, 4])
+        self.assertEqual({row["schedule_id"] for row in rows}, {self.schedule.pk})
+
+    def test_csv_has_a_header_and_every_row(self):
+        resp, chunks = self.export(f"/api/schedules/{self.schedule.pk}/executions/export/", fmt="csv")
+        self.assertIn('filename="schedule-', resp["Content-Disposition"])
+        rows = list(csv.reader(io.StringIO("".join(chunks))))
+        self.assertEqual(rows[0][:3], ["id", "schedule_id", "task_name"])
+        self.assertEqual(len(rows), 6)
+
+    def test_schedule_export_applies_filters(self):
+        Schedule.objects.create(owner=self.owner, task=self.task, cron_expression="0 * * * *", status="DISABLED")
+        _, chunks = self.export("/api/schedules/export/", status="ENABLED")
+        rows = [json.loads(line) for line in "".join(chunks).splitlines()]
+        self.assertEqual([row["id"] for row in rows], [self.schedule.pk])
+
+    def test_unknown_format_is_rejected(self):
+        self.assertEqual(self.client.get("/api/schedules/export/", {"fmt": "xml"}).status_code, 400)
+
+
+@override_settings(EXECUTION_LOG_MAX_BYTES=65)
+class ExecutionLogTests(HubTestCase):
+    def setUp(self):
+        super().setUp()
+        self.execution = Execution.objects.create(
+            schedule=self.schedule, task_name=self.task.name, status="SUCCESS", started_at=timezone.now()
+        )
+
+    def test_small_logs_round_trip(self):
+        logs = [{"level": "info", "msg": "done"}]
+        store_logs([(self.execution, logs)])
+        self.assertEqual(load_logs(self.execution.pk), logs)
+        self.assertFalse(self.execution.log.truncated)
+
+    def test_truncation_counts_bytes(self):
+        logs = ["é" * 100]
+        store_logs([(self.execution, logs)])
+        stored = load_logs(self.execution.pk)
+        self.assertTrue(stored[TRUNCATION_MARKER])
+        self.assertEqual(stored["original_size"], 204)
+        # '["' plus 31 two-byte characters; the first byte of the 32nd at byte 65 is dropped.
+        self.assertEqual(stored["preview"], '["' + "é" * 31)
+
+    def test_logs_are_served_on_request(self):
+        store_logs([(self.execution, ["ok"])])
+        client = APIClient()
+        client.force_authenticate(self.owner)
+        url = f"/api/executions/{self.execution.pk}/"
+        self.assertNotIn("logs", client.get(url).data)
+        self.assertEqual(client.get(url, {"include": "logs"}).data["logs"], ["ok"])
+
+
+class RoutingTests(SimpleTestCase):
+    def route(self, task_name):
+        router = run_predefined_task.app.amqp.router
+        return router.route({}, RUN_TASK, args=(1, task_name, {}), kwargs={})
+
+    @override_settings(CELERY_BROKER_URL="amqp://guest@localhost//")
+    def test_messages_go_to_the_registry_queue(self):
+        route = self.route("send_report")
+        self.assertEqual(route["queue"].name, "reports")
+        self.assertEqual(route["priority"], 7)
+        self.assertEqual(self.route("unregistered")["queue"].name, "default")
+
+    def test_priorities_flip_for_low_first_brokers(self):
+        self.assertEqual(broker_priority(7, "amqp://localhost"), 7)
+        self.assertEqual(broker_priority(7, "redis://localhost:6379/0"), 2)
+        self.assertEqual(broker_priority(42, "sentinel://localhost"), 0)
+
+    def test_time_limits_are_set_unless_the_caller_chose_some(self):
+        headers = {"task": RUN_TASK}
+        apply_time_limits(headers, ((1, "heavy_etl", {}), {}, {}))
+        self.assertEqual(headers["timelimit"], (2100, 1800))
+        explicit = {"task": RUN_TASK, "timelimit": (5, None)}
+        apply_time_limits(explicit, ((1, "heavy_etl", {}), {}, {}))
+        self.assertEqual(explicit["timelimit"], (5, None))
+
+    def test_cpu_queues_get_prefork_workers(self):
+        plan = {row["queue"]: row for row in worker_plan()}
+        self.assertEqual(
+            (plan["etl"]["pool"], plan["etl"]["prefetch_multiplier"], plan["etl"]["concurrency"]), ("prefork", 1, 2)
+        )
+        self.assertEqual((plan["reports"]["pool"], plan["reports"]["concurrency"]), ("threads", 200))
+
+
+class TaskRunTestCase(HubTestCase):
+    def setUp(self):
+        super().setUp()
+        # Follow-up runs are published with apply_async; run them inline instead of via a broker.
+        conf = run_predefined_task.app.conf
+        eager = conf.task_always_eager
+        conf.task_always_eager = True
+        self.addCleanup(setattr, conf, "task_always_eager", eager)
+
+    def run_task(self, scheduled_for, overlap="ALLOW", schedule=None, inputs=None):
+        run_predefined_task.apply(
+            args=[(schedule or self.schedule).pk, "reindex_search", inputs or {}],
+            kwargs={"scheduled_for": scheduled_for, "overlap": overlap},
+        )
+        get_recorder().flush()
+
+
+class OverlapTests(TaskRunTestCase):
+
+    def test_redelivered_run_executes_once(self):
+        for _ in range(3):
+            self.run_task("2026-10-18T02:00:00+00:00")
+        self.assertEqual(Execution.objects.count(), 1)
+
+    def test_claim_falls_back_to_the_database(self):
+        self.run_task("2026-10-18T02:00:00+00:00")
+        cache.clear()
+        self.assertFalse(claim_run(Execution.objects.get().idempotency_key))
+
+    def test_skip_while_leased_and_coalesce_runs_once_after(self):
+        held = ScheduleLease(self.schedule.pk)
+        self.assertTrue(held.acquire())
+        self.run_task("2026-10-18T02:01:00+00:00", overlap="SKIP")
+        for minute in (2, 3):
+            self.run_task(f"2026-10-18T02:0{minute}:00+00:00", overlap="COALESCE")
+        self.assertFalse(Execution.objects.exists())
+
+        held.release()
+        self.run_task("2026-10-18T02:04:00+00:00", overlap="COALESCE")
+        # The run plus one follow-up for everything deferred while the lease was held.
+        minutes = sorted(ex.scheduled_for.minute for ex in Execution.objects.all())
+        self.assertEqual(minutes, [3, 4])
+
+    def test_lease_is_renewed_while_the_run_lasts(self):
+        lease = ScheduleLease(self.schedule.pk, ttl=1)
+        self.assertTrue(lease.acquire())
+        with lease.renewing(interval=0.2):
+            time.sleep(1.5)
+            self.assertFalse(ScheduleLease(self.schedule.pk).acquire())
+        lease.release()
+        self.assertTrue(ScheduleLease(self.schedule.pk).acquire())
+
+    def test_renew_fails_once_the_lease_is_lost(self):
+        lease = ScheduleLease(self.schedule.pk)
+        lease.acquire()
+        cache.delete(lease.key)
+        self.assertFalse(lease.renew())
+
+
+class MemoTests(TaskRunTestCase):
+    def test_identical_runs_reuse_the_first_result(self):
+        other = Schedule.objects.create(owner=self.owner, task=self.task, cron_expression="0 * * * *")
+        self.run_task("2026-10-18T02:00:00+00:00", inputs={"segment": "news"})
+        self.run_task("2026-10-18T02:00:00+00:00", schedule=other, inputs={"segment": "news"})
+        first, second = Execution.objects.order_by("id")
+        self.assertFalse(first.cache_hit)
+        self.assertTrue(second.cache_hit)
+        self.assertEqual(second.cached_from, first.pk)
+
+    def test_different_inputs_are_computed(self):
+        self.run_task("2026-10-18T02:00:00+00:00", inputs={"segment": "news"})
+        self.run_task("2026-10-18T02:01:00+00:00", inputs={"segment": "users"})
+        self.assertFalse(Execution.objects.filter(cache_hit=True).exists())
+
+
+@override_settings(SCHEDULE_ACTIVE_LIMIT=2)
+class QuotaTests(HubTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.client.force_authenticate(self.owner)
+
+    def create(self, **extra):
+        return self.client.post(
+            "/api/schedules/",
+            {"task": self.task.pk, "cron_expression": "0 * * * *", "inputs": {}, **extra},
+            format="json",
+        )
+
+    def test_enabled_schedules_are_capped(self):
+        self.assertEqual(self.create().status_code, 201)
+        self.assertEqual(self.create().status_code, 400)
+        # Disabled schedules don't count.
+        self.assertEqual(self.create(status="DISABLED").status_code, 201)
+        self.assertEqual(ScheduleQuota.objects.get(owner=self.owner).active_count, 2)
+
+    def test_disabling_frees_a_slot(self):
+        self.assertEqual(self.create().status_code, 201)
+        resp = self.client.patch(f"/api/schedules/{self.schedule.pk}/", {"status": "DISABLED"}, format="json")
+        self.assertEqual(resp.status_code, 200, resp.data)
+        self.assertEqual(self.create().status_code, 201)
+
+    def test_bulk_accepts_only_what_fits(self):
+        item = {"task": self.task.pk, "cron_expression": "0 * * * *", "inputs": {}}
+        resp = self.client.post("/api/schedules/bulk/", {"items": [item, item]}, format="json")
+        self.assertEqual(resp.status_code, 207)
+        self.assertEqual(len(resp.data["created"]), 1)
+        self.assertEqual([e["index"] for e in resp.data["errors"]], [1])
+
+    def test_superuser_bulk_seeds_counters_before_writing(self):
+        other = User.objects.create_user("other", password="pass-1234")
+        theirs = Schedule.objects.create(owner=other, task=self.task, cron_expression="0 * * * *", status="DISABLED")
+        admin = User.objects.create_superuser("admin", password="pass-1234")
+        self.client.force_authenticate(admin)
+        item = {"task": self.task.pk, "cron_expression": "0 * * * *", "inputs": {}}
+        resp = self.client.post(
+            "/api/schedules/bulk/", {"items": [{"id": theirs.pk, "status": "ENABLED"}, item, item]}, format="json"
+        )
+        self.assertEqual(resp.status_code, 201, resp.data)
+        self.assertEqual(ScheduleQuota.objects.get(owner=other).active_count, 1)
+        self.assertEqual(ScheduleQuota.objects.get(owner=admin).active_count, 2)
+
+    def test_delete_before_the_counter_exists(self):
+        second = Schedule.objects.create(owner=self.owner, task=self.task, cron_expression="0 * * * *")
+        self.assertEqual(self.client.delete(f"/api/schedules/{second.pk}/").status_code, 204)
+        self.assertEqual(ScheduleQuota.objects.get(owner=self.owner).active_count, 1)
+
+    def test_superusers_are_not_capped(self):
+        admin = User.objects.create_superuser("admin", password="pass-1234")
+        self.client.force_authenticate(admin)
+        for _ in range(3):
+            self.assertEqual(self.create().status_code, 201)
+
+
+@override_settings(SCHEDULE_LIST_CACHE_TTL=0)
+class QueryPlanTests(HubTestCase):
+    """Every read the listing/detail endpoints issue must use an index on the growing tables."""
+
+    def test_no_endpoint_query_falls_back_to_a_full_scan(self):
+        admin = User.objects.create_superuser("admin", password="pass-1234")
+        execution = Execution.objects.create(schedule=self.schedule, task_name=self.task.name, status="SUCCESS")
+        tokens = {
+            "owner": "Bearer " + str(AccessToken.for_user(self.owner)),
+            "super": "Bearer " + str(AccessToken.for_user(admin)),
+        }
+        for label, who, method, path, body in scenarios(self.schedule, execution, self.task):
+            with self.subTest(label):
+                resp, plans = request_plans(self.client, label, method, path, body, tokens[who])
+                self.assertLess(resp.status_code, 400)
+                self.assertTrue(plans)
+                for plan in plans:
+                    self.assertEqual(plan.full_scans, [], f"{plan.sql}\n" + "\n".join(plan.lines))
+
+
+class LoadBenchTests(HubTestCase):
+    def generate(self, prefix, **counts):
+        call_command("generate_load_data", prefix=prefix, seed=7, stdout=io.StringIO(), **counts)
+        return Schedule.objects.filter(owner__username__startswith=f"{prefix}-").order_by("pk")
+
+    def test_generated_dataset_is_reproducible(self):
+        first = self.generate("a", users=3, schedules=20, executions=50)
+        second = self.generate("b", users=3, schedules=20, executions=50)
+        self.assertEqual(first.count(), 20)
+        self.assertEqual(Execution.objects.filter(schedule__in=first).count(), 50)
+        self.assertEqual(
+            [(s.cron_expression, s.status) for s in first], [(s.cron_expression, s.status) for s in second]
+        )
+        # Derived tables are rebuilt: search rows, quota counters and rollups.
+        self.assertEqual(search.ScheduleSearch.objects.filter(schedule__in=first).count(), 20)
+        for quota in ScheduleQuota.objects.filter(owner__username__startswith="a-"):
+            self.assertEqual(quota.active_count, first.filter(owner=quota.owner_id, status="ENABLED",
+                                                              deleted_at__isnull=True).count())
+        self.assertTrue(ExecutionRollup.objects.filter(schedule__in=first).exists())
+
+    def test_bench_covers_every_route_without_n_plus_one(self):
+        self.generate("load", users=2, schedules=12, executions=30)
+        out = tempfile.NamedTemporaryFile(suffix=".json", delete=False)
+        out.close()
+        self.addCleanup(os.unlink, out.name)
+        stdout = io.StringIO()
+        call_command(
+            "bench_endpoints", requests=1, warmup=0, page_sizes="1,5", output=out.name, stdout=stdout
+        )
+        self.assertIn("Query counts are independent of page size.", stdout.getvalue())
+        with open(out.name) as fh:
+            report = json.load(fh)
+        verdicts = {item["endpoint"]: item["verdict"] for item in report["n_plus_one"]}
+        self.assertEqual(verdicts["GET /schedules/"], "constant")
+        self.assertNotIn("grows", verdicts.values())
+
+
+class CursorPaginationTests(HubTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.client.force_authenticate(self.owner)
+        for _ in range(2):
+            Schedule.objects.create(owner=self.owner, task=self.task, cron_expression="0 * * * *")
+
+    def walk(self, url):
+        ids = []
+        while url:
+            resp = self.client.get(url)
+            self.assertEqual(resp.status_code, 200, resp.content)
+            ids += [row["id"] for row in resp.json()["results"]]
+            url = resp.json()["next"]
+        return ids
+
+    def test_requested_ordering_is_kept_across_pages(self):
+        ids = list(Schedule.objects.order_by("created_at", "id").values_list("id", flat=True))
+        self.assertEqual(self.walk("/api/schedules/?pagination=cursor&page_size=2&ordering=created_at"), ids)
+        self.assertEqual(self.walk("/api/schedules/?pagination=cursor&page_size=2"), ids[::-1])
+
+    def test_unkeyable_ordering_is_rejected(self):
+        resp = self.client.get("/api/schedules/?pagination=cursor&ordering=next_run_at")
+        self.assertEqual(resp.status_code, 400)
+        self.assertIn("ordering", resp.data)
+        resp = self.client.post(
+            "/api/schedules/search/?pagination=cursor", {"ordering": ["last_run_at"]}, format="json"
+        )
+        self.assertEqual(resp.status_code, 400)
+
+
+class DispatcherTests(HubTestCase):
+    def make_due(self, ago=timedelta(seconds=5)):
+        due = timezone.now() - ago
+        Schedule.objects.filter(pk=self.schedule.pk).update(next_run_at=due, fire_at=due)
+        return due
+
+    def test_two_dispatchers_claim_a_due_row_once(self):
+        due = self.make_due()
+        real_advance, raced, other_claimed = dispatcher._advance, [], []
+
+        def advance_after_another_dispatcher(schedule, now):
+            # The second dispatcher read the same due row and wins the update first.
+            if not raced:
+                raced.append(True)
+                other_claimed.append(dispatch_due())
+            return real_advance(schedule, now)
+
+        with mock.patch("hubinsight.dispatcher.enqueue") as enqueue, \
+                mock.patch.object(dispatcher, "_advance", advance_after_another_dispatcher):
+            self.assertEqual(dispatch_due(), 0)
+        self.assertEqual(other_claimed, [1])
+        enqueue.assert_called_once()
+        self.assertEqual(enqueue.call_args.args[1], due)
+
+    def test_missed_runs_are_not_replayed(self):
+        due = self.make_due(ago=timedelta(hours=3))
+        with mock.patch("hubinsight.dispatcher.enqueue") as enqueue:
+            self.assertEqual(dispatch_due(), 1)
+            self.assertEqual(dispatch_due(), 0)
+        enqueue.assert_called_once()
+        self.schedule.refresh_from_db()
+        self.assertGreater(self.schedule.next_run_at, timezone.now())
+        self.assertLess(due, self.schedule.last_fired_at)
+
+    def test_disabled_and_future_rows_are_skipped(self):
+        self.make_due()
+        Schedule.objects.filter(pk=self.schedule.pk).update(status=Schedule.Status.DISABLED)
+        later = timezone.now() + timedelta(minutes=5)
+        Schedule.objects.create(
+            owner=self.owner, task=self.task, cron_expression="*/5 * * * *", next_run_at=later, fire_at=later
+        )
+        with mock.patch("hubinsight.dispatcher.enqueue") as enqueue:
+            self.assertEqual(dispatch_due(), 0)
+        enqueue.assert_not_called()
+
+
+class DispatchThrottleTests(HubTestCase):
+    @override_settings(DISPATCH_RATE_LIMIT=2, DISPATCH_RATE_BURST=1)
+    def test_dispatchers_share_one_budget(self):
+        first, second = DispatchThrottle(), DispatchThrottle()
+        self.assertEqual(first.delay_for("reindex_search", now=1000.0), 0.0)
+        self.assertAlmostEqual(second.delay_for("reindex_search", now=1000.0), 0.5)
+        self.assertAlmostEqual(first.delay_for("reindex_search", now=1000.0), 1.0)
+
+    @override_settings(DISPATCH_RATE_LIMIT=1, DISPATCH_RATE_BURST=1)
+    def test_records_the_actual_fire_time(self):
+        due = timezone.now() - timedelta(seconds=5)
+        Schedule.objects.filter(pk=self.schedule.pk).update(next_run_at=due, fire_at=due)
+        other = Schedule.objects.create(
+            owner=self.owner, task=self.task, cron_expression="*/5 * * * *", next_run_at=due, fire_at=due
+        )
+        with mock.patch("hubinsight.dispatcher.enqueue") as enqueue:
+            self.assertEqual(dispatch_due(), 2)
+        countdowns = [c.kwargs["countdown"] for c in enqueue.call_args_list]
+        self.assertEqual(countdowns[0], 0.0)
+        self.assertGreater(countdowns[1], 0.5)
+        first, second = (Schedule.objects.get(pk=pk) for pk in (self.schedule.pk, other.pk))
+        self.assertGreater(second.last_fired_at - first.last_fired_at, timedelta(seconds=0.5))
+        self.assertGreater(first.next_run_at, due)
+
+
+class QueueStreamHandlerTests(SimpleTestCase):
+    def setUp(self):
+        self.stream = io.StringIO()
+        self.handler = QueueStreamHandler(self.stream)
+        self.handler.setFormatter(logging.Formatter("%(message)s"))
+        self.addCleanup(self.handler.close)
+
+    def test_callers_record_is_left_alone(self):
+        record = logging.LogRecord("hubinsight", logging.INFO, __file__, 1, "run %s", ("42",), None)
+        self.handler.handle(record)
+        self.assertEqual((record.msg, record.args), ("run %s", ("42",)))
+        self.handler.flush()
+        self.assertEqual(self.stream.getvalue(), "run 42\n")
+
+    def test_flush_keeps_the_listener_running(self):
+        record = logging.LogRecord("hubinsight", logging.INFO, __file__, 1, "first", None, None)
+        self.handler.handle(record)
+        self.handler.flush()
+        listener = self.handler._listener
+        self.assertIsNotNone(listener)
+        self.handler.handle(logging.LogRecord("hubinsight", logging.INFO, __file__, 1, "second", None, None))
+        self.handler.flush()
+        self.assertIs(self.handler._listener, listener)
+        self.assertEqual(self.stream.getvalue(), "first\nsecond\n")
+        self.handler.stop()
+        self.assertIsNone(self.handler._listener)
+
+
+class PruneExecutionsTests(HubTestCase):
+    def setUp(self):
+        super().setUp()
+        self.archive_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.archive_dir)
+        old = timezone.now() - timedelta(days=30)
+        Execution.objects.bulk_create(
+            Execution(schedule=self.schedule, task_name=self.task.name, status="SUCCESS", started_at=old)
+            for _ in range(5)
+        )
+
+    def archived_ids(self):
+        ids = []
+        for path in glob.glob(f"{self.archive_dir}/executions-*.jsonl.gz"):
+            with gzip.open(path, "rt") as fh:
+                ids += [json.loads(line)["id"] for line in fh]
+        return sorted(ids)
+
+    def prune(self, *args):
+        call_command("prune_executions", "--archive-dir", self.archive_dir, "--chunk-size", "2", *args, stdout=io.StringIO())
+
+    def test_resume_after_a_crash_does_not_archive_twice(self):
+        ids = sorted(Execution.objects.values_list("pk", flat=True))
+        real_write = ExecutionArchive.write
+        calls = []
+
+        def crash_on_second_chunk(archive, rows, first_id, last_id):
+            calls.append(first_id)
+            real_write(archive, rows, first_id, last_id)
+            if len(calls) == 2:
+                raise KeyboardInterrupt
+
+        with mock.patch("hubinsight.retention.ExecutionArchive.write", crash_on_second_chunk):
+            with self.assertRaises(KeyboardInterrupt):
+                self.prune()
+        self.prune("--resume")
+        self.assertEqual(self.archived_ids(), ids)
+        self.assertFalse(Execution.objects.exists())
+
+
+class MetricsTests(HubTestCase):
+    def publish(self, headers, kwargs):
+        body = ([self.schedule.pk, "reindex_search", {}], kwargs, {})
+        task_time_limits(headers={"task": RUN_TASK, **headers}, body=body)
+        return body[1]
+
+    def test_beat_sends_get_their_cron_tick(self):
+        sent = self.publish({"periodic_task_name": f"schedule:{self.schedule.pk}:reindex_search"}, {})
+        tick = datetime.fromisoformat(sent["scheduled_for"])
+        self.assertLessEqual(tick, timezone.now())
+        self.assertEqual(tick.minute % 5, 0)
+        self.assertEqual((tick.second, tick.microsecond), (0, 0))
+
+    def test_other_sends_are_left_alone(self):
+        self.assertEqual(self.publish({}, {}), {})
+        given = {"scheduled_for": "2026-10-18T02:00:00+00:00"}
+        self.assertEqual(self.publish({"periodic_task_name": "x"}, dict(given)), given)
+
+    def test_dead_processes_are_folded_into_one_file(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        child = subprocess.Popen(["true"])
+        child.wait()
+        host = socket.gethostname()
+        with open(f"{directory}/{host}-{child.pid}.json", "w") as fh:
+            json.dump({"runs": 2}, fh)
+        store = FileMetricsStore(directory)
+        store.incr({"runs": 1})
+        self.assertEqual(store.read(), {"runs": 3})
+        self.assertEqual(
+            sorted(p.rsplit("/", 1)[1] for p in glob.glob(f"{directory}/*.json")),
+            sorted([f"{host}-{os.getpid()}.json", f"{host}-retired.json"]),
+        )
+        self.assertEqual(store.read(), {"runs": 3})
+
+
+class RollupTests(HubTestCase):
+    def execution(self, runtime_ms, cache_hit=False):
+        return Execution(
+            schedule=self.schedule, task_name=self.task.name, status="SUCCESS",
+            started_at=timezone.now(), runtime_ms=runtime_ms, cache_hit=cache_hit,
+        )
+
+    def test_cache_hits_count_as_runs_but_not_runtime(self):
+        rollups.record_executions([self.execution(800), self.execution(1, cache_hit=True)])
+        stats = rollups.summarize(ExecutionRollup.objects.filter(schedule=self.schedule, granularity="hour"))
+        self.assertEqual(stats["run_count"], 2)
+        self.assertEqual(stats["max_ms"], 800)
+        self.assertGreater(stats["p50_ms"], 700)
+
+    def test_concurrent_merges_are_not_lost(self):
+        rollups.record_executions([self.execution(10)])
+        real_merge, raced = rollups._merge, []
+
+        def merge_after_another_writer(row, delta):
+            if not raced:
+                raced.append(True)
+                rollups.record_executions([self.execution(30)])
+            real_merge(row, delta)
+
+        with mock.patch.object(rollups, "_merge", merge_after_another_writer):
+            rollups.record_executions([self.execution(20)])
+        rows = ExecutionRollup.objects.all()
+        self.assertEqual(len(rows), 4)
+        for row in rows:
+            self.assertEqual(row.run_count, 3)
+            self.assertEqual(row.runtime_max_ms, 30)
+
+    def rebuild_queries(self):
+        with CaptureQueriesContext(connection) as ctx:
+            call_command("rebuild_rollups", "--days=1", stdout=io.StringIO())
+        return len(ctx.captured_queries)
+
+    def test_rebuild_does_not_load_fields_per_row(self):
+        Execution.objects.bulk_create([self.execution(800), self.execution(1, cache_hit=True)])
+        queries = self.rebuild_queries()
+        Execution.objects.bulk_create([self.execution(900), self.execution(2, cache_hit=True)])
+        self.assertEqual(self.rebuild_queries(), queries)
+        stats = rollups.summarize(ExecutionRollup.objects.filter(schedule=self.schedule, granularity="hour"))
+        self.assertEqual(stats["run_count"], 4)
+        self.assertEqual(stats["max_ms"], 900)
+
+
+@override_settings(REQUEST_PROFILING=True, REQUEST_PROFILING_SAMPLE_RATE=1.0, REQUEST_PROFILING_DUMP_DIR="")
+class ProfilingMiddlewareTests(HubTestCase):
+    def setUp(self):
+        super().setUp()
+        route_stats.reset()
+        self.addCleanup(route_stats.reset)
+        self.auth = "Bearer " + str(AccessToken.for_user(self.owner))
+
+    def assert_profiled(self, resp, route):
+        self.assertEqual(resp.status_code, 200)
+        timing = resp.headers["Server-Timing"]
+        self.assertRegex(timing, r'db;dur=[0-9.]+;desc="[1-9][0-9]* queries"')
+        self.assertGreater(route_stats.snapshot()[route]["queries"], 0)
+
+    def test_sync_views(self):
+        resp = Client().get("/api/schedules/", HTTP_AUTHORIZATION=self.auth)
+        self.assert_profiled(resp, "GET schedule-list")
+
+    def test_runs_natively_in_an_async_stack(self):
+        async def get_response(request):
+            return None
+
+        self.assertTrue(iscoroutinefunction(ProfilingMiddleware(get_response)))
+        self.assertFalse(iscoroutinefunction(ProfilingMiddleware(lambda request: None)))
+
+    async def test_async_views(self):
+        resp = await AsyncClient().get("/api/async/schedules/", headers={"Authorization": self.auth})
+        self.assert_profiled(resp, "GET hubinsight.async_views.AsyncScheduleList")
+
+
+class CatalogTests(HubTestCase):
+    url = "/api/tasks/predefined/"
+
+    def setUp(self):
+        super().setUp()
+        catalog_cache.clear()
+
+    def test_matching_if_none_match_gets_304(self):
+        first = self.client.get(self.url)
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual([row["name"] for row in first.json()["results"]], ["reindex_search"])
+        again = self.client.get(self.url, headers={"If-None-Match": first["ETag"]})
+        self.assertEqual(again.status_code, 304)
+        self.assertEqual(again["ETag"], first["ETag"])
+        stale = self.client.get(self.url, headers={"If-None-Match": '"not-the-etag"'})
+        self.assertEqual(stale.status_code, 200)
+
+    def test_change_from_another_process_invalidates(self):
+        first = self.client.get(self.url)
+        # A queryset update sends no signals, like a write made by another process.
+        PredefinedTask.objects.filter(pk=self.task.pk).update(
+            description="Rebuild the index.", updated_at=timezone.now() + timedelta(seconds=1)
+        )
+        changed = self.client.get(self.url, headers={"If-None-Match": first["ETag"]})
+        self.assertEqual(changed.status_code, 200)
+        self.assertEqual(changed.json()["results"][0]["description"], "Rebuild the index.")
+        self.assertNotEqual(changed["ETag"], first["ETag"])
+
+    def test_delete_invalidates(self):
+        PredefinedTask.objects.create(name="send_report")
+        first = self.client.get(self.url)
+        self.assertEqual(first.json()["count"], 2)
+        PredefinedTask.objects.filter(name="send_report").delete()
+        self.assertEqual(self.client.get(self.url).json()["count"], 1)
+
+
+class AsyncViewTests(HubTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        other_task = PredefinedTask.objects.create(name="send_report", inputs_schema=[])
+        Schedule.objects.create(
+            owner=cls.owner, task=other_task, cron_expression="0 * * * *", inputs={"email": "ops@example.com"}
+        )
+
+    def setUp(self):
+        super().setUp()
+        self.auth = {"Authorization": "Bearer " + str(AccessToken.for_user(self.owner))}
+        # A fresh process hasn't looked for the FTS table yet.
+        search._fts_ready.clear()
+
+    async def assert_same_as_sync(self, query, path="schedules/"):
+        async_resp = await AsyncClient().get(f"/api/async/{path}{query}", headers=self.auth)
+        sync_resp = await sync_to_async(Client().get)(f"/api/{path}{query}", headers=self.auth)
+        self.assertEqual(sync_resp.status_code, 200)
+        self.assertEqual(async_resp.status_code, 200, async_resp.content)
+        # Only the next/previous links differ, by the api/async/ prefix.
+        self.assertEqual(json.loads(async_resp.content.decode().replace("/api/async/", "/api/")), sync_resp.json())
+        return async_resp.json()
+
+    async def test_list_matches_the_sync_list(self):
+        data = await self.assert_same_as_sync("")
+        self.assertEqual(data["count"], 2)
+
+    async def test_search_matches_the_sync_list(self):
+        data = await self.assert_same_as_sync("?search=reindex")
+        self.assertEqual([row["task_name"] for row in data["results"]], ["reindex_search"])
+        data = await self.assert_same_as_sync("?search=ops@exa")
+        self.assertEqual([row["task_name"] for row in data["results"]], ["send_report"])
+
+    async def test_filters_and_cursor_pages_match(self):
+        await self.assert_same_as_sync(f"?task={self.task.pk}")
+        await self.assert_same_as_sync("?pagination=cursor&page_size=1")
+
+    async def test_executions_and_detail_match(self):
+        ex = await Execution.objects.acreate(
+            schedule=self.schedule, task_name=self.task.name, status="SUCCESS", started_at=timezone.now()
+        )
+        await sync_to_async(store_logs)([(ex, ["done"])])
+        data = await self.assert_same_as_sync("", path=f"schedules/{self.schedule.pk}/executions/")
+        self.assertEqual([row["id"] for row in data["results"]], [ex.pk])
+        data = await self.assert_same_as_sync("?include=logs", path=f"executions/{ex.pk}/")
+        self.assertEqual(data["logs"], ["done"])
+
+    async def test_catalog_matches_and_revalidates(self):
+        catalog_cache.clear()
+        await self.assert_same_as_sync("", path="tasks/predefined/")
+        first = await AsyncClient().get("/api/async/tasks/predefined/")
+        again = await AsyncClient().get("/api/async/tasks/predefined/", headers={"If-None-Match": first["ETag"]})
+        self.assertEqual(again.status_code, 304)
+
+    async def test_access_rules_match(self):
+        other = await User.objects.acreate(username="other")
+        theirs = await Schedule.objects.acreate(owner=other, task=self.task, cron_expression="0 * * * *")
+        ex = await Execution.objects.acreate(schedule=theirs, task_name=self.task.name, started_at=timezone.now())
+        client = AsyncClient()
+        self.assertEqual((await client.get("/api/async/schedules/")).status_code, 401)
+        resp = await client.get(f"/api/async/schedules/{theirs.pk}/executions/", headers=self.auth)
+        self.assertEqual(resp.status_code, 404)
+        self.assertEqual((await client.get(f"/api/async/executions/{ex.pk}/", headers=self.auth)).status_code, 403)
+        self.assertEqual((await client.post("/api/async/schedules/", headers=self.auth)).status_code, 405)
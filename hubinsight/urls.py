@@ -4,8 +4,17 @@ from .views import (
     PredefinedTaskList,
     ScheduleViewSet,
     ExecutionDetail,
+    ExecutionStatsView,
+    MetricsView,
+    ProfilingStatsView,
     UserCreateView,
 )
+from .async_views import (
+    AsyncExecutionDetail,
+    AsyncPredefinedTaskList,
+    AsyncScheduleExecutions,
+    AsyncScheduleList,
+)
 
 router = DefaultRouter()
 router.register(r"schedules", ScheduleViewSet, basename="schedule")
@@ -20,6 +29,21 @@ urlpatterns = [
     # Executions
     path("executions/<int:pk>/", ExecutionDetail.as_view()),
 
+    # Stats (rollups)
+    path("stats/", ExecutionStatsView.as_view()),
+
+    # Prometheus metrics (run lag / queue delay / runtime)
+    path("metrics/", MetricsView.as_view()),
+
+    # Request profiling (REQUEST_PROFILING)
+    path("profiling/", ProfilingStatsView.as_view()),
+
+    # Async (ASGI) read paths
+    path("async/tasks/predefined/", AsyncPredefinedTaskList.as_view()),
+    path("async/schedules/", AsyncScheduleList.as_view()),
+    path("async/schedules/<int:pk>/executions/", AsyncScheduleExecutions.as_view()),
+    path("async/executions/<int:pk>/", AsyncExecutionDetail.as_view()),
+
     # Router
     path("", include(router.urls)),
     
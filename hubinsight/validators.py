@@ -1,36 +1,112 @@
 import re
+import threading
 from datetime import datetime
 
+EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+
 def _is_email(v: str) -> bool:
-    return bool(re.match(r"^[^@\s]+@[^@\s]+\.[^@\s]+$", v or ""))
+    return bool(EMAIL_RE.match(v or ""))
+
+
+def _int_check(field):
+    lo, hi = field.get("min"), field.get("max")
+    has_min, has_max = "min" in field, "max" in field
+
+    def check(val):
+        ival = int(val)
+        if has_min and ival < lo: raise ValueError("min")
+        if has_max and ival > hi: raise ValueError("max")
+    return check
+
+
+def _email_check(field):
+    def check(val):
+        if not _is_email(val): raise ValueError("email")
+    return check
+
+
+def _date_check(field):
+    fmt = field.get("format", "%Y-%m-%d")
+    fmt = fmt if "%" in fmt else "%Y-%m-%d"
+
+    def check(val):
+        datetime.strptime(val, fmt)
+    return check
+
+
+def _str_check(field):
+    if "enum" not in field:
+        return None
+    choices = field["enum"]
+
+    def check(val):
+        if val not in choices: raise ValueError("enum")
+    return check
+
+
+_CHECKS = {"int": _int_check, "email": _email_check, "date": _date_check, "str": _str_check}
+
+
+class CompiledSchema:
+    """
+    An ``inputs_schema`` list turned into per-field check closures once, so
+    validating a payload no longer re-reads the schema dicts or re-dispatches
+    on type strings. Error messages match ``validate_inputs``.
+    """
+
+    __slots__ = ("fields",)
+
+    def __init__(self, schema_list):
+        fields = []
+        for field in schema_list:
+            factory = _CHECKS.get(field.get("type", "str"))
+            fields.append((field["name"], field.get("required", False), factory(field) if factory else None))
+        self.fields = tuple(fields)
+
+    def validate(self, payload: dict):
+        errors = {}
+        get = payload.get
+        for name, required, check in self.fields:
+            val = get(name, None)
+            if val is None:
+                if required:
+                    errors[name] = "required"
+                continue
+            if check is None:
+                continue
+            try:
+                check(val)
+            except Exception as e:
+                errors[name] = f"invalid({e})"
+        return errors
+
+    def validate_many(self, payloads):
+        validate = self.validate
+        return [validate(p or {}) for p in payloads]
+
+
+# task pk -> (updated_at, CompiledSchema); a changed row has a new updated_at and recompiles.
+_task_validators = {}
+_task_validators_lock = threading.Lock()
+
+
+def get_task_validator(task) -> CompiledSchema:
+    cached = _task_validators.get(task.pk)
+    if cached is not None and cached[0] == task.updated_at:
+        return cached[1]
+    compiled = CompiledSchema(task.inputs_schema or [])
+    with _task_validators_lock:
+        _task_validators[task.pk] = (task.updated_at, compiled)
+    return compiled
+
+
+def invalidate_task_validator(pk=None):
+    with _task_validators_lock:
+        if pk is None:
+            _task_validators.clear()
+        else:
+            _task_validators.pop(pk, None)
+
 
 def validate_inputs(schema_list, payload: dict):
-    errors = {}
-    for field in schema_list:
-        name = field["name"]
-        required = field.get("required", False)
-        ftype = field.get("type", "str")
-        val = payload.get(name, None)
-
-        if required and val is None:
-            errors[name] = "required"
-            continue
-
-        if val is None:
-            continue
-
-        try:
-            if ftype == "int":
-                ival = int(val)
-                if "min" in field and ival < field["min"]: raise ValueError("min")
-                if "max" in field and ival > field["max"]: raise ValueError("max")
-            elif ftype == "email":
-                if not _is_email(val): raise ValueError("email")
-            elif ftype == "date":
-                fmt = field.get("format", "%Y-%m-%d")
-                datetime.strptime(val, fmt if "%" in fmt else "%Y-%m-%d")
-            elif ftype == "str":
-                if "enum" in field and val not in field["enum"]: raise ValueError("enum")
-        except Exception as e:
-            errors[name] = f"invalid({e})"
-    return errors
+    return CompiledSchema(schema_list).validate(payload)
@@ -1,41 +1,78 @@
 import logging
-from rest_framework import viewsets, generics
+import os
+from django.conf import settings
+from django.db import transaction
+from rest_framework import viewsets, generics, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
+from django.http import HttpResponse, HttpResponseNotModified
 from django.utils import timezone
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework.filters import OrderingFilter, SearchFilter
+from rest_framework.filters import OrderingFilter
 from rest_framework.permissions import AllowAny, IsAdminUser
 from rest_framework_simplejwt.views import TokenObtainPairView
 
-from .models import PredefinedTask, Schedule, Execution
+from .models import PredefinedTask, Schedule, Execution, ExecutionRollup, ScheduleQuota
 from .serializers import (
     PredefinedTaskSerializer,
     ScheduleCreateSerializer,
     ScheduleSerializer,
     ScheduleUpdateSerializer,
     ExecutionSerializer,
+    ExecutionDetailSerializer,
     UserCreateSerializer,
     CustomTokenObtainPairSerializer
 )
 from .permissions import IsSuperOrOwner
-from .pagination import RoleAwarePageNumberPagination
-from .services import ensure_periodic_task
+from .pagination import RoleAwareKeysetPagination, RoleAwarePageNumberPagination
+from .services import ensure_periodic_task, sync_periodic_tasks
+from .listcache import get_page, page_cache_enabled, put_page, response_key
+from .search import IndexedSearchFilter, index_schedules, matching_ids
+from .quotas import active_limit, ensure_quota, release_active, reserve_active, status_delta
+from .rollups import bucket_series, stats_window, summarize
+from .catalog import CatalogEntry, catalog_cache, catalog_version, etag_matches
+from .metrics import PROMETHEUS_CONTENT_TYPE, IsMetricsScraper, MetricsTokenAuthentication, scrape
+from .profiling import TimedJWTAuthentication, route_stats
+from .export import EXECUTION_EXPORT_FIELDS, EXPORT_FORMATS, SCHEDULE_EXPORT_FIELDS, stream_export
 
 logger = logging.getLogger(__name__)
 
 
+def _is_pk(value):
+    # JSON true/false would pass an int check and address rows 1/0.
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
 class PredefinedTaskList(generics.ListAPIView):
     queryset = PredefinedTask.objects.filter(is_schedulable=True).order_by("name")
     serializer_class = PredefinedTaskSerializer
     permission_classes = [AllowAny]
 
     def list(self, request, *args, **kwargs):
-        resp = super().list(request, *args, **kwargs)
+        # Serve pre-rendered bytes until a task is saved or deleted (catalog version is read from the DB).
+        if getattr(request.accepted_renderer, "format", None) != "json":
+            return super().list(request, *args, **kwargs)
+
+        version = catalog_version()
+        variant = (request.get_host(), request.get_full_path(), bool(request.user and request.user.is_superuser))
+        entry = catalog_cache.get(variant, version)
+        if entry is None:
+            resp = super().list(request, *args, **kwargs)
+            body = request.accepted_renderer.render(resp.data, "application/json", {"request": request})
+            entry = CatalogEntry(version, body, len(resp.data or []))
+            catalog_cache.put(variant, entry)
+
         logger.info(
             "predefined_tasks_listed",
-            extra={"count": len(resp.data or []), "user": getattr(request.user, "id", None)},
+            extra={"count": entry.count, "user": getattr(request.user, "id", None)},
         )
+        if etag_matches(request.headers.get("If-None-Match"), entry.etag):
+            resp = HttpResponseNotModified()
+        else:
+            resp = HttpResponse(entry.body, content_type="application/json")
+        resp["ETag"] = entry.etag
+        resp["Cache-Control"] = "no-cache"
         return resp
 
 
@@ -44,13 +81,31 @@ class ScheduleViewSet(viewsets.ModelViewSet):
     permission_classes = [IsSuperOrOwner]
     pagination_class = RoleAwarePageNumberPagination
 
-    filter_backends = [DjangoFilterBackend, OrderingFilter, SearchFilter]
+    filter_backends = [DjangoFilterBackend, OrderingFilter, IndexedSearchFilter]
     filterset_fields = ["status", "task", "owner", "created_at", "last_run_at", "next_run_at"]
     ordering_fields = ["created_at", "last_run_at", "next_run_at"]
     search_fields = ["task__name", "owner__username"]
 
+    @property
+    def paginator(self):
+        # ?pagination=cursor switches to keyset paging (no COUNT/OFFSET) for deep history.
+        if not hasattr(self, "_paginator"):
+            request = getattr(self, "request", None)
+            if request is not None and request.query_params.get("pagination") == "cursor":
+                self._paginator = RoleAwareKeysetPagination()
+            else:
+                self._paginator = self.pagination_class()
+        return self._paginator
+
+    @property
+    def cursor_ordering(self):
+        if self.action == "executions":
+            return ("-started_at", "-id")
+        return ("-created_at", "-id")
+
     def get_queryset(self):
-        qs = Schedule.objects.filter(deleted_at__isnull=True)
+        # ScheduleSerializer reads task.name and owner.username for every row.
+        qs = Schedule.objects.filter(deleted_at__isnull=True).select_related("task", "owner")
         user = self.request.user
         if not user.is_superuser:
             qs = qs.filter(owner=user)
@@ -71,16 +126,35 @@ class ScheduleViewSet(viewsets.ModelViewSet):
                 "filters": {k: v for k, v in request.query_params.items()},
             },
         )
-        resp = super().list(request, *args, **kwargs)
-        logger.info(
-            "schedules_list_returned",
-            extra={"count": resp.data.get("count", None), "user": getattr(request.user, "id", None)},
-        )
-        return resp
+
+        def build():
+            resp = super(ScheduleViewSet, self).list(request, *args, **kwargs)
+            logger.info(
+                "schedules_list_returned",
+                extra={"count": resp.data.get("count", None), "user": getattr(request.user, "id", None)},
+            )
+            return resp
+
+        return self.cached_page(request, build)
+
+    def cached_page(self, request, build, body=None):
+        # Rendered pages keyed on user, params and the owner's schedule version; writes bump the version.
+        if getattr(request.accepted_renderer, "format", None) != "json" or not page_cache_enabled():
+            return build()
+        key = response_key(request, body)
+        cached = get_page(key)
+        if cached is None:
+            resp = build()
+            if resp.status_code != status.HTTP_200_OK:
+                return resp
+            cached = request.accepted_renderer.render(resp.data, "application/json", {"request": request})
+            put_page(key, cached)
+        return HttpResponse(cached, content_type="application/json")
 
     def perform_create(self, serializer):
-        instance = serializer.save()
-        ensure_periodic_task(instance)
+        with transaction.atomic():
+            instance = serializer.save()
+            ensure_periodic_task(instance)
         logger.info(
             "schedule_created",
             extra={
@@ -92,8 +166,9 @@ class ScheduleViewSet(viewsets.ModelViewSet):
         )
 
     def perform_update(self, serializer):
-        instance = serializer.save()
-        ensure_periodic_task(instance)
+        with transaction.atomic():
+            instance = serializer.save()
+            ensure_periodic_task(instance)
         logger.info(
             "schedule_updated",
             extra={
@@ -105,9 +180,14 @@ class ScheduleViewSet(viewsets.ModelViewSet):
         )
 
     def perform_destroy(self, instance):
-        instance.deleted_at = timezone.now()
-        instance.status = Schedule.Status.DISABLED
-        instance.save(update_fields=["deleted_at", "status"])
+        was_active = instance.status == Schedule.Status.ENABLED and instance.deleted_at is None
+        with transaction.atomic():
+            ensure_quota(instance.owner_id)
+            instance.deleted_at = timezone.now()
+            instance.status = Schedule.Status.DISABLED
+            instance.save(update_fields=["deleted_at", "status"])
+            if was_active:
+                release_active(instance.owner_id)
 
         from django_celery_beat.models import PeriodicTask
 
@@ -135,56 +215,311 @@ class ScheduleViewSet(viewsets.ModelViewSet):
         )
         return self.get_paginated_response(ser.data)
 
-    @action(detail=False, methods=["post"], url_path="search")
-    def advanced_search(self, request):
-        allowed_fields = {
-            "status",
-            "task__name",
-            "task__name__icontains",
-            "owner__username",
-            "created_at",
-            "last_run_at",
-            "next_run_at",
+    @action(detail=False, methods=["post"], url_path="bulk")
+    def bulk(self, request):
+        items = request.data.get("items") if isinstance(request.data, dict) else request.data
+        if not isinstance(items, list) or not items:
+            return Response({"detail": "Expected a non-empty list of schedules."}, status=400)
+        if len(items) > settings.SCHEDULE_BULK_MAX_ITEMS:
+            return Response(
+                {"detail": f"At most {settings.SCHEDULE_BULK_MAX_ITEMS} schedules per request."}, status=400
+            )
+
+        user = request.user
+        dicts = [item for item in items if isinstance(item, dict)]
+        update_ids = {item["id"] for item in dicts if _is_pk(item.get("id"))}
+        task_ids = {item["task"] for item in dicts if _is_pk(item.get("task"))}
+        existing = self.get_queryset().select_related("task", "owner").in_bulk(update_ids)
+        context = {
+            **self.get_serializer_context(),
+            "task_cache": PredefinedTask.objects.in_bulk(task_ids),
         }
-        filters = request.data.get("filters", {}) or {}
-        ordering = request.data.get("ordering", []) or []
 
-        for key in list(filters.keys()):
-            if key not in allowed_fields:
-                filters.pop(key, None)
+        errors, valid = [], []
+        seen_ids = set()
+        for index, item in enumerate(items):
+            if not isinstance(item, dict):
+                errors.append({"index": index, "errors": {"non_field_errors": ["Expected an object."]}})
+                continue
+            if item.get("id") is None:
+                ser = ScheduleCreateSerializer(data=item, context=context)
+            elif not _is_pk(item["id"]):
+                errors.append({"index": index, "errors": {"id": ["A valid integer is required."]}})
+                continue
+            elif item["id"] in seen_ids:
+                # One write per schedule: repeats would double-count quota deltas and beat rows.
+                errors.append({"index": index, "errors": {"id": ["Duplicate id in this request."]}})
+                continue
+            elif item["id"] in existing:
+                seen_ids.add(item["id"])
+                ser = ScheduleUpdateSerializer(existing[item["id"]], data=item, partial=True, context=context)
+            else:
+                errors.append({"index": index, "errors": {"id": ["Not found."]}})
+                continue
+            if ser.is_valid():
+                valid.append((index, ser))
+            else:
+                errors.append({"index": index, "errors": ser.errors})
+
+        now = timezone.now()
+        created, updated = [], []
+        with transaction.atomic():
+            # Seed every affected owner's counter from the real count before the writes below change it.
+            for owner_id in {user.id} | {ser.instance.owner_id for _, ser in valid if ser.instance is not None}:
+                ensure_quota(owner_id)
+            if not user.is_superuser:
+                # Lock the owner's counter so concurrent bulk calls see each other's reservations.
+                quota = ScheduleQuota.objects.select_for_update().get(owner_id=user.id)
+                limit = active_limit(quota)
+                active_count = quota.active_count
+                accepted = []
+                for index, ser in valid:
+                    old = ser.instance.status if ser.instance is not None else None
+                    delta = status_delta(old, ser.validated_data.get("status", old or Schedule.Status.ENABLED))
+                    if delta > 0 and active_count + delta > limit:
+                        errors.append(
+                            {"index": index, "errors": {"non_field_errors": [f"You can not have more than {limit} active jobs."]}}
+                        )
+                        continue
+                    active_count += delta
+                    accepted.append((index, ser))
+                valid = accepted
+
+            deltas = {}
+            for _, ser in valid:
+                if ser.instance is None:
+                    obj = Schedule(owner=user, **ser.validated_data)
+                    created.append(obj)
+                    old = None
+                else:
+                    obj = ser.instance
+                    old = obj.status
+                    for field in ("cron_expression", "inputs", "status", "overlap_policy"):
+                        if field in ser.validated_data:
+                            setattr(obj, field, ser.validated_data[field])
+                    obj.updated_at = now
+                    updated.append(obj)
+                deltas[obj.owner_id] = deltas.get(obj.owner_id, 0) + status_delta(old, obj.status)
+            if created:
+                Schedule.objects.bulk_create(created)
+            if updated:
+                Schedule.objects.bulk_update(
+                    updated, ["cron_expression", "inputs", "status", "overlap_policy", "updated_at"]
+                )
+            for owner_id, delta in deltas.items():
+                if delta > 0:
+                    reserve_active(owner_id, delta, enforce=False)
+                else:
+                    release_active(owner_id, -delta)
+            sync_periodic_tasks(created + updated)
+            index_schedules(created + updated)
+
+        errors.sort(key=lambda e: e["index"])
+        logger.info(
+            "schedules_bulk_upserted",
+            extra={"user": user.id, "created_count": len(created), "updated_count": len(updated), "errors_count": len(errors)},
+        )
+        if not created and not updated:
+            code = status.HTTP_400_BAD_REQUEST
+        elif errors:
+            code = status.HTTP_207_MULTI_STATUS
+        elif created:
+            code = status.HTTP_201_CREATED
+        else:
+            code = status.HTTP_200_OK
+        return Response(
+            {
+                "created": ScheduleSerializer(created, many=True).data,
+                "updated": ScheduleSerializer(updated, many=True).data,
+                "errors": errors,
+            },
+            status=code,
+        )
+
+    @action(detail=True, methods=["get"])
+    def stats(self, request, pk=None):
+        schedule = self.get_object()
+        try:
+            gran, since, until = stats_window(request.query_params)
+        except ValueError as e:
+            raise ValidationError({"detail": str(e)})
+        rows = list(
+            schedule.rollups.filter(granularity=gran, bucket_start__gte=since, bucket_start__lte=until)
+            .order_by("bucket_start")
+        )
+        return Response({
+            "schedule": schedule.id,
+            "granularity": gran,
+            "since": since,
+            "until": until,
+            "summary": summarize(rows),
+            "buckets": bucket_series(rows),
+        })
+
+    search_allowed_fields = {
+        "status",
+        "task__name",
+        "task__name__icontains",
+        "owner__username",
+        "created_at",
+        "last_run_at",
+        "next_run_at",
+    }
+
+    def search_queryset(self, filters, ordering):
+        """Scoped queryset for advanced_search/export; drops filters and orderings that aren't allowed."""
+        filters = {k: v for k, v in filters.items() if k in self.search_allowed_fields}
 
         qs = self.get_queryset()
         for k, v in filters.items():
-            qs = qs.filter(**{k: v})
+            if k == "task__name__icontains":
+                qs = qs.filter(pk__in=matching_ids([str(v)], fields=("task_name",)))
+            else:
+                qs = qs.filter(**{k: v})
 
         safe_ordering = []
         for f in ordering:
             raw = f.lstrip("-")
-            if raw in {fld.split("__")[0] for fld in allowed_fields}:
+            if raw in {fld.split("__")[0] for fld in self.search_allowed_fields}:
                 safe_ordering.append(f)
         if safe_ordering:
             qs = qs.order_by(*safe_ordering)
+        return qs, filters, safe_ordering
 
-        page = self.paginate_queryset(qs)
-        ser = ScheduleSerializer(page, many=True)
+    @action(detail=False, methods=["post"], url_path="search")
+    def advanced_search(self, request):
+        filters = request.data.get("filters", {}) or {}
+        ordering = request.data.get("ordering", []) or []
+
+        def build():
+            qs, safe_filters, safe_ordering = self.search_queryset(filters, ordering)
+            page = self.paginate_queryset(qs)
+            ser = ScheduleSerializer(page, many=True)
+            logger.info(
+                "schedules_advanced_search",
+                extra={
+                    "user": getattr(request.user, "id", None),
+                    "filters": safe_filters,
+                    "ordering": safe_ordering,
+                    "count": len(page),
+                },
+            )
+            return self.get_paginated_response(ser.data)
+
+        return self.cached_page(request, build, body={"filters": filters, "ordering": ordering})
 
+    def _export_params(self, request):
+        fmt = request.query_params.get("fmt", "ndjson").lower()
+        if fmt not in EXPORT_FORMATS:
+            raise ValidationError({"fmt": f"Expected one of: {', '.join(EXPORT_FORMATS)}."})
+        ordering = [f for f in request.query_params.get("ordering", "").split(",") if f]
+        return fmt, request.query_params.dict(), ordering
+
+    @action(detail=False, methods=["get"], url_path="export")
+    def export(self, request):
+        """Stream every matching schedule (advanced_search filters as query params)."""
+        fmt, filters, ordering = self._export_params(request)
+        qs, filters, _ = self.search_queryset(filters, ordering)
         logger.info(
-            "schedules_advanced_search",
-            extra={
-                "user": getattr(request.user, "id", None),
-                "filters": filters,
-                "ordering": safe_ordering,
-                "count": len(page),
-            },
+            "schedules_exported",
+            extra={"user": getattr(request.user, "id", None), "filters": filters, "fmt": fmt},
         )
-        return self.get_paginated_response(ser.data)
+        return stream_export(qs, SCHEDULE_EXPORT_FIELDS, fmt, "schedules")
+
+    @action(detail=False, methods=["get"], url_path="executions/export", url_name="executions-export")
+    def export_executions(self, request):
+        """Stream executions of every matching schedule."""
+        fmt, filters, ordering = self._export_params(request)
+        schedules, filters, _ = self.search_queryset(filters, [])
+        qs = Execution.objects.filter(schedule__in=schedules.order_by().values("pk")).order_by("-started_at", "-id")
+        logger.info(
+            "executions_exported",
+            extra={"user": getattr(request.user, "id", None), "filters": filters, "fmt": fmt},
+        )
+        return stream_export(qs, EXECUTION_EXPORT_FIELDS, fmt, "executions")
+
+    @action(detail=True, methods=["get"], url_path="executions/export", url_name="schedule-executions-export")
+    def export_schedule_executions(self, request, pk=None):
+        fmt, _, _ = self._export_params(request)
+        schedule = self.get_object()
+        qs = schedule.executions.order_by("-started_at", "-id")
+        logger.info(
+            "executions_exported",
+            extra={"user": getattr(request.user, "id", None), "schedule_id": schedule.id, "fmt": fmt},
+        )
+        return stream_export(qs, EXECUTION_EXPORT_FIELDS, fmt, f"schedule-{schedule.id}-executions")
+
+
+class ExecutionStatsView(generics.GenericAPIView):
+    # Reads only ExecutionRollup rows: cost grows with buckets, not executions.
+    queryset = ExecutionRollup.objects.all()
+    pagination_class = None
+
+    def get(self, request):
+        try:
+            gran, since, until = stats_window(request.query_params)
+        except ValueError as e:
+            raise ValidationError({"detail": str(e)})
+        qs = ExecutionRollup.objects.filter(granularity=gran, bucket_start__gte=since, bucket_start__lte=until)
+        if request.user.is_superuser:
+            qs = qs.filter(schedule__isnull=True)
+        else:
+            qs = qs.filter(schedule__owner=request.user, schedule__deleted_at__isnull=True)
+        task_name = request.query_params.get("task_name")
+        if task_name:
+            qs = qs.filter(task_name=task_name)
+
+        rows = list(qs.order_by("task_name", "bucket_start"))
+        by_task = {}
+        for row in rows:
+            by_task.setdefault(row.task_name, []).append(row)
+        return Response({
+            "granularity": gran,
+            "since": since,
+            "until": until,
+            "summary": summarize(rows),
+            "tasks": [
+                {"task_name": name, "summary": summarize(task_rows), "buckets": bucket_series(task_rows)}
+                for name, task_rows in by_task.items()
+            ],
+        })
+
+
+class ProfilingStatsView(generics.GenericAPIView):
+    # Histograms live in process memory: each worker answers for itself, hence the pid.
+    permission_classes = [IsAdminUser]
+    pagination_class = None
+
+    def get(self, request):
+        return Response({
+            "enabled": settings.REQUEST_PROFILING,
+            "pid": os.getpid(),
+            "sample_rate": settings.REQUEST_PROFILING_SAMPLE_RATE,
+            "slow_ms": settings.REQUEST_PROFILING_SLOW_MS,
+            "routes": route_stats.snapshot(),
+        })
+
+
+class MetricsView(generics.GenericAPIView):
+    # Prometheus scrape target: an admin JWT, or the static METRICS_TOKEN for scrapers.
+    authentication_classes = [MetricsTokenAuthentication, TimedJWTAuthentication]
+    permission_classes = [IsAdminUser | IsMetricsScraper]
+    pagination_class = None
+
+    def get(self, request):
+        return HttpResponse(scrape(), content_type=PROMETHEUS_CONTENT_TYPE)
 
 
 class ExecutionDetail(generics.RetrieveAPIView):
-    queryset = Execution.objects.all()
-    serializer_class = ExecutionSerializer
+    queryset = Execution.objects.select_related("schedule__owner")
+    serializer_class = ExecutionDetailSerializer
     permission_classes = [IsSuperOrOwner]
 
+    def get_serializer_context(self):
+        ctx = super().get_serializer_context()
+        ctx["include_logs"] = "logs" in self.request.query_params.get("include", "").split(",")
+        return ctx
+
 
 class UserCreateView(generics.CreateAPIView):
     serializer_class = UserCreateSerializer